@@ -0,0 +1,407 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 loadtest.py — Banc de charge hors-ligne du bot
+# Objectif : Rejouer des événements gateway synthétiques (MESSAGE_CREATE,
+#            INTERACTION_CREATE) sur le vrai objet bot de bot.py, face à une fausse
+#            API HTTP Discord locale (réponses scriptées, 429 compris), et mesurer
+#            débit, percentiles de latence et appels API par commande
+# Usage : python benchmarks/loadtest.py [-n 200] [--concurrency 20] [--ratelimit-every 50]
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("COMMAND_PREFIX", "%")  # prioritaire sur .env (load_dotenv ne l’écrase pas)
+
+import discord
+from aiohttp import web
+
+from utils.rate_limiter import route_key
+
+GUILD_ID = 900000000000000001
+CHANNEL_ID = 900000000000000002
+BOT_ID = 900000000000000003
+USER_ID = 900000000000000004
+APP_ID = BOT_ID
+
+# Scénarios par défaut : (libellé, type, contenu ou nom de commande slash)
+SCENARIOS = [
+    ("!ping", "message", "ping"),
+    ("!code", "message", "code"),
+    ("!help", "message", "help"),
+    ("!help ping", "message", "help ping"),
+    ("!say", "message", "say Bonjour :wave:"),
+    ("/ping", "interaction", "ping"),
+    ("/code", "interaction", "code"),
+    ("/help", "interaction", "help"),
+]
+
+_ids = itertools.count(1)
+
+def snowflake() -> int:
+    return discord.utils.time_snowflake(datetime.now(timezone.utc)) + next(_ids)
+
+def _user(user_id: int, name: str, bot: bool = False) -> dict:
+    return {"id": str(user_id), "username": name, "discriminator": "0", "global_name": name, "avatar": None, "bot": bot}
+
+def _json_response(data, status: int = 200, headers: dict = None) -> web.Response:
+    # discord.py compare le Content-Type exact (sans « ; charset=utf-8 »)
+    headers = dict(headers or {}, **{"Content-Type": "application/json"})
+    return web.Response(body=json.dumps(data).encode(), status=status, headers=headers)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Fausse API HTTP Discord
+# ────────────────────────────────────────────────────────────────────────────────
+class FakeDiscordAPI:
+    """
+    Serveur aiohttp local imitant les routes REST utilisées par le bot.
+    - chaque réponse porte des en-têtes X-RateLimit-* (bucket par route)
+    - ratelimit_every=K : une création de message sur K répond 429 (Retry-After)
+    - bucket_limit / bucket_window : bucket simulé par route, 429 si dépassé
+    """
+
+    def __init__(self, ratelimit_every: int = 0, retry_after: float = 0.05,
+                 bucket_limit: int = 10_000, bucket_window: float = 1.0):
+        self.ratelimit_every = ratelimit_every
+        self.retry_after = retry_after
+        self.bucket_limit = bucket_limit
+        self.bucket_window = bucket_window
+        self.calls = Counter()     # clé de route → appels
+        self.throttled = Counter()  # clé de route → 429 renvoyés
+        self._buckets = {}          # clé de route → (fin de fenêtre, restants)
+        self._message_posts = 0
+        self.runner = None
+        self.port = None
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Cycle de vie
+    # ──────────────────────────────────────────────────────────────
+    async def start(self):
+        app = web.Application()
+        app.router.add_route("*", "/api/v10/{tail:.*}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        discord.http.Route.BASE = f"http://127.0.0.1:{self.port}/api/v10"
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Rate-limit simulé
+    # ──────────────────────────────────────────────────────────────
+    def _bucket_headers(self, key: str):
+        now = time.monotonic()
+        reset_at, remaining = self._buckets.get(key, (0.0, self.bucket_limit))
+        if now >= reset_at:
+            reset_at, remaining = now + self.bucket_window, self.bucket_limit
+        remaining -= 1
+        self._buckets[key] = (reset_at, remaining)
+        headers = {
+            "X-RateLimit-Bucket": f"fake-{abs(hash(key)) % 10**8}",
+            "X-RateLimit-Limit": str(self.bucket_limit),
+            "X-RateLimit-Remaining": str(max(remaining, 0)),
+            "X-RateLimit-Reset-After": f"{max(reset_at - now, 0):.3f}",
+        }
+        return headers, remaining < 0, reset_at - now
+
+    def _too_many(self, key: str, headers: dict, retry_after: float):
+        self.throttled[key] += 1
+        headers.update({"Retry-After": f"{retry_after:.3f}", "X-RateLimit-Scope": "user", "Via": "1.1 google",
+                        "X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": f"{retry_after:.3f}"})
+        body = {"message": "You are being rate limited.", "retry_after": retry_after, "global": False}
+        return _json_response(body, status=429, headers=headers)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Routes
+    # ──────────────────────────────────────────────────────────────
+    async def handle(self, request: web.Request):
+        key = route_key(request.method, request.path)
+        self.calls[key] += 1
+        headers, exhausted, reset_after = self._bucket_headers(key)
+        if exhausted:
+            return self._too_many(key, headers, reset_after)
+
+        path = request.path[len("/api/v10"):]
+        if request.method == "POST" and path.endswith("/messages") and path.startswith("/channels/"):
+            self._message_posts += 1
+            if self.ratelimit_every and self._message_posts % self.ratelimit_every == 0:
+                return self._too_many(key, headers, self.retry_after)
+            payload = await self._json(request)
+            return _json_response(self._message(payload), headers=headers)
+
+        if path == "/users/@me":
+            return _json_response(_user(BOT_ID, "Atem", bot=True), headers=headers)
+        if path == "/oauth2/applications/@me":
+            return _json_response(self._application(), headers=headers)
+        if path.startswith("/interactions/") and path.endswith("/callback"):
+            interaction_id = path.split("/")[2]
+            body = {"interaction": {"id": interaction_id, "type": 2}}
+            return _json_response(body, headers=headers)
+        if request.method in ("PATCH", "POST"):
+            payload = await self._json(request)
+            return _json_response(self._message(payload), headers=headers)
+        return web.Response(status=204, headers=headers)
+
+    @staticmethod
+    async def _json(request: web.Request) -> dict:
+        if request.content_type == "application/json":
+            return await request.json()
+        if request.content_type.startswith("multipart/"):
+            reader = await request.multipart()
+            async for part in reader:
+                if part.name == "payload_json":
+                    return json.loads(await part.text())
+        return {}
+
+    @staticmethod
+    def _message(payload: dict) -> dict:
+        return {
+            "id": str(snowflake()), "channel_id": str(CHANNEL_ID), "guild_id": str(GUILD_ID),
+            "author": _user(BOT_ID, "Atem", bot=True), "content": payload.get("content") or "",
+            "timestamp": datetime.now(timezone.utc).isoformat(), "edited_timestamp": None,
+            "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+            "attachments": [], "embeds": payload.get("embeds") or [], "pinned": False, "type": 0, "flags": 0,
+        }
+
+    @staticmethod
+    def _application() -> dict:
+        return {
+            "id": str(APP_ID), "name": "Atem", "description": "", "icon": None, "bot_public": True,
+            "bot_require_code_grant": False, "owner": _user(USER_ID, "owner"), "verify_key": "0" * 64,
+            "flags": 0, "interactions_endpoint_url": None,
+        }
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📡 Faux gateway : injection d’événements dans le ConnectionState du bot
+# ────────────────────────────────────────────────────────────────────────────────
+class _FakeWebSocket:
+    """Remplace bot.ws : fournit une latence de heartbeat (ping) sans connexion réelle."""
+    open = False
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+class FakeGateway:
+    """
+    Injecte les événements directement dans les parsers du ConnectionState.
+    users : taille du pool d’auteurs (tournant), pour ne pas tout envoyer dans le
+    même bucket de cooldown par utilisateur.
+    """
+
+    def __init__(self, bot, users: int = 1000, latency: float = 0.04):
+        self.bot = bot
+        self.state = bot._connection
+        self._authors = itertools.cycle(range(USER_ID + 1, USER_ID + 1 + max(users, 1)))
+        bot.ws = _FakeWebSocket(latency)
+
+    def guild_create(self):
+        member = lambda user: {"user": user, "roles": [], "joined_at": datetime.now(timezone.utc).isoformat(), "deaf": False, "mute": False, "flags": 0}
+        data = {
+            "id": str(GUILD_ID), "name": "Bench", "owner_id": str(USER_ID), "member_count": 2,
+            "roles": [{"id": str(GUILD_ID), "name": "@everyone", "permissions": str(discord.Permissions.all().value),
+                       "position": 0, "color": 0, "hoist": False, "managed": False, "mentionable": False}],
+            "channels": [{"id": str(CHANNEL_ID), "type": 0, "name": "bench", "position": 0, "permission_overwrites": []}],
+            "members": [member(_user(BOT_ID, "Atem", bot=True)), member(_user(USER_ID, "bench"))],
+            "emojis": [{"id": str(snowflake()), "name": "wave", "animated": False, "available": True, "roles": []}],
+            "features": [], "stickers": [], "large": False,
+        }
+        self.bot._connection._add_guild_from_data(data)
+
+    def message_create(self, content: str) -> int:
+        message_id = snowflake()
+        self.state.parsers["MESSAGE_CREATE"]({
+            "id": str(message_id), "channel_id": str(CHANNEL_ID), "guild_id": str(GUILD_ID),
+            "author": _user(next(self._authors), "bench"),
+            "member": {"roles": [], "joined_at": datetime.now(timezone.utc).isoformat(), "deaf": False, "mute": False, "flags": 0},
+            "content": content, "timestamp": datetime.now(timezone.utc).isoformat(), "edited_timestamp": None,
+            "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+            "embeds": [], "pinned": False, "type": 0, "flags": 0,
+        })
+        return message_id
+
+    def interaction_create(self, name: str, options: list = None) -> int:
+        interaction_id = snowflake()
+        self.state.parsers["INTERACTION_CREATE"]({
+            "id": str(interaction_id), "application_id": str(APP_ID), "type": 2, "token": f"tok{interaction_id}",
+            "version": 1, "guild_id": str(GUILD_ID), "channel_id": str(CHANNEL_ID),
+            "channel": {"id": str(CHANNEL_ID), "type": 0, "name": "bench", "position": 0, "permission_overwrites": []},
+            "data": {"id": str(snowflake()), "name": name, "type": 1, "options": options or []},
+            "member": {"user": _user(next(self._authors), "bench"), "roles": [], "permissions": str(discord.Permissions.all().value),
+                       "joined_at": datetime.now(timezone.utc).isoformat(), "deaf": False, "mute": False, "flags": 0},
+            "app_permissions": str(discord.Permissions.all().value), "locale": "fr", "guild_locale": "fr",
+            "entitlements": [], "authorizing_integration_owners": {}, "context": 0,
+            "attachment_size_limit": 8 * 1024 * 1024,
+        })
+        return interaction_id
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⏱️ Suivi de fin de traitement
+# ────────────────────────────────────────────────────────────────────────────────
+class CompletionTracker:
+    """Résout un Future par message / interaction quand la commande se termine."""
+
+    def __init__(self, bot):
+        self.pending = {}
+        self.errors = Counter()
+        bot.add_listener(self.on_command_completion)
+        bot.add_listener(self.on_command_error)
+        bot.add_listener(self.on_app_command_completion)
+        original_on_error = bot.tree.on_error
+
+        async def on_error(interaction, error):
+            self._done(interaction.id, error)
+            await original_on_error(interaction, error)
+
+        bot.tree.on_error = on_error
+
+    def expect(self, key: int) -> asyncio.Future:
+        future = self.pending[key] = asyncio.get_running_loop().create_future()
+        return future
+
+    def _done(self, key: int, error=None):
+        future = self.pending.pop(key, None)
+        if error is not None:
+            self.errors[type(error).__name__] += 1
+        if future is not None and not future.done():
+            future.set_result(error)
+
+    async def on_command_completion(self, ctx):
+        self._done(ctx.message.id)
+
+    async def on_command_error(self, ctx, error):
+        self._done(ctx.message.id, error)
+
+    async def on_app_command_completion(self, interaction, command):
+        self._done(interaction.id)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏁 Exécution des scénarios
+# ────────────────────────────────────────────────────────────────────────────────
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+async def run_scenario(api, gateway, tracker, prefix, label, kind, payload, count, concurrency, timeout):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, timeouts, errors = [], 0, 0
+    calls_before = api.total_calls()
+    throttled_before = sum(api.throttled.values())
+
+    async def one():
+        nonlocal timeouts, errors
+        async with semaphore:
+            start = time.perf_counter()
+            if kind == "message":
+                key = gateway.message_create(prefix + payload)
+            else:
+                key = gateway.interaction_create(payload)
+            future = tracker.expect(key)
+            try:
+                if await asyncio.wait_for(future, timeout) is not None:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+            except asyncio.TimeoutError:
+                tracker.pending.pop(key, None)
+                timeouts += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0)  # laisse passer les appels API encore en vol
+
+    return {
+        "scenario": label,
+        "events": count,
+        "throughput_per_s": round(count / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "api_calls_per_event": round((api.total_calls() - calls_before) / count, 2),
+        "http_429": sum(api.throttled.values()) - throttled_before,
+        "errors": errors,
+        "timeouts": timeouts,
+    }
+
+async def main(args):
+    api = FakeDiscordAPI(ratelimit_every=args.ratelimit_every, retry_after=args.retry_after,
+                         bucket_limit=args.bucket_limit, bucket_window=args.bucket_window)
+    await api.start()
+
+    import bot as bot_module  # le vrai bot, avec ses services et ses cogs
+    from utils.discord_utils import rate_limiter
+    from utils.cooldowns import MemoryCooldownBackend
+    bot = bot_module.bot
+    await bot.extension_loader.load_all()
+    await bot.login("fake-token")
+
+    gateway = FakeGateway(bot, users=args.users)
+    gateway.guild_create()
+    tracker = CompletionTracker(bot)
+    prefix = bot_module.COMMAND_PREFIX
+
+    selected = [s for s in SCENARIOS if not args.only or s[0] in args.only]
+    results = []
+    try:
+        for label, kind, payload in selected:
+            # !ping et /ping partagent leur cooldown (utils/cooldowns.py) : compteurs neufs par scénario
+            bot.cooldowns = MemoryCooldownBackend()
+            results.append(await run_scenario(api, gateway, tracker, prefix, label, kind, payload,
+                                              args.n, args.concurrency, args.timeout))
+    finally:
+        await bot.close()
+        await api.stop()
+        if os.path.exists("instance_id.txt"):
+            os.remove("instance_id.txt")
+
+    if args.json:
+        report = {"results": results, "errors": dict(tracker.errors), "rate_limiter": rate_limiter.stats()}
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    header = (f"{'scénario':<12} {'évts':>5} {'évts/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} "
+              f"{'API/évt':>8} {'429':>5} {'err':>4} {'t/o':>4}")
+    print(header)
+    print("─" * len(header))
+    for r in results:
+        print(f"{r['scenario']:<12} {r['events']:>5} {r['throughput_per_s']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+              f"{r['p99_ms']:>8} {r['api_calls_per_event']:>8} {r['http_429']:>5} {r['errors']:>4} {r['timeouts']:>4}")
+    print(f"Rate limiter : {rate_limiter.stats()}")
+    if tracker.errors:
+        print(f"Erreurs : {dict(tracker.errors)}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Banc de charge hors-ligne du bot")
+    parser.add_argument("-n", type=int, default=200, help="événements par scénario")
+    parser.add_argument("--concurrency", type=int, default=20, help="événements en vol simultanément")
+    parser.add_argument("--users", type=int, default=1000, help="auteurs distincts (cooldowns par utilisateur)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="délai max par événement (s)")
+    parser.add_argument("--ratelimit-every", type=int, default=0, help="un POST de message sur K répond 429")
+    parser.add_argument("--retry-after", type=float, default=0.05, help="Retry-After des 429 scriptés (s)")
+    parser.add_argument("--bucket-limit", type=int, default=10_000, help="requêtes par route et par fenêtre")
+    parser.add_argument("--bucket-window", type=float, default=1.0, help="durée d’une fenêtre de bucket (s)")
+    parser.add_argument("--only", nargs="*", help="libellés de scénarios à exécuter (ex : !ping /help)")
+    parser.add_argument("--json", action="store_true", help="sortie JSON")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
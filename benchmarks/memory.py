@@ -0,0 +1,111 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 memory.py — Mesure de la RAM par profil mémoire
+# Objectif : Charger un serveur synthétique de N membres (GUILD_CREATE) et N messages
+#            dans un ConnectionState configuré par chaque profil de
+#            utils/memory_profile.py, puis rapporter la RSS ajoutée par 10k membres
+# Usage : python benchmarks/memory.py [--members 50000] [--messages 5000]
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+GUILD_ID = 900000000000000001
+CHANNEL_ID = 900000000000000002
+BOT_ID = 900000000000000003
+
+def _user(user_id: int) -> dict:
+    return {"id": str(user_id), "username": f"user{user_id % 100000}", "discriminator": "0",
+            "global_name": None, "avatar": None, "bot": False}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧪 Mesure d’un profil (exécutée dans un processus neuf)
+# ────────────────────────────────────────────────────────────────────────────────
+def measure(profile_name: str, members: int, messages: int) -> dict:
+    os.environ["MEMORY_PROFILE"] = profile_name
+    import discord
+    import psutil
+    from utils.memory_profile import load_profile, bot_options
+
+    profile = load_profile()
+    intents = discord.Intents.default()
+    intents.members = True
+    intents.message_content = True
+    client = discord.Client(intents=intents, **bot_options(profile, intents))
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=_user(BOT_ID))
+
+    now = datetime.now(timezone.utc).isoformat()
+    member_data = [{"user": _user(BOT_ID + 1 + i), "roles": [], "joined_at": now, "deaf": False,
+                    "mute": False, "flags": 0} for i in range(members)]
+    guild_data = {
+        "id": str(GUILD_ID), "name": "Bench", "owner_id": str(BOT_ID), "member_count": members,
+        "roles": [], "emojis": [], "stickers": [], "features": [], "large": True,
+        "channels": [{"id": str(CHANNEL_ID), "type": 0, "name": "bench", "position": 0, "permission_overwrites": []}],
+        "members": member_data,
+    }
+
+    process = psutil.Process()
+    gc.collect()
+    before = process.memory_info().rss
+    state._add_guild_from_data(guild_data)  # payload gardé jusqu’à la mesure : seul le cache compte
+    for i in range(messages):
+        state.parsers["MESSAGE_CREATE"]({
+            "id": str(BOT_ID + 10_000_000 + i), "channel_id": str(CHANNEL_ID), "guild_id": str(GUILD_ID),
+            "author": _user(BOT_ID + 1 + i % max(members, 1)), "content": "x" * 80, "timestamp": now,
+            "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [],
+            "mention_roles": [], "attachments": [], "embeds": [], "pinned": False, "type": 0, "flags": 0,
+        })
+    gc.collect()
+    added_mb = (process.memory_info().rss - before) / 1024 / 1024
+
+    guild = client.get_guild(GUILD_ID)
+    return {
+        "profile": profile_name,
+        "members": members,
+        "cached_members": len(guild.members),
+        "cached_messages": len(client.cached_messages),
+        "added_rss_mb": round(added_mb, 2),
+        "rss_mb_per_10k_members": round(added_mb * 10_000 / members, 2) if members else 0.0,
+    }
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🏁 Lancement
+# ────────────────────────────────────────────────────────────────────────────────
+def main():
+    from utils.memory_profile import PROFILES
+
+    parser = argparse.ArgumentParser(description="RAM par profil mémoire")
+    parser.add_argument("--members", type=int, default=50_000)
+    parser.add_argument("--messages", type=int, default=5_000)
+    parser.add_argument("--profile", help="mesure un seul profil (usage interne)")
+    args = parser.parse_args()
+
+    if args.profile:
+        # Dispatch des événements sans boucle : discord.py n’en a pas besoin ici
+        print(json.dumps(measure(args.profile, args.members, args.messages)))
+        return
+
+    # Un processus par profil : la RSS d’un profil ne pollue pas la mesure du suivant
+    print(f"{'profil':<10} {'membres':>8} {'en cache':>9} {'messages':>9} {'RSS +MB':>9} {'MB/10k':>8}")
+    for name in PROFILES:
+        out = subprocess.run(
+            [sys.executable, __file__, "--profile", name, "--members", str(args.members), "--messages", str(args.messages)],
+            capture_output=True, text=True, check=True,
+        )
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{r['profile']:<10} {r['members']:>8} {r['cached_members']:>9} {r['cached_messages']:>9} "
+              f"{r['added_rss_mb']:>9} {r['rss_mb_per_10k_members']:>8}")
+
+if __name__ == "__main__":
+    main()
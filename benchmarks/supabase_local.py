@@ -0,0 +1,210 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 supabase_local.py — Test hors-ligne de la couche Supabase asynchrone
+# Objectif : Faire tourner le vrai client supabase-py face à une fausse API PostgREST
+#            locale (tables en mémoire, latence scriptée) et vérifier utils/supabase_async.py :
+#            lectures / écritures, regroupement des lectures, timeout HTTP + retry, et
+#            pool de threads jamais saturé par des appels abandonnés
+# Usage : python benchmarks/supabase_local.py (nécessite supabase-py)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aiohttp import web
+
+from utils.supabase_async import AsyncSupabase
+
+TABLE = "guild_prefixes"
+RESERVED = ("select", "limit", "on_conflict", "columns", "order")  # paramètres qui ne sont pas des filtres
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Fausse API PostgREST
+# ────────────────────────────────────────────────────────────────────────────────
+class FakePostgREST:
+    """
+    Serveur aiohttp local imitant /rest/v1/<table> (GET, POST avec upsert, PATCH, DELETE).
+    - filtres eq. et in. ; projection select=col1,col2 ; limit
+    - delay : latence de chaque réponse ; slow_next=N : les N prochaines prennent slow_delay
+    """
+
+    def __init__(self):
+        self.tables = {}       # table → liste de lignes
+        self.calls = Counter()  # "MÉTHODE table" → appels
+        self.delay = 0.0
+        self.slow_next = 0
+        self.slow_delay = 1.0
+        self.runner = None
+        self.url = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route("*", "/rest/v1/{table}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    def reset(self):
+        self.calls.clear()
+        self.delay = 0.0
+        self.slow_next = 0
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Requêtes
+    # ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def _matches(row: dict, query) -> bool:
+        for column, condition in query.items():
+            if column in RESERVED:
+                continue
+            op, _, arg = condition.partition(".")
+            value = str(row.get(column))
+            if op == "eq" and value != arg:
+                return False
+            if op == "in" and value not in arg.strip("()").split(","):
+                return False
+        return True
+
+    async def handle(self, request: web.Request):
+        table = request.match_info["table"]
+        self.calls[f"{request.method} {table}"] += 1
+        if self.slow_next:
+            self.slow_next -= 1
+            await asyncio.sleep(self.slow_delay)
+        elif self.delay:
+            await asyncio.sleep(self.delay)
+
+        rows = self.tables.setdefault(table, [])
+        query = request.query
+        if request.method == "GET":
+            found = [r for r in rows if self._matches(r, query)]
+            if "limit" in query:
+                found = found[:int(query["limit"])]
+            columns = query.get("select", "*")
+            if columns != "*":
+                found = [{c: r.get(c) for c in columns.split(",")} for r in found]
+            return web.json_response(found)
+
+        if request.method == "POST":
+            body = await request.json()
+            written = []
+            keys = query.get("on_conflict", "").split(",") if "on_conflict" in query else None
+            for new in body if isinstance(body, list) else [body]:
+                existing = next((r for r in rows if keys and all(r.get(k) == new.get(k) for k in keys)), None)
+                if existing is not None:
+                    existing.update(new)
+                    written.append(existing)
+                else:
+                    rows.append(dict(new))
+                    written.append(rows[-1])
+            return web.json_response(written, status=201)
+
+        found = [r for r in rows if self._matches(r, query)]
+        if request.method == "PATCH":
+            values = await request.json()
+            for r in found:
+                r.update(values)
+        elif request.method == "DELETE":
+            self.tables[table] = [r for r in rows if r not in found]
+        return web.json_response(found)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧪 Vérifications
+# ────────────────────────────────────────────────────────────────────────────────
+def make_db(api: FakePostgREST, http_timeout: float, **kwargs) -> AsyncSupabase:
+    from supabase import create_client, ClientOptions
+    client = create_client(api.url, "test-key", options=ClientOptions(postgrest_client_timeout=http_timeout))
+    return AsyncSupabase(client, **kwargs)
+
+async def check_crud(api):
+    db = make_db(api, 5.0)
+    await db.upsert(TABLE, {"guild_id": 1, "prefixes": ["!"]}, on_conflict="guild_id")
+    await db.upsert(TABLE, {"guild_id": 1, "prefixes": ["?"]}, on_conflict="guild_id")
+    assert await db.select_one(TABLE, "prefixes", {"guild_id": 1}) == {"prefixes": ["?"]}
+    await db.update(TABLE, {"prefixes": ["$"]}, {"guild_id": [1, 2]})
+    assert await db.select_one(TABLE, "prefixes", {"guild_id": 1}) == {"prefixes": ["$"]}
+    await db.delete(TABLE, {"guild_id": 1})
+    assert await db.select(TABLE, filters={"guild_id": 1}) == []
+    db.close()
+    return "upsert / select / update / delete"
+
+async def check_coalescing(api):
+    db = make_db(api, 5.0)
+    api.delay = 0.1
+    results = await asyncio.gather(*(db.select(TABLE, filters={"guild_id": 7}) for _ in range(10)))
+    assert all(r == [] for r in results)
+    assert api.calls[f"GET {TABLE}"] == 1, api.calls
+    assert db.stats["coalesced"] == 9, db.stats
+    db.close()
+    return "10 lectures identiques → 1 requête HTTP"
+
+async def check_http_timeout_retry(api):
+    # Le timeout HTTP (0.3 s) coupe la requête lente : le thread est libéré et le retry passe
+    db = make_db(api, 0.3, timeout=5.0)
+    api.slow_next = 1
+    assert await db.select(TABLE) == []
+    assert db.stats["retries"] == 1 and api.calls[f"GET {TABLE}"] == 2, (db.stats, api.calls)
+    assert db.busy == 0
+    db.close()
+    return "requête lente coupée par le client HTTP, retry réussi"
+
+async def check_pool_guard(api):
+    # Timeout de run() (0.1 s) plus court que le timeout HTTP (0.5 s) : chaque tentative
+    # abandonnée garde son thread ; sans thread libre, plus de nouvelle tentative
+    db = make_db(api, 0.5, max_workers=2, timeout=0.1, retries=5)
+    api.delay = 2.0
+    start = time.perf_counter()
+    try:
+        await db.select(TABLE)
+    except asyncio.TimeoutError:
+        pass
+    else:
+        raise AssertionError("TimeoutError attendu")
+    assert api.calls[f"GET {TABLE}"] <= 2 and db.stats["retries"] <= 1, (db.stats, api.calls)
+    await asyncio.sleep(0.7)
+    assert db.busy == 0, db.busy  # threads rendus par le timeout HTTP
+    db.close()
+    return f"abandon après {db.stats['calls']} tentative(s) en {time.perf_counter() - start:.2f} s, pool libéré"
+
+CHECKS = [check_crud, check_coalescing, check_http_timeout_retry, check_pool_guard]
+
+async def main() -> int:
+    try:
+        import supabase  # noqa: F401
+    except ImportError:
+        print("supabase-py n’est pas installé (pip install supabase).")
+        return 2
+    api = FakePostgREST()
+    await api.start()
+    failures = 0
+    try:
+        for check in CHECKS:
+            api.reset()
+            try:
+                detail = await check(api)
+                print(f"✅ {check.__name__} : {detail}")
+            except Exception as e:
+                failures += 1
+                print(f"❌ {check.__name__} : {type(e).__name__} {e}")
+    finally:
+        await api.stop()
+    print(json.dumps({"checks": len(CHECKS), "failures": failures}))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -15,6 +15,7 @@ import random
 from datetime import datetime, timezone
 import asyncio
 import atexit
+import logging
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Modules tiers
@@ -28,8 +29,29 @@ import aiohttp
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Modules internes
 # ────────────────────────────────────────────────────────────────────────────────
+from utils.structured_logging import setup_logging, set_instance_id
+setup_logging()  # ✅ En premier : les messages de chargement des modules suivants passent déjà par la file
 from utils.supabase_client import supabase
-from utils.discord_utils import safe_send  # ✅ Utilitaires anti-429
+from utils.discord_utils import safe_send, rate_limiter  # ✅ Utilitaires anti-429
+from utils.webhook_pool import WebhookPool
+from utils.emoji_index import EmojiIndex
+from utils.command_catalog import CommandCatalog
+from utils.cooldowns import backend_from_env
+from utils.data_store import DataStore
+from utils.response_cache import ResponseCache
+from utils.supabase_async import AsyncSupabase
+from utils.supabase_cache import SupabaseCache
+from utils.extension_loader import ExtensionLoader
+from utils.hot_reload import HotReloader
+from utils.metrics_sampler import MetricsSampler
+from utils.command_metrics import CommandMetrics, InstrumentedTree
+from utils.prefix_store import PrefixStore
+from utils.memory_profile import MemoryProfile, load_profile, bot_options
+from utils.cluster import ClusterClient, cluster_env
+from utils.ownership import Ownership
+from utils.slash_sync import SlashSync
+
+log = logging.getLogger("bot")  # nom fixe : __main__ quand bot.py est lancé directement
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔧 Initialisation de l’environnement
@@ -39,13 +61,19 @@ load_dotenv()
 
 TOKEN = os.getenv("DISCORD_TOKEN")
 COMMAND_PREFIX = os.getenv("COMMAND_PREFIX", "%")
-INSTANCE_ID = str(uuid.uuid4())
+INSTANCE_ID = os.getenv("INSTANCE_ID") or str(uuid.uuid4())  # fourni par launcher.py en mode clusters
+set_instance_id(INSTANCE_ID)  # ✅ Champ instance_id de chaque log
+CLUSTER = cluster_env()  # shards et port IPC transmis par launcher.py (vides en mode simple)
+SHARDED = CLUSTER["shard_count"] is not None or os.getenv("SHARDED", "").lower() in ("1", "true", "yes")
+MEMORY_PROFILE = load_profile()  # MEMORY_PROFILE=full|balanced|lean (cf. utils/memory_profile.py)
 
-with open("instance_id.txt", "w") as f:
+instance_file = f"instance_id_{CLUSTER['cluster_id']}.txt" if CLUSTER["ipc_port"] else "instance_id.txt"
+with open(instance_file, "w") as f:
     f.write(INSTANCE_ID)
 
-def get_prefix(bot, message):
-    return COMMAND_PREFIX
+async def get_prefix(bot, message):
+    # Préfixes du serveur (cache mémoire devant Supabase), plus longs d’abord
+    return await bot.prefixes.for_message(message)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # ⚙️ Intents & Création du bot
@@ -57,10 +85,96 @@ intents.members = True
 intents.guild_reactions = True
 intents.dm_reactions = True
 
-bot = commands.Bot(command_prefix=get_prefix, intents=intents, help_command=None)
+# Mode shardé (SHARDED=1 ou lancé par launcher.py) : AutoShardedBot sur les shards attribués
+BotBase = commands.AutoShardedBot if SHARDED else commands.Bot
+shard_options = {"shard_count": CLUSTER["shard_count"], "shard_ids": CLUSTER["shard_ids"]} if SHARDED else {}
+
+class AtemBot(BotBase):
+    """Bot principal : signale chaque (dé)chargement d’extension via extensions_version."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.extensions_version = 0  # incrémentée à chaque load/unload/reload
+
+    def extensions_changed(self, name: str):
+        self.extensions_version += 1
+        # Avant la connexion (load_all précède bot.start), pas de boucle pour planifier les listeners
+        if self.is_ready():
+            self.dispatch("extensions_update", name)
+
+    async def load_extension(self, name: str, *, package=None):
+        try:
+            await super().load_extension(name, package=package)
+        finally:
+            self.extensions_changed(name)
+
+    async def unload_extension(self, name: str, *, package=None):
+        try:
+            await super().unload_extension(name, package=package)
+        finally:
+            self.extensions_changed(name)
+
+    async def reload_extension(self, name: str, *, package=None):
+        try:
+            await super().reload_extension(name, package=package)
+        finally:
+            self.extensions_changed(name)
+
+    async def before_identify_hook(self, shard_id, *, initial=False):
+        # Lancé par launcher.py : le hub espace les IDENTIFY de tous les clusters (max_concurrency)
+        if not await self.cluster.identify(shard_id):
+            await super().before_identify_hook(shard_id, initial=initial)
+
+    async def setup_hook(self):
+        self.cache.start()
+        self.metrics.start()
+        self.cluster.start()
+        await self.ownership.start()
+        # AUTO_SYNC=1 : synchro slash au démarrage, seulement si l’arbre a changé (un seul cluster)
+        if CLUSTER["cluster_id"] == 0 and self.ownership.is_leader:
+            await self.slash_sync.auto_sync()
+        await self.command_metrics.start_exporters()
+        self.hot_reload.start()  # HOT_RELOAD=1 : surveillance des fichiers des cogs
+
+    async def close(self):
+        self.hot_reload.stop()
+        await self.ownership.stop()  # ✅ Baux rendus tout de suite aux autres instances
+        await self.cooldowns.stop()
+        self.metrics.stop()
+        await self.cluster.stop()
+        await self.command_metrics.stop_exporters()
+        await self.cache.close()  # ✅ Dernier flush des écritures en attente
+        self.data_store.close()  # ✅ Vues relâchées : mmap libérés avec leur dernier lecteur
+        await super().close()
+        self.db.close()
+
+bot = AtemBot(
+    command_prefix=get_prefix,
+    intents=intents,
+    help_command=None,
+    tree_cls=InstrumentedTree,  # ✅ Mesure des commandes slash (cf. utils/command_metrics.py)
+    http_trace=rate_limiter.trace_config(),  # ✅ Buckets mis à jour depuis les en-têtes X-RateLimit-*
+    **bot_options(MEMORY_PROFILE, intents),  # ✅ Cache membres / chunking / cache messages selon le profil
+    **shard_options
+)
 bot.INSTANCE_ID = INSTANCE_ID
 bot.supabase = supabase
+bot.db = AsyncSupabase(supabase)  # ✅ Accès Supabase non bloquant (pool de threads, timeouts, retries)
+bot.cache = SupabaseCache(bot.db)  # ✅ Cache TTL/LRU + upserts groupés devant bot.db
 bot.aiohttp_session = None  # sera initialisée plus tard
+bot.webhook_pool = WebhookPool(bot)  # ✅ Webhooks réutilisés par salon (say *as_me)
+bot.emoji_index = EmojiIndex(bot)    # ✅ Index des emojis custom par serveur
+bot.command_catalog = CommandCatalog(bot)  # ✅ Aide précalculée (invalidée par extensions_version)
+bot.data_store = DataStore()  # ✅ data/*.json partagés, relus seulement s’ils changent
+bot.responses = ResponseCache(bot)  # ✅ Réponses quasi statiques pré-rendues (mention, !code…)
+bot.metrics = MetricsSampler(bot)  # ✅ CPU / RAM / latence / membres échantillonnés en arrière-plan
+bot.command_metrics = CommandMetrics(bot)  # ✅ Latences et erreurs par commande (p50/p95/p99)
+bot.slash_sync = SlashSync(bot)  # ✅ Synchro slash incrémentale (empreinte de l’arbre dans slash_sync.json)
+bot.ownership = Ownership.from_env(INSTANCE_ID, bot.db)  # ✅ Partitions de serveurs par instance (OWNERSHIP=sqlite|supabase)
+bot.cooldowns = backend_from_env(bot.db)  # ✅ Cooldowns préfixe + slash (COOLDOWN_BACKEND=memory|sqlite|supabase)
+bot.cluster = ClusterClient(bot, INSTANCE_ID, CLUSTER)  # ✅ Stats agrégées des clusters (IPC local)
+bot.memory = MemoryProfile(bot, MEMORY_PROFILE)  # ✅ Membres à la demande (LRU) + chunking différé
+bot.prefixes = PrefixStore(bot, default=(COMMAND_PREFIX,))  # ✅ Préfixes par serveur (cache invalidé à chaque changement)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔒 Nettoyage aiohttp
@@ -72,33 +186,11 @@ async def cleanup_aiohttp():
 atexit.register(lambda: asyncio.run(cleanup_aiohttp()))
 
 # ────────────────────────────────────────────────────────────────────────────────
-# 🔌 Chargement dynamique des commandes depuis /commands/*
+# 🔌 Chargement des extensions depuis /commands/* et /tasks/*
 # ────────────────────────────────────────────────────────────────────────────────
-async def load_commands():
-    for category in os.listdir("commands"):
-        cat_path = os.path.join("commands", category)
-        if os.path.isdir(cat_path):
-            for filename in os.listdir(cat_path):
-                if filename.endswith(".py"):
-                    path = f"commands.{category}.{filename[:-3]}"
-                    try:
-                        await bot.load_extension(path)
-                        print(f"✅ Loaded {path}")
-                    except Exception as e:
-                        print(f"❌ Failed to load {path}: {e}")
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 🔌 Chargement dynamique des tasks depuis /tasks/*
-# ────────────────────────────────────────────────────────────────────────────────
-async def load_tasks():
-    for filename in os.listdir("tasks"):
-        if filename.endswith(".py") and filename != "keep_alive.py":
-            path = f"tasks.{filename[:-3]}"
-            try:
-                await bot.load_extension(path)
-                print(f"✅ Task loaded: {path}")
-            except Exception as e:
-                print(f"❌ Failed to load task {path}: {e}")
+# Chargement parallèle + différé (LAZY_EXTENSIONS=commands.x.y,...) : cf. utils/extension_loader.py
+bot.extension_loader = ExtensionLoader(bot)
+bot.hot_reload = HotReloader(bot)  # ✅ Rechargement des seuls cogs modifiés (cf. utils/hot_reload.py)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🔔 On Ready : présence et création de session aiohttp
@@ -107,9 +199,26 @@ async def load_tasks():
 async def on_ready():
     if bot.aiohttp_session is None:
         bot.aiohttp_session = aiohttp.ClientSession()  # ✅ Créée dans le loop
-    print(f"✅ Connecté en tant que {bot.user.name}")
+    log.info("✅ Connecté en tant que %s", bot.user.name)
     await bot.change_presence(activity=discord.Activity(type=discord.ActivityType.playing, name="Duel Monsters"))
 
+# ────────────────────────────────────────────────────────────────────────────────
+# 💬 Réponse à une simple mention du bot
+# ────────────────────────────────────────────────────────────────────────────────
+def mention_payload(prefix: str, avatar_url: str) -> dict:
+    embed = discord.Embed(
+        title="Coucou ! 🃏",
+        description=(
+            f"Bonjour !\n"
+            f"• Utilise la commande `{prefix}help` pour avoir la liste des commandes du bot "
+            f"ou `{prefix}help + le nom d'une commande` pour en avoir une description."
+        ),
+        color=discord.Color.red()
+    )
+    embed.set_footer(text="Texte")
+    embed.set_thumbnail(url=avatar_url)
+    return {"embed": embed}
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 📩 Message reçu : réagir aux mots-clés et lancer les commandes
 # ────────────────────────────────────────────────────────────────────────────────
@@ -118,26 +227,20 @@ async def on_message(message):
     if message.author.bot:
         return
 
+    # ✅ Plusieurs instances : seul le détenteur de la partition du serveur répond
+    if not bot.ownership.owns(message.guild):
+        return
+
+    # ✅ Chemin rapide : ni préfixe ni mention → simple discussion, aucun parsing
+    if not await bot.prefixes.could_be_command(message):
+        return
+
     if message.content.strip() in [f"<@!{bot.user.id}>", f"<@{bot.user.id}>"]:
-        prefix = get_prefix(bot, message)
-
-        embed = discord.Embed(
-            title="Coucou ! 🃏",
-            description=(
-                f"Bonjour !\n"
-                f"• Utilise la commande `{prefix}help` pour avoir la liste des commandes du bot "
-                f"ou `{prefix}help + le nom d'une commande` pour en avoir une description."
-            ),
-            color=discord.Color.red()
-        )
-        embed.set_footer(text="Texte")
-        
-        if bot.user.avatar:
-            embed.set_thumbnail(url=bot.user.avatar.url)
-        else:
-            embed.set_thumbnail(url=bot.user.default_avatar.url)
-
-        await safe_send(message.channel, embed=embed)
+        prefix = await bot.prefixes.primary(message.guild)
+        avatar = bot.user.display_avatar  # avatar personnalisé, sinon celui par défaut
+        # ✅ Embed construit une fois par (préfixe, avatar) : un changement de l’un ou l’autre change la clé
+        payload = bot.responses.get(("mention", prefix, avatar.key), lambda: mention_payload(prefix, avatar.url))
+        await safe_send(message.channel, **payload)
         return
 
     await bot.process_commands(message)
@@ -147,6 +250,9 @@ async def on_message(message):
 # ────────────────────────────────────────────────────────────────────────────────
 @bot.event
 async def on_command_error(ctx, error):
+    if ctx.command is not None:
+        bot.command_metrics.record_error(ctx.command.qualified_name)
+
     if isinstance(error, commands.CommandOnCooldown):
         retry = round(error.retry_after, 1)
         await safe_send(ctx.channel, f"⏳ Cette commande est en cooldown. Réessaie dans `{retry}` secondes.")
@@ -164,8 +270,8 @@ async def on_command_error(ctx, error):
 # ────────────────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     async def start():
-        await load_commands()
-        await load_tasks()
+        await bot.extension_loader.load_all()
+        bot.hot_reload.snapshot()  # empreintes de référence des sources chargées
         await bot.start(TOKEN)
 
     asyncio.run(start())
@@ -12,7 +12,6 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import psutil
 from datetime import datetime
 
 from utils.discord_utils import safe_send, safe_edit  
@@ -28,6 +27,11 @@ class BotInfo(commands.Cog):
         self.bot = bot
         self.start_time = datetime.utcnow()
 
+    @staticmethod
+    def _fmt(stats: tuple, unit: str) -> str:
+        low, avg, high = stats
+        return f"{low:.0f}/{avg:.0f}/{high:.0f}{unit}"
+
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Préparation de l'embed avec toutes les infos
     # ────────────────────────────────────────────────────────────────────────────
@@ -36,21 +40,62 @@ class BotInfo(commands.Cog):
         delta = datetime.utcnow() - self.start_time
         uptime = str(delta).split(".")[0]
 
-        # Serveurs et membres
-        total_members = sum(g.member_count for g in self.bot.guilds)
-        total_guilds = len(self.bot.guilds)
+        # Serveurs, membres, ping, CPU, mémoire : derniers points du sampler (non bloquant)
+        metrics = self.bot.metrics
+        latest = metrics.latest()
+        total_members = latest["members"]
+        total_guilds = latest["guilds"]
+        latency = round(latest["latency_ms"])
+        mem = latest["rss_mb"]
+        cpu = latest["cpu"]
+
+        # Mode clusters : totaux de tous les processus (dernier état reçu par IPC)
+        cluster = getattr(self.bot, "cluster", None)
+        clusters_info = None
+        if cluster is not None and cluster.enabled:
+            totals = cluster.totals()
+            total_guilds, total_members = totals["guilds"], totals["members"]
+            latency, mem = round(totals["latency_ms"]), totals["rss_mb"]
+            clusters_info = "\n".join(
+                f"**#{c['cluster_id']}** shards {c['shards'][0]}–{c['shards'][-1]} · {c['guilds']} serveurs · "
+                f"{c['latency_ms']:.0f} ms · {c['rss_mb']:.0f} MB"
+                for c in cluster.clusters()
+            )
 
-        # Ping
-        latency = round(self.bot.latency * 1000)
+        # RAM rapportée à 10 000 membres (profil mémoire, cf. utils/memory_profile.py)
+        memory = getattr(self.bot, "memory", None)
+        if memory and total_members:
+            per_10k = memory.rss_per_10k(mem, total_members)
+            memory_profile = (
+                f"{per_10k:.1f} MB / 10k membres · profil {memory.profile['name']} "
+                f"({latest['cached_members']} membres en cache)"
+            )
+        else:
+            memory_profile = "Inconnu"
 
         # Cogs et commandes
         cogs = list(self.bot.cogs.keys())
         commands_list = [c.name for c in self.bot.commands if not getattr(c, "hidden", False)]
 
-        # CPU / Mémoire
-        process = psutil.Process()
-        mem = process.memory_info().rss / 1024 / 1024
-        cpu = psutil.cpu_percent(interval=0.1)
+        # Temps de chargement des extensions (cf. utils/extension_loader.py)
+        loader = getattr(self.bot, "extension_loader", None)
+        if loader and loader.timings:
+            slowest = ", ".join(
+                f"{ext.rsplit('.', 1)[-1]} {t['prefetch_ms'] + t['setup_ms']:.0f} ms" for ext, t in loader.slowest(3)
+            )
+            startup = f"{loader.total_ms():.0f} ms (plus lents : {slowest})"
+        else:
+            startup = "Inconnu"
+
+        # Min / moyenne / max sur 1m, 5m, 15m
+        windows = []
+        for label, stats in metrics.summary().items():
+            if not stats:
+                continue
+            windows.append(
+                f"**{label}** CPU {self._fmt(stats['cpu'], '%')} · RAM {self._fmt(stats['rss_mb'], ' MB')} · "
+                f"Ping {self._fmt(stats['latency_ms'], ' ms')} · Évts {self._fmt(stats['events_per_s'], '/s')}"
+            )
 
         # Création de l'embed
         embed = discord.Embed(
@@ -67,6 +112,11 @@ class BotInfo(commands.Cog):
         embed.add_field(name="Membres totaux", value=total_members, inline=True)
         embed.add_field(name="Mémoire utilisée", value=f"{mem:.2f} MB", inline=True)
         embed.add_field(name="CPU utilisé", value=f"{cpu} %", inline=True)
+        embed.add_field(name="Mémoire par membre", value=memory_profile, inline=False)
+        if clusters_info:
+            embed.add_field(name=f"Clusters ({totals['clusters']}/{totals['expected']})", value=clusters_info[:1024], inline=False)
+        embed.add_field(name="Tendances (min/moy/max)", value="\n".join(windows) if windows else "Pas encore de mesures", inline=False)
+        embed.add_field(name="Chargement des extensions", value=startup, inline=False)
         embed.add_field(name="Cogs chargés", value=", ".join(cogs) if cogs else "Aucun", inline=False)
         embed.add_field(name="Commandes disponibles", value=", ".join(commands_list) if commands_list else "Aucune", inline=False)
 
@@ -0,0 +1,91 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 cmdstats.py — Commande /cmdstats et !cmdstats
+# Objectif : Afficher les latences (p50/p95/p99) et erreurs par commande, ou exporter
+#            les métriques au format texte Prometheus
+# Catégorie : Admin
+# Accès : Admin
+# Cooldown : 1 utilisation / 5 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import discord
+from discord import app_commands
+from discord.ext import commands
+import io
+
+from utils.discord_utils import safe_send, rate_limiter
+from utils.cooldowns import cooldown
+
+COOLDOWN = cooldown(1, 5.0, "user")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class CmdStats(commands.Cog):
+    """
+    Commande /cmdstats et !cmdstats — Statistiques de latence et d’erreurs par commande
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Fonction interne commune
+    # ────────────────────────────────────────────────────────────────────────────
+    def build_embed(self, limit: int = 15) -> discord.Embed:
+        rows = self.bot.command_metrics.summary()[:limit]
+        embed = discord.Embed(title="📈 Statistiques des commandes", color=discord.Color.blue())
+        if not rows:
+            embed.description = "Aucune commande exécutée depuis le démarrage."
+        for name, calls, errors, p50, p95, p99, queue95, api95, ratelimit95 in rows:
+            embed.add_field(
+                name=f"`{name}` — {calls} appels, {errors} erreurs",
+                value=f"exec p50/p95/p99 : {p50:.0f}/{p95:.0f}/{p99:.0f} ms · attente p95 {queue95:.0f} ms · API p95 {api95:.0f} ms · rate limit p95 {ratelimit95:.0f} ms",
+                inline=False
+            )
+        limiter = rate_limiter.stats()
+        embed.set_footer(text=f"Rate-limit : {limiter['queued']} appels, {limiter['waited']} attentes, {limiter['throttled']} 429")
+        return embed
+
+    async def _send_stats(self, channel: discord.abc.Messageable, export: str = None):
+        if export and export.lower() in ("prometheus", "prom", "export"):
+            text = self.bot.command_metrics.render_prometheus()
+            file = discord.File(io.StringIO(text), filename="metrics.prom")
+            await safe_send(channel, "📄 Export Prometheus :", file=file)
+        else:
+            await safe_send(channel, embed=self.build_embed())
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Commande SLASH
+    # ────────────────────────────────────────────────────────────────────────────
+    @app_commands.command(
+        name="cmdstats",
+        description="Latences et erreurs par commande (admin). Option : prometheus."
+    )
+    @app_commands.describe(export="Tape 'prometheus' pour recevoir l’export texte.")
+    @app_commands.checks.has_permissions(administrator=True)
+    @COOLDOWN
+    async def slash_cmdstats(self, interaction: discord.Interaction, export: str = None):
+        await interaction.response.defer()
+        await self._send_stats(interaction.channel, export)
+        await interaction.delete_original_response()
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Commande PREFIX
+    # ────────────────────────────────────────────────────────────────────────────
+    @commands.command(name="cmdstats", help="Latences et erreurs par commande. Option : prometheus.")
+    @commands.has_permissions(administrator=True)
+    @COOLDOWN
+    async def prefix_cmdstats(self, ctx: commands.Context, export: str = None):
+        await self._send_stats(ctx.channel, export)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = CmdStats(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
@@ -1,6 +1,6 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📌 commandslist.py — Commande /readme et !readme
-# Objectif : Génère un README.md avec toutes les commandes triées et formatées
+# Objectif : Génère la liste de toutes les commandes triées (Markdown, JSON ou CSV)
 # Catégorie : Admin
 # Accès : Administrateurs seulement
 # Cooldown : 1 utilisation / 5 secondes / utilisateur
@@ -13,43 +13,39 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import io
+import logging
+from utils.command_catalog import EXPORT_FORMATS
 from utils.discord_utils import safe_send, safe_respond  
+from utils.cooldowns import cooldown
+
+log = logging.getLogger(__name__)
+
+COOLDOWN = cooldown(1, 5.0, "user")
+
+FORMAT_CHOICES = [
+    app_commands.Choice(name="Markdown", value="md"),
+    app_commands.Choice(name="JSON", value="json"),
+    app_commands.Choice(name="CSV", value="csv"),
+]
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
 # ────────────────────────────────────────────────────────────────────────────────
 class CommandsList(commands.Cog):
     """
-    Commande /readme et !readme — Génère un README.md complet avec toutes les commandes.
+    Commande /readme et !readme — Génère la liste complète des commandes (md, json, csv).
     Accessible uniquement aux administrateurs.
     """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
     # ────────────────────────────────────────────────────────────────────────────
-    # 🔹 Fonction interne pour générer le contenu Markdown
+    # 🔹 Fonction interne commune
     # ────────────────────────────────────────────────────────────────────────────
-    def build_markdown_content(self) -> str:
-        """Renvoie le contenu Markdown complet pour README.md avec format compact et lisible"""
-        content = "Liste des Commandes\n\n"
-
-        # Regrouper les commandes par catégorie
-        categories = {}
-        for cmd in self.bot.commands:
-            cat = getattr(cmd, "category", "Autre")
-            desc = cmd.help if cmd.help else "Pas de description."
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append((cmd.name, desc))
-
-        # Trier les catégories par ordre alphabétique
-        for cat in sorted(categories.keys(), key=lambda c: c.lower()):
-            content += f"### 📂 {cat}\n"
-            for name, desc in sorted(categories[cat], key=lambda x: x[0].lower()):
-                content += f"- **{name} :** {desc}\n"
-            content += "\n"
-
-        return content
+    def build_file(self, fmt: str = "md") -> discord.File:
+        """Export du catalogue (rendu une seule fois par version des extensions, cf. utils/command_catalog.py)."""
+        content = self.bot.command_catalog.export(fmt)
+        return discord.File(io.BytesIO(content.encode("utf-8")), filename=EXPORT_FORMATS[fmt])
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande SLASH (admin uniquement)
@@ -59,16 +55,17 @@ class CommandsList(commands.Cog):
         name="commandslist",
         description="Génère un .md avec toutes les commandes et les envoie en fichier."
     )
-    @app_commands.checks.cooldown(1, 5.0, key=lambda i: i.user.id)
-    async def slash_readme(self, interaction: discord.Interaction):
+    @app_commands.describe(format="Format du fichier (Markdown par défaut).")
+    @app_commands.choices(format=FORMAT_CHOICES)
+    @COOLDOWN
+    async def slash_readme(self, interaction: discord.Interaction, format: str = "md"):
         try:
-            markdown_content = self.build_markdown_content()
-            file = discord.File(io.StringIO(markdown_content), filename="Liste des Commandes.md")
-            await safe_respond(interaction, "📄 Voici le Liste des Commandes.md avec toutes les commandes :", file=file)
+            file = self.build_file(format)
+            await safe_respond(interaction, f"📄 Voici le {file.filename} avec toutes les commandes :", file=file)
         except app_commands.CommandOnCooldown as e:
             await safe_respond(interaction, f"⏳ Attends encore {e.retry_after:.1f}s.", ephemeral=True)
         except Exception as e:
-            print(f"[ERREUR /readme] {e}")
+            log.exception("Erreur /readme : %s", e)
             await safe_respond(interaction, "❌ Une erreur est survenue.", ephemeral=True)
 
     # ────────────────────────────────────────────────────────────────────────────
@@ -79,16 +76,19 @@ class CommandsList(commands.Cog):
         name="commandslist",
         help="Génère un .md avec toutes les commandes et les envoie en fichier."
     )
-    @commands.cooldown(1, 5.0, commands.BucketType.user)
-    async def prefix_readme(self, ctx: commands.Context):
+    @COOLDOWN
+    async def prefix_readme(self, ctx: commands.Context, format: str = "md"):
         try:
-            markdown_content = self.build_markdown_content()
-            file = discord.File(io.StringIO(markdown_content), filename="Liste des Commandes.md")
-            await safe_send(ctx.channel, "📄 Voici le Liste des Commandes.md avec toutes les commandes :", file=file)
+            format = format.lower()
+            if format not in EXPORT_FORMATS:
+                await safe_send(ctx.channel, f"❌ Format inconnu. Formats disponibles : {', '.join(EXPORT_FORMATS)}.")
+                return
+            file = self.build_file(format)
+            await safe_send(ctx.channel, f"📄 Voici le {file.filename} avec toutes les commandes :", file=file)
         except commands.CommandOnCooldown as e:
             await safe_send(ctx.channel, f"⏳ Attends encore {e.retry_after:.1f}s.")
         except Exception as e:
-            print(f"[ERREUR !readme] {e}")
+            log.exception("Erreur !readme : %s", e)
             await safe_send(ctx.channel, "❌ Une erreur est survenue.")
 
 # ────────────────────────────────────────────────────────────────────────────────
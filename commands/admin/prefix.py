@@ -0,0 +1,97 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 prefix.py — Commande /prefix et !prefix
+# Objectif : Afficher ou modifier les préfixes de commande du serveur
+# Catégorie : Admin
+# Accès : Gérer le serveur
+# Cooldown : 1 utilisation / 5 secondes / serveur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import logging
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.discord_utils import safe_send, safe_respond
+from utils.cooldowns import cooldown
+
+log = logging.getLogger(__name__)
+
+COOLDOWN = cooldown(1, 5.0, "guild")
+
+ACTIONS = ("voir", "set", "add", "remove", "reset")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class Prefix(commands.Cog):
+    """
+    Commande /prefix et !prefix — Préfixes du serveur (plusieurs possibles)
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Fonction interne commune
+    # ────────────────────────────────────────────────────────────────────────────
+    async def _apply(self, guild: discord.Guild, action: str, values: list) -> str:
+        store = self.bot.prefixes
+        action = (action or "voir").lower()
+        try:
+            if action == "set":
+                prefixes = await store.set(guild.id, values)
+            elif action == "add" and values:
+                prefixes = await store.add(guild.id, values[0])
+            elif action == "remove" and values:
+                prefixes = await store.remove(guild.id, values[0])
+            elif action == "reset":
+                prefixes = await store.reset(guild.id)
+            elif action == "voir":
+                prefixes = await store.get(guild.id)
+            else:
+                return f"⚠️ Usage : `prefix [{' | '.join(ACTIONS)}] <préfixe(s)>`"
+        except ValueError as e:
+            return f"❌ {e}"
+        except Exception as e:
+            log.exception("Erreur prefix : %s", e)
+            return "❌ Impossible d’enregistrer les préfixes pour le moment."
+
+        listed = " ".join(f"`{p}`" for p in prefixes)
+        if action == "voir":
+            return f"🔧 Préfixes de ce serveur : {listed}"
+        return f"✅ Préfixes mis à jour : {listed}"
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Commande SLASH
+    # ────────────────────────────────────────────────────────────────────────────
+    @app_commands.command(name="prefix", description="Affiche ou modifie les préfixes de commande du serveur.")
+    @app_commands.describe(action="voir, set, add, remove ou reset", valeurs="Préfixe(s) séparés par des espaces")
+    @app_commands.choices(action=[app_commands.Choice(name=a, value=a) for a in ACTIONS])
+    @app_commands.guild_only()
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @COOLDOWN
+    async def slash_prefix(self, interaction: discord.Interaction, action: str = "voir", valeurs: str = ""):
+        message = await self._apply(interaction.guild, action, valeurs.split())
+        await safe_respond(interaction, message, ephemeral=True)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Commande PREFIX
+    # ────────────────────────────────────────────────────────────────────────────
+    @commands.command(name="prefix", help="Affiche ou modifie les préfixes du serveur. Ex : !prefix add ?")
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    @COOLDOWN
+    async def prefix_prefix(self, ctx: commands.Context, action: str = "voir", *valeurs: str):
+        await safe_send(ctx.channel, await self._apply(ctx.guild, action, list(valeurs)))
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = Prefix(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
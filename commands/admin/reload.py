@@ -0,0 +1,110 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 reload.py — Commande simple /reload et !reload
+# Objectif : Recharger à chaud les cogs dont le fichier a changé, sans redémarrer
+#            le bot ni couper la connexion à Discord
+# Catégorie : Admin
+# Accès : Owner uniquement
+# Cooldown : 1 utilisation / 5 secondes / utilisateur
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import logging
+import discord
+from discord import app_commands
+from discord.ext import commands
+from utils.discord_utils import safe_send, safe_respond
+from utils.cooldowns import cooldown
+
+log = logging.getLogger(__name__)
+
+COOLDOWN = cooldown(1, 5.0, "user")
+
+ICONS = {"reloaded": "♻️", "loaded": "✅", "unloaded": "🗑️", "deferred": "💤", "rollback": "❌", "unknown": "❓"}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cog principal
+# ────────────────────────────────────────────────────────────────────────────────
+class Reload(commands.Cog):
+    """
+    Commande /reload et !reload — Recharge les cogs modifiés (cf. utils/hot_reload.py)
+    Un cog en erreur garde son ancienne version ; l’erreur est affichée.
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Fonction interne commune
+    # ────────────────────────────────────────────────────────────────────────────
+    async def _reload(self, extension: str = None) -> str:
+        only = None
+        if extension:
+            name = extension if "." in extension else None
+            if name is None:
+                matches = [ext for ext in self.bot.extension_loader.discover() if ext.endswith(f".{extension}")]
+                if not matches:
+                    return f"❌ Aucun cog nommé `{extension}`."
+                name = matches[0]
+            only = [name]
+
+        # Un cog nommé explicitement est rechargé même si son fichier n’a pas bougé
+        results = await self.bot.hot_reload.reload_changed(only=only)
+        if not results:
+            return "✅ Aucun cog modifié depuis le dernier chargement."
+        lines = [f"{ICONS.get(status, '•')} `{ext}` — {status}" + (f" : {detail}" if detail else "")
+                 for ext, status, detail in results]
+        return "\n".join(["🔁 **Rechargement à chaud**", *lines])[:2000]
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Commande SLASH
+    # ────────────────────────────────────────────────────────────────────────────
+    @app_commands.command(
+        name="reload",
+        description="Recharge les cogs modifiés sans redémarrer le bot."
+    )
+    @app_commands.describe(cog="Nom du cog à recharger (ex : ping). Par défaut : tous les cogs modifiés.")
+    @COOLDOWN
+    async def slash_reload(self, interaction: discord.Interaction, cog: str = None):
+        """Commande slash pour recharger les cogs modifiés."""
+        try:
+            if not await self.bot.is_owner(interaction.user):
+                return await safe_respond(interaction, "⛔ Cette commande est réservée au propriétaire du bot.", ephemeral=True)
+
+            await interaction.response.defer(ephemeral=True)
+            msg = await self._reload(cog)
+            await interaction.followup.send(msg, ephemeral=True)
+
+        except app_commands.CommandOnCooldown as e:
+            await safe_respond(interaction, f"⏳ Attends encore {e.retry_after:.1f}s.", ephemeral=True)
+        except Exception as e:
+            log.exception("Erreur /reload : %s", e)
+            await safe_respond(interaction, "❌ Une erreur est survenue lors du rechargement.", ephemeral=True)
+
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Commande PREFIX
+    # ────────────────────────────────────────────────────────────────────────────
+    @commands.command(name="reload")
+    @commands.is_owner()
+    @COOLDOWN
+    async def prefix_reload(self, ctx: commands.Context, cog: str = None):
+        """Commande préfixe pour recharger les cogs modifiés (ou un cog précis)."""
+        try:
+            msg = await self._reload(cog)
+            await safe_send(ctx.channel, msg)
+
+        except commands.CommandOnCooldown as e:
+            await safe_send(ctx.channel, f"⏳ Attends encore {e.retry_after:.1f}s.")
+        except Exception as e:
+            log.exception("Erreur !reload : %s", e)
+            await safe_send(ctx.channel, "❌ Une erreur est survenue lors du rechargement.")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔌 Setup du Cog
+# ────────────────────────────────────────────────────────────────────────────────
+async def setup(bot: commands.Bot):
+    cog = Reload(bot)
+    for command in cog.get_commands():
+        if not hasattr(command, "category"):
+            command.category = "Admin"
+    await bot.add_cog(cog)
@@ -1,6 +1,7 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📌 sync.py — Commande simple /sync et !sync
-# Objectif : Synchroniser les commandes slash avec Discord (serveur ou global)
+# Objectif : Synchroniser les commandes slash avec Discord (serveur ou global),
+#            uniquement quand l’arbre de commandes a changé
 # Catégorie : Admin
 # Accès : Owner uniquement
 # Cooldown : 1 utilisation / 10 secondes / utilisateur
@@ -9,10 +10,16 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
+import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.discord_utils import safe_send, safe_respond
+from utils.cooldowns import cooldown
+
+log = logging.getLogger(__name__)
+
+COOLDOWN = cooldown(1, 10.0, "user")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -20,42 +27,54 @@ from utils.discord_utils import safe_send, safe_respond
 class Sync(commands.Cog):
     """
     Commande /sync et !sync — Synchronise les commandes slash (serveur ou global)
+    N’appelle Discord que si l’arbre a changé depuis la dernière synchro (cf. utils/slash_sync.py).
     """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    # ────────────────────────────────────────────────────────────────────────────
+    # 🔹 Fonction interne commune
+    # ────────────────────────────────────────────────────────────────────────────
+    async def _sync(self, guild, scope: str = None, force: bool = False) -> str:
+        syncer = self.bot.slash_sync
+        if scope and scope.lower() == "global":
+            result = await syncer.sync(force=force)
+            icon, where = "🌍", "globales"
+        elif guild:
+            result = await syncer.sync(guild, force=force)
+            icon, where = "🏠", "de ce serveur"
+        else:
+            return "❌ Impossible de synchroniser localement car cette commande n'a pas été exécutée dans un serveur."
+
+        if not result["synced"]:
+            return f"{icon} **Commandes {where} déjà à jour** ({result['count']}) — rien envoyé à Discord."
+        return f"{icon} **Commandes {where} synchronisées avec Discord !**\n{syncer.describe(result)}"[:2000]
+
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande SLASH
     # ────────────────────────────────────────────────────────────────────────────
     @app_commands.command(
         name="sync",
-        description="Synchronise les commandes slash (serveur ou global)."
+        description="Synchronise les commandes slash (serveur ou global), seulement si elles ont changé."
+    )
+    @app_commands.describe(
+        scope="Tape 'global' pour synchroniser toutes les guildes.",
+        force="Synchronise même si aucun changement n’est détecté."
     )
-    @app_commands.describe(scope="Tape 'global' pour synchroniser toutes les guildes.")
-    @app_commands.checks.cooldown(1, 10.0, key=lambda i: (i.user.id))
-    async def slash_sync(self, interaction: discord.Interaction, scope: str = None):
+    @COOLDOWN
+    async def slash_sync(self, interaction: discord.Interaction, scope: str = None, force: bool = False):
         """Commande slash pour synchroniser les commandes (guild ou global)."""
         try:
             if not await self.bot.is_owner(interaction.user):
                 return await safe_respond(interaction, "⛔ Cette commande est réservée au propriétaire du bot.", ephemeral=True)
 
-            if scope and scope.lower() == "global":
-                synced = await self.bot.tree.sync()
-                msg = f"🌍 **{len(synced)} commandes globales synchronisées avec Discord !**"
-            else:
-                if interaction.guild:
-                    self.bot.tree.copy_global_to(guild=interaction.guild)
-                    synced = await self.bot.tree.sync(guild=interaction.guild)
-                    msg = f"🏠 **{len(synced)} commandes synchronisées uniquement pour ce serveur !**"
-                else:
-                    msg = "❌ Impossible de synchroniser localement car cette commande n'a pas été exécutée dans un serveur."
-
+            msg = await self._sync(interaction.guild, scope, force)
             await safe_respond(interaction, msg, ephemeral=True)
 
         except app_commands.CommandOnCooldown as e:
             await safe_respond(interaction, f"⏳ Attends encore {e.retry_after:.1f}s.", ephemeral=True)
         except Exception as e:
-            print(f"[ERREUR /sync] {e}")
+            log.exception("Erreur /sync : %s", e)
             await safe_respond(interaction, "❌ Une erreur est survenue lors de la synchronisation.", ephemeral=True)
 
     # ────────────────────────────────────────────────────────────────────────────
@@ -63,27 +82,19 @@ class Sync(commands.Cog):
     # ────────────────────────────────────────────────────────────────────────────
     @commands.command(name="sync")
     @commands.is_owner()
-    @commands.cooldown(1, 10.0, commands.BucketType.user)
-    async def prefix_sync(self, ctx: commands.Context, scope: str = None):
-        """Commande préfixe pour synchroniser les commandes (guild ou global)."""
+    @COOLDOWN
+    async def prefix_sync(self, ctx: commands.Context, *options: str):
+        """Commande préfixe pour synchroniser les commandes (guild ou global). Options : global, force."""
         try:
-            if scope and scope.lower() == "global":
-                synced = await ctx.bot.tree.sync()
-                msg = f"🌍 **{len(synced)} commandes globales synchronisées avec Discord !**"
-            else:
-                if ctx.guild:
-                    self.bot.tree.copy_global_to(guild=ctx.guild)
-                    synced = await ctx.bot.tree.sync(guild=ctx.guild)
-                    msg = f"🏠 **{len(synced)} commandes synchronisées uniquement pour ce serveur !**"
-                else:
-                    msg = "❌ Impossible de synchroniser localement car cette commande n'a pas été exécutée dans un serveur."
-
+            options = [o.lower() for o in options]
+            scope = "global" if "global" in options else None
+            msg = await self._sync(ctx.guild, scope, force="force" in options)
             await safe_send(ctx.channel, msg)
 
         except commands.CommandOnCooldown as e:
             await safe_send(ctx.channel, f"⏳ Attends encore {e.retry_after:.1f}s.")
         except Exception as e:
-            print(f"[ERREUR !sync] {e}")
+            log.exception("Erreur !sync : %s", e)
             await safe_send(ctx.channel, "❌ Une erreur est survenue lors de la synchronisation.")
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -9,10 +9,17 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
+import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.discord_utils import safe_send, safe_respond  
+from utils.response_cache import static_view
+from utils.cooldowns import cooldown
+
+log = logging.getLogger(__name__)
+
+COOLDOWN = cooldown(1, 3.0, "user")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -27,8 +34,7 @@ class CodeCommand(commands.Cog):
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Fonction interne commune
     # ────────────────────────────────────────────────────────────────────────────
-    async def _send_code_link(self, channel: discord.abc.Messageable):
-        """Envoie l’embed avec le bouton GitHub."""
+    def _build_code_link(self) -> dict:
         embed = discord.Embed(
             title="📂 Code source du bot",
             description="Voici le lien vers le dépôt GitHub contenant **tout le code** du bot.",
@@ -37,10 +43,12 @@ class CodeCommand(commands.Cog):
         embed.set_thumbnail(url="https://github.githubassets.com/images/modules/logos_page/GitHub-Mark.png")
         embed.set_footer(text="Atem")
 
-        view = discord.ui.View()
-        view.add_item(discord.ui.Button(label="🔗 Voir sur GitHub", url=self.github_url, style=discord.ButtonStyle.link))
+        view = static_view(discord.ui.Button(label="🔗 Voir sur GitHub", url=self.github_url, style=discord.ButtonStyle.link))
+        return {"embed": embed, "view": view}
 
-        await safe_send(channel, embed=embed, view=view)
+    async def _send_code_link(self, channel: discord.abc.Messageable):
+        """Envoie l’embed avec le bouton GitHub (construits une seule fois, cf. utils/response_cache.py)."""
+        await safe_send(channel, **self.bot.responses.get(("code",), self._build_code_link))
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande SLASH
@@ -49,25 +57,25 @@ class CodeCommand(commands.Cog):
         name="code",
         description="Affiche un lien cliquable vers le code source du bot."
     )
-    @app_commands.checks.cooldown(1, 3.0, key=lambda i: (i.user.id))
+    @COOLDOWN
     async def slash_code(self, interaction: discord.Interaction):
         try:
             await self._send_code_link(interaction.channel)
             await safe_respond(interaction, "✅ Voici le code source :", ephemeral=True)
         except Exception as e:
-            print(f"[ERREUR /code] {e}")
+            log.exception("Erreur /code : %s", e)
             await safe_respond(interaction, "❌ Une erreur est survenue.", ephemeral=True)
 
     # ────────────────────────────────────────────────────────────────────────────
     # 🔹 Commande PREFIX
     # ────────────────────────────────────────────────────────────────────────────
     @commands.command(name="code", help="Affiche un lien vers le code source du bot.")
-    @commands.cooldown(1, 3.0, commands.BucketType.user)
+    @COOLDOWN
     async def prefix_code(self, ctx: commands.Context):
         try:
             await self._send_code_link(ctx.channel)
         except Exception as e:
-            print(f"[ERREUR !code] {e}")
+            log.exception("Erreur !code : %s", e)
             await safe_send(ctx.channel, "❌ Une erreur est survenue lors de l’envoi du lien.")
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -9,124 +9,74 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
+import logging
 import discord
 from discord.ext import commands
 from discord import app_commands
-from discord.ui import View, Button
-import math
-from bot import get_prefix
-from utils.discord_utils import safe_send, safe_edit
+from discord.ui import Button, DynamicItem
+from utils.discord_utils import safe_send, safe_update
+from utils.persistent_views import StatefulItem, state_id, state_fields, persistent_view, key_id
+from utils.cooldowns import cooldown
 
-# ────────────────────────────────────────────────────────────────────────────────
-# 🎛️ UI — View principale (pagination + catégories)
-# ────────────────────────────────────────────────────────────────────────────────
-class HelpView(View):
-    def __init__(self, bot, categories, prefix, user_id, category="Général"):
-        super().__init__(timeout=120)
-        self.bot = bot
-        self.categories = categories
-        self.prefix = prefix
-        self.category = category
-        self.user_id = user_id
-        self.commands = sorted(categories.get(category, []), key=lambda c: c.name)
-
-        self.page = 0
-        self.per_page = 8
-        self.total_pages = max(1, math.ceil(len(self.commands) / self.per_page))
-        self.message = None
-
-        # Boutons pagination
-        self.add_item(PrevButton(self))
-        self.add_item(NextButton(self))
-
-        # Boutons catégories
-        for cat, cmds in sorted(categories.items()):
-            self.add_item(CategoryButton(cat, len(cmds), self))
-
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(
-                "❌ Tu n'es pas autorisé à utiliser ces boutons.", ephemeral=True
-            )
-            return False
-        return True
-
-    def build_embed(self) -> discord.Embed:
-        embed = discord.Embed(
-            title=f"📂 {self.category}",
-            description=f"Page {self.page + 1}/{self.total_pages}",
-            color=discord.Color.blurple()
-        )
-        start = self.page * self.per_page
-        end = start + self.per_page
-        for cmd in self.commands[start:end]:
-            embed.add_field(
-                name=f"`{self.prefix}{cmd.name}`",
-                value=cmd.help or "Pas de description.",
-                inline=False
-            )
-        embed.set_footer(text=f"{self.prefix}help <commande> pour plus de détails")
-        return embed
-
-    async def on_timeout(self):
-        for item in self.children:
-            item.disabled = True
-        if self.message:
-            await safe_edit(self.message, view=self)
-
-# ────────────────────────────────────────────────────────────────────────────────
-# ⏮️ Bouton précédent
-# ────────────────────────────────────────────────────────────────────────────────
-class PrevButton(Button):
-    def __init__(self, view: HelpView):
-        super().__init__(emoji="◀️", style=discord.ButtonStyle.primary)
-        self.view_ref = view
+log = logging.getLogger(__name__)
 
-    async def callback(self, interaction: discord.Interaction):
-        await interaction.response.defer()
-        if self.view_ref.page > 0:
-            self.view_ref.page -= 1
-            await safe_edit(interaction.message, embed=self.view_ref.build_embed(), view=self.view_ref)
+COOLDOWN = cooldown(1, 5.0, "user")
 
 # ────────────────────────────────────────────────────────────────────────────────
-# ⏭️ Bouton suivant
+# 🎛️ UI — Boutons persistants (état dans le custom_id)
 # ────────────────────────────────────────────────────────────────────────────────
-class NextButton(Button):
-    def __init__(self, view: HelpView):
-        super().__init__(emoji="▶️", style=discord.ButtonStyle.primary)
-        self.view_ref = view
-
-    async def callback(self, interaction: discord.Interaction):
-        await interaction.response.defer()
-        if self.view_ref.page < self.view_ref.total_pages - 1:
-            self.view_ref.page += 1
-            await safe_edit(interaction.message, embed=self.view_ref.build_embed(), view=self.view_ref)
-
-# ────────────────────────────────────────────────────────────────────────────────
-# 📂 Bouton catégorie
-# ────────────────────────────────────────────────────────────────────────────────
-class CategoryButton(Button):
-    def __init__(self, category: str, count: int, view: HelpView):
-        style = discord.ButtonStyle.success if category == view.category else discord.ButtonStyle.secondary
-        super().__init__(label=f"{category} ({count})", style=style)
+# help:<action>:<propriétaire>:<page>:<key_id(catégorie)> — un seul gestionnaire pour tous les messages d’aide
+# (identifiant court : un nom de catégorie long dépasserait les 100 caractères d’un custom_id)
+HELP_TEMPLATE = r"help:(?P<action>prev|next|cat):(?P<owner>[0-9]+):(?P<page>[0-9]+):(?P<category>[^:]+)"
+
+def category_by_key(catalog, key: str) -> str:
+    """Catégorie actuelle dont key_id correspond ; « Général » si elle a disparu depuis l’envoi."""
+    for category, _count in catalog.get_categories():
+        if key_id(category) == key:
+            return category
+    return "Général"
+
+class HelpButton(StatefulItem, DynamicItem[Button], template=HELP_TEMPLATE):
+    """Bouton d’aide : précédent / suivant sur la page courante, ou saut vers une catégorie."""
+
+    def __init__(self, action: str, owner_id: int, category: str, page: int = 0, **button_kwargs):
+        self.action = action
+        self.owner_id = owner_id
         self.category = category
-        self.view_ref = view
+        self.page = page
+        super().__init__(Button(custom_id=state_id("help", action, owner_id, page, key_id(category)), **button_kwargs))
 
-    async def callback(self, interaction: discord.Interaction):
-        await interaction.response.defer()
-        self.view_ref.category = self.category
-        self.view_ref.commands = sorted(self.view_ref.categories.get(self.category, []), key=lambda c: c.name)
-        self.view_ref.page = 0
-        self.view_ref.total_pages = max(1, math.ceil(len(self.view_ref.commands) / self.view_ref.per_page))
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        fields = state_fields(match)
+        category = category_by_key(interaction.client.command_catalog, fields["category"])
+        return cls(fields["action"], int(fields["owner"]), category, int(fields["page"]))
 
-        # Refresh boutons
-        self.view_ref.clear_items()
-        self.view_ref.add_item(PrevButton(self.view_ref))
-        self.view_ref.add_item(NextButton(self.view_ref))
-        for cat, cmds in sorted(self.view_ref.categories.items()):
-            self.view_ref.add_item(CategoryButton(cat, len(cmds), self.view_ref))
+    async def callback(self, interaction: discord.Interaction):
+        catalog = interaction.client.command_catalog
+        page = self.page + {"prev": -1, "next": 1}.get(self.action, 0)
+        # Le catalogue a pu changer depuis l’envoi (rechargement) : page ramenée dans les bornes
+        page = max(0, min(page, catalog.total_pages(self.category) - 1))
+        prefix = await interaction.client.prefixes.primary(interaction.guild)
+        await safe_update(
+            interaction,
+            embed=catalog.page_embed(prefix, self.category, page),
+            view=help_view(catalog, self.owner_id, self.category, page),
+        )
 
-        await safe_edit(interaction.message, embed=self.view_ref.build_embed(), view=self.view_ref)
+def help_view(catalog, owner_id: int, category: str, page: int = 0):
+    """Composants d’un message d’aide (reconstruits à chaque clic, jamais conservés)."""
+    total = catalog.total_pages(category)
+    items = [
+        HelpButton("prev", owner_id, category, page, emoji="◀️",
+                   style=discord.ButtonStyle.primary, disabled=page <= 0),
+        HelpButton("next", owner_id, category, page, emoji="▶️",
+                   style=discord.ButtonStyle.primary, disabled=page >= total - 1),
+    ]
+    for cat, count in catalog.get_categories():
+        style = discord.ButtonStyle.success if cat == category else discord.ButtonStyle.secondary
+        items.append(HelpButton("cat", owner_id, cat, label=f"{cat} ({count})", style=style))
+    return persistent_view(*items)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -137,11 +87,18 @@ class HelpCommand(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        # Enregistré une fois : répond aussi aux messages d’aide envoyés avant un redémarrage
+        self.bot.add_dynamic_items(HelpButton)
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(HelpButton)
+
     # ──────────────────────────────────────────────────────────────
     # 🔹 Commande PREFIX
     # ──────────────────────────────────────────────────────────────
     @commands.command(name="help", aliases=["h"], help="Affiche l’aide du bot.")
-    @commands.cooldown(1, 5, commands.BucketType.user)
+    @COOLDOWN
     async def help_func(self, ctx: commands.Context, commande: str = None):
         await self._send_help(ctx.author.id, ctx.channel, commande)
 
@@ -149,7 +106,7 @@ class HelpCommand(commands.Cog):
     # 🔹 Commande SLASH
     # ──────────────────────────────────────────────────────────────
     @app_commands.command(name="help", description="Affiche l’aide interactive du bot.")
-    @app_commands.checks.cooldown(1, 5.0, key=lambda i: i.user.id)
+    @COOLDOWN
     async def slash_help(self, interaction: discord.Interaction, commande: str = None):
         await interaction.response.defer()
         await self._send_help(interaction.user.id, interaction.channel, commande)
@@ -159,31 +116,19 @@ class HelpCommand(commands.Cog):
     # 🔹 Fonction interne commune
     # ──────────────────────────────────────────────────────────────
     async def _send_help(self, user_id: int, channel, commande: str = None):
-        prefix = get_prefix(self.bot, None)
+        prefix = await self.bot.prefixes.primary(getattr(channel, "guild", None))
 
         if commande:
-            cmd = self.bot.get_command(commande)
-            if not cmd:
+            embed = self.bot.command_catalog.detail_embed(prefix, commande)
+            if embed is None:
                 await safe_send(channel, f"❌ Commande `{commande}` inconnue.")
                 return
-            embed = discord.Embed(title=f"ℹ️ `{prefix}{cmd.name}`", color=discord.Color.green())
-            embed.add_field(name="📄 Description", value=cmd.help or "Aucune description.", inline=False)
-            if cmd.aliases:
-                embed.add_field(name="🔁 Alias", value=", ".join(f"`{a}`" for a in cmd.aliases), inline=False)
             await safe_send(channel, embed=embed)
             return
 
-        # Regroupement par catégories
-        categories = {}
-        for cmd in self.bot.commands:
-            if cmd.hidden:
-                continue
-            cat = getattr(cmd, "category", "Autres")
-            categories.setdefault(cat, []).append(cmd)
-
-        view = HelpView(self.bot, categories, prefix, user_id, category="Général")
-        message = await safe_send(channel, embed=view.build_embed(), view=view)
-        view.message = message
+        catalog = self.bot.command_catalog
+        await safe_send(channel, embed=catalog.page_embed(prefix, "Général", 0),
+                        view=help_view(catalog, user_id, "Général"))
 
 # ──────────────────────────────────────────────────────────────
 # 🔌 Setup du Cog
@@ -194,4 +139,4 @@ async def setup(bot: commands.Bot):
         if not hasattr(command, "category"):
             command.category = "Général"
     await bot.add_cog(cog)
-    print("✅ Cog chargé : HelpCommand (slash + boutons interactifs)")
+    log.info("✅ Cog chargé : HelpCommand (slash + boutons persistants)")
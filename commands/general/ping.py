@@ -9,11 +9,17 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
+import logging
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from utils.discord_utils import safe_send
+from utils.cooldowns import cooldown
+
+log = logging.getLogger(__name__)
+
+COOLDOWN = cooldown(1, 5.0, "user")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -30,9 +36,18 @@ class Ping(commands.Cog):
     async def _send_ping(self, channel: discord.abc.Messageable):
         try:
             latence = round(self.bot.latency * 1000)
-            await safe_send(channel, f"🏓 Pong ! Latence : **{latence} ms**")
+            message = f"🏓 Pong ! Latence : **{latence} ms**"
+            # Mode clusters : latence moyenne / max sur tous les processus (cf. utils/cluster.py)
+            cluster = getattr(self.bot, "cluster", None)
+            if cluster is not None and cluster.enabled:
+                totals = cluster.totals()
+                message += (
+                    f"\n🛰️ Cluster {cluster.env['cluster_id']} · {totals['clusters']}/{totals['expected']} clusters : "
+                    f"moyenne **{totals['latency_ms']:.0f} ms**, max {totals['latency_max_ms']:.0f} ms"
+                )
+            await safe_send(channel, message)
         except Exception as e:
-            print("[ERREUR ping]", e)
+            log.exception("Erreur ping : %s", e)
             await safe_send(channel, "❌ Une erreur est survenue lors de l'exécution de la commande.")
 
     # ────────────────────────────────────────────────────────────────────────────
@@ -42,7 +57,7 @@ class Ping(commands.Cog):
         name="ping",
         description="Affiche la latence actuelle du bot."
     )
-    @app_commands.checks.cooldown(rate=1, per=5.0, key=lambda i: i.user.id)
+    @COOLDOWN
     async def slash_ping(self, interaction: discord.Interaction):
         await interaction.response.defer()
         await self._send_ping(interaction.channel)
@@ -52,7 +67,7 @@ class Ping(commands.Cog):
     # 🔹 Commande PREFIX
     # ────────────────────────────────────────────────────────────────────────────
     @commands.command(name="ping", aliases=["pong", "latence"], help="Affiche la latence actuelle du bot.")
-    @commands.cooldown(1, 5.0, commands.BucketType.user)
+    @COOLDOWN
     async def prefix_ping(self, ctx: commands.Context):
         await self._send_ping(ctx.channel)
 
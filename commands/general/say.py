@@ -9,12 +9,18 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
+import logging
 import discord
 import re
 from discord import app_commands
 from discord.ext import commands
 
 from utils.discord_utils import safe_send, safe_delete, safe_respond  
+from utils.cooldowns import cooldown
+
+log = logging.getLogger(__name__)
+
+COOLDOWN = cooldown(1, 5.0, "user")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 🧠 Cog principal
@@ -36,15 +42,12 @@ class Say(commands.Cog):
         if len(message) > 2000:
             message = message[:1997] + "..."
         if as_user:
-            webhook = await channel.create_webhook(name=f"tmp-{user.name}")
-            try:
-                if embed:
-                    embed_obj = discord.Embed(description=message, color=discord.Color.blurple())
-                    await webhook.send(username=user.display_name, avatar_url=user.display_avatar.url, embed=embed_obj)
-                else:
-                    await webhook.send(username=user.display_name, avatar_url=user.display_avatar.url, content=message)
-            finally:
-                await webhook.delete()
+            # Webhook persistant du salon (cf. utils/webhook_pool.py) : un seul appel API par message
+            if embed:
+                embed_obj = discord.Embed(description=message, color=discord.Color.blurple())
+                await self.bot.webhook_pool.send(channel, username=user.display_name, avatar_url=user.display_avatar.url, embed=embed_obj)
+            else:
+                await self.bot.webhook_pool.send(channel, username=user.display_name, avatar_url=user.display_avatar.url, content=message)
         else:
             if embed:
                 embed_obj = discord.Embed(description=message, color=discord.Color.blurple())
@@ -56,14 +59,9 @@ class Say(commands.Cog):
     # 🔹 Remplacement emojis custom
     # ──────────────────────────────────────────────────────────────
     def _replace_custom_emojis(self, channel, message: str) -> str:
-        if hasattr(channel, "guild"):
-            guild_emojis = {e.name.lower(): str(e) for e in channel.guild.emojis}
-            return re.sub(
-                r":([a-zA-Z0-9_]+):",
-                lambda m: guild_emojis.get(m.group(1).lower(), m.group(0)),
-                message,
-                flags=re.IGNORECASE
-            )
+        guild = getattr(channel, "guild", None)
+        if guild is not None:
+            return self.bot.emoji_index.substitute(guild, message)
         return message
 
     # ──────────────────────────────────────────────────────────────
@@ -94,7 +92,7 @@ class Say(commands.Cog):
         embed="Envoyer dans un embed",
         as_user="Parler comme vous"
     )
-    @app_commands.checks.cooldown(1, 5.0, key=lambda i: i.user.id)
+    @COOLDOWN
     async def slash_say(self, interaction: discord.Interaction, message: str, embed: bool = False, as_user: bool = False):
         try:
             await interaction.response.defer()
@@ -102,7 +100,7 @@ class Say(commands.Cog):
             await safe_respond(interaction, "✅ Message envoyé !", ephemeral=True)
             await interaction.delete_original_response()
         except Exception as e:
-            print(f"[ERREUR /say] {e}")
+            log.exception("Erreur /say : %s", e)
             await safe_respond(interaction, "❌ Impossible d’envoyer le message.", ephemeral=True)
 
     # ──────────────────────────────────────────────────────────────
@@ -112,13 +110,13 @@ class Say(commands.Cog):
         name="say",
         help="Fait répéter un message par le bot. Options : *embed / *e, *as_me / *am. Ex: !say *e *am Bonjour !"
     )
-    @commands.cooldown(1, 5.0, commands.BucketType.user)
+    @COOLDOWN
     async def prefix_say(self, ctx: commands.Context, *, message: str):
         try:
             options, clean_message = self._parse_options(message)
             await self._say(ctx.channel, ctx.author, clean_message, options["embed"], options["as_user"])
         except Exception as e:
-            print(f"[ERREUR !say] {e}")
+            log.exception("Erreur !say : %s", e)
             await safe_send(ctx.channel, "❌ Impossible d’envoyer le message.")
         finally:
             await safe_delete(ctx.message)
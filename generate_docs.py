@@ -0,0 +1,49 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 generate_docs.py — Régénère la liste des commandes sans connexion à Discord
+# Objectif : Charger les extensions comme au démarrage (sans login ni gateway) puis
+#            écrire l’export du catalogue (même rendu que /commandslist)
+# Usage : python generate_docs.py [--format md|json|csv] [--output chemin]
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import argparse
+import asyncio
+import os
+
+from utils.command_catalog import EXPORT_FORMATS
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_OUTPUT = os.path.join("docs", "Liste_des_commandes.md")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧾 Génération
+# ────────────────────────────────────────────────────────────────────────────────
+async def generate(fmt: str, output: str) -> int:
+    import bot as bot_module  # le vrai bot et ses cogs, jamais connecté
+    bot = bot_module.bot
+    await bot.extension_loader.load_all()
+    content = bot.command_catalog.export(fmt)
+
+    tmp = f"{output}.tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    os.replace(tmp, output)
+    return len(bot.commands)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Régénère la liste des commandes du bot")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="md", help="format de sortie (défaut : md)")
+    parser.add_argument("--output", help=f"fichier de sortie (défaut : {DEFAULT_OUTPUT} en md)")
+    return parser.parse_args(argv)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🚀 Lancement
+# ────────────────────────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    args = parse_args()
+    output = args.output or (DEFAULT_OUTPUT if args.format == "md" else EXPORT_FORMATS[args.format])
+    count = asyncio.run(generate(args.format, output))
+    print(f"📄 {output} régénéré ({count} commandes)")
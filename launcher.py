@@ -0,0 +1,125 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 launcher.py — Lancement du bot en plusieurs processus (clusters de shards)
+# Objectif : Répartir les shards sur plusieurs processus bot.py (un cœur chacun),
+#            héberger le canal IPC local (stats, cadence des IDENTIFY selon
+#            max_concurrency) et relancer un cluster qui tombe
+# Usage : python launcher.py --clusters 4 [--shards 16]
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+
+import aiohttp
+from dotenv import load_dotenv
+
+from utils.cluster import ClusterHub
+from utils.structured_logging import setup_logging
+
+log = logging.getLogger(__name__)
+
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv()
+
+GATEWAY_URL = "https://discord.com/api/v10/gateway/bot"
+RESTART_DELAY = 5.0  # secondes, doublé à chaque crash rapproché (max 5 min)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔢 Répartition des shards
+# ────────────────────────────────────────────────────────────────────────────────
+async def gateway_info(token: str) -> tuple:
+    """(shards recommandés, max_concurrency) d’après Discord (GET /gateway/bot)."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_URL, headers={"Authorization": f"Bot {token}"}) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+    return data["shards"], data.get("session_start_limit", {}).get("max_concurrency", 1)
+
+def split_shards(shard_count: int, clusters: int) -> list:
+    """Plages contiguës de shards, aussi égales que possible : [[0, 1], [2, 3], …]."""
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for i in range(clusters):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Superviseur d’un cluster
+# ────────────────────────────────────────────────────────────────────────────────
+async def run_cluster(cluster_id: int, cluster_count: int, shard_ids: list, shard_count: int, ipc_port: int):
+    delay = RESTART_DELAY
+    while True:
+        instance_id = str(uuid.uuid4())  # un INSTANCE_ID par processus lancé
+        env = dict(
+            os.environ,
+            INSTANCE_ID=instance_id,
+            CLUSTER_ID=str(cluster_id),
+            CLUSTER_COUNT=str(cluster_count),
+            SHARD_COUNT=str(shard_count),
+            SHARD_IDS=",".join(map(str, shard_ids)),
+            IPC_PORT=str(ipc_port),
+        )
+        log.info("🚀 Cluster %s (%s) : shards %s–%s / %s", cluster_id, instance_id[:8], shard_ids[0], shard_ids[-1], shard_count)
+        started = time.monotonic()
+        process = await asyncio.create_subprocess_exec(sys.executable, "bot.py", env=env)
+        code = await process.wait()
+
+        if code == 0:
+            log.info("🛑 Cluster %s arrêté proprement.", cluster_id)
+            return
+        # Crash : relance avec backoff (remis à zéro si le cluster a tenu 10 min)
+        delay = RESTART_DELAY if time.monotonic() - started > 600 else min(delay * 2, 300)
+        log.error("❌ Cluster %s terminé (code %s), relance dans %.0fs", cluster_id, code, delay)
+        await asyncio.sleep(delay)
+
+async def main(args):
+    token = os.getenv("DISCORD_TOKEN")
+    try:
+        recommended, max_concurrency = await gateway_info(token)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        if not args.shards:
+            raise
+        # --shards fourni : on peut démarrer, avec la cadence la plus prudente
+        log.warning("⚠️ /gateway/bot indisponible (%s) : max_concurrency = 1", e)
+        recommended, max_concurrency = args.shards, 1
+    shard_count = args.shards or recommended
+    ranges = split_shards(shard_count, args.clusters)
+
+    # Le hub espace les IDENTIFY de tous les clusters : un par bucket (shard_id % max_concurrency)
+    # toutes les ~5 s, même si les processus démarrent ensemble ou redémarrent après un crash
+    hub = ClusterHub(args.ipc_port, max_concurrency=max_concurrency)
+    ipc_port = await hub.start()
+    log.info("🛰️ IPC des clusters sur 127.0.0.1:%s — %s shards, %s clusters, max_concurrency %s",
+             ipc_port, shard_count, len(ranges), max_concurrency)
+
+    try:
+        await asyncio.gather(*(
+            run_cluster(i, len(ranges), shard_ids, shard_count, ipc_port)
+            for i, shard_ids in enumerate(ranges)
+        ))
+    finally:
+        await hub.stop()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Lance le bot en plusieurs clusters de shards")
+    parser.add_argument("--clusters", type=int, default=os.cpu_count() or 1, help="nombre de processus")
+    parser.add_argument("--shards", type=int, help="nombre total de shards (défaut : recommandé par Discord)")
+    parser.add_argument("--ipc-port", type=int, default=int(os.getenv("IPC_PORT", "0")), help="port IPC local (0 = libre)")
+    return parser.parse_args(argv)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🚀 Lancement
+# ────────────────────────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    setup_logging("launcher")
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,279 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 cluster.py — Statistiques partagées entre clusters (IPC local)
+# Objectif : Quand launcher.py répartit les shards sur plusieurs processus, chaque
+#            cluster publie ses stats (serveurs, membres, latence, RAM) au hub du
+#            launcher, qui renvoie à tous l’état agrégé : botinfo et ping lisent
+#            ensuite ce dernier état sans aucun aller-retour ; le hub espace aussi les
+#            IDENTIFY de tous les processus (session_start_limit.max_concurrency)
+# Protocole : une ligne JSON par message sur une connexion TCP 127.0.0.1 (stats, ou
+#             {"type": "identify", "shard_id": n} : demande puis autorisation d’IDENTIFY)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import logging
+import os
+import time
+
+log = logging.getLogger(__name__)
+
+STATS_INTERVAL = 5.0
+STALE_AFTER = 3 * STATS_INTERVAL  # un cluster muet depuis plus longtemps est considéré hors ligne
+IDENTIFY_INTERVAL = 5.5  # s entre deux IDENTIFY d’un même bucket (5 s chez Discord, plus une marge)
+CONNECT_WAIT = 10.0  # s d’attente de la connexion IPC avant un IDENTIFY non coordonné
+NUMERIC_FIELDS = ("cluster_id", "guilds", "members", "latency_ms", "rss_mb", "sent_at")  # cf. local_stats()
+
+def _valid_stats(stats) -> bool:
+    """Message de stats complet (tel que produit par ClusterClient.local_stats)."""
+    return (
+        isinstance(stats, dict)
+        and isinstance(stats.get("instance_id"), str)
+        and all(isinstance(stats.get(f), (int, float)) and not isinstance(stats.get(f), bool) for f in NUMERIC_FIELDS)
+    )
+
+def cluster_env() -> dict:
+    """Réglages transmis par launcher.py à chaque processus (vides en mode simple)."""
+    shard_ids = os.getenv("SHARD_IDS")
+    return {
+        "cluster_id": int(os.getenv("CLUSTER_ID", "0")),
+        "cluster_count": int(os.getenv("CLUSTER_COUNT", "1")),
+        "shard_count": int(os.getenv("SHARD_COUNT")) if os.getenv("SHARD_COUNT") else None,
+        "shard_ids": [int(s) for s in shard_ids.split(",")] if shard_ids else None,
+        "ipc_port": int(os.getenv("IPC_PORT")) if os.getenv("IPC_PORT") else None,
+    }
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🛰️ Hub (côté launcher)
+# ────────────────────────────────────────────────────────────────────────────────
+class ClusterHub:
+    """
+    Reçoit les stats de chaque cluster et diffuse l’état complet à tous.
+    Un cluster est retiré quand sa connexion se ferme ou qu’il se tait plus de
+    STALE_AFTER s ; une ligne invalide est ignorée (avertissement), sans couper la connexion.
+    Les demandes d’IDENTIFY sont servies dans l’ordre d’arrivée : au plus une par bucket
+    (shard_id % max_concurrency) toutes les IDENTIFY_INTERVAL s, tous processus confondus.
+    """
+
+    def __init__(self, port: int = 0, max_concurrency: int = 1):
+        self.port = port
+        self.max_concurrency = max(1, max_concurrency)
+        self.clusters = {}  # instance_id → dernières stats
+        self._writers = set()
+        self._identify_next = {}  # bucket → instant (monotonic) du prochain IDENTIFY autorisé
+        self._grants = set()  # tâches d’autorisation en attente
+        self._server = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        for task in list(self._grants):
+            task.cancel()
+        for writer in list(self._writers):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        instances = set()  # instance_id publiés par cette connexion
+        try:
+            while line := await reader.readline():
+                try:
+                    stats = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    stats = None
+                if isinstance(stats, dict) and stats.get("type") == "identify" and isinstance(stats.get("shard_id"), int):
+                    self._schedule_identify(writer, stats["shard_id"])
+                    continue
+                if not _valid_stats(stats):
+                    log.warning("IPC : message de stats invalide ignoré : %.200r", line)
+                    continue
+                stats["received_at"] = time.time()
+                self.clusters[stats["instance_id"]] = stats
+                instances.add(stats["instance_id"])
+                self._expire()
+                await self._broadcast()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            for instance_id in instances:
+                self.clusters.pop(instance_id, None)
+
+    def _schedule_identify(self, writer: asyncio.StreamWriter, shard_id: int):
+        # Créneau réservé tout de suite (ordre d’arrivée), autorisation envoyée à son heure
+        bucket = shard_id % self.max_concurrency
+        now = time.monotonic()
+        at = max(now, self._identify_next.get(bucket, 0.0))
+        self._identify_next[bucket] = at + IDENTIFY_INTERVAL
+        task = asyncio.create_task(self._grant_identify(writer, shard_id, at - now))
+        self._grants.add(task)
+        task.add_done_callback(self._grants.discard)
+
+    @staticmethod
+    async def _grant_identify(writer: asyncio.StreamWriter, shard_id: int, delay: float):
+        await asyncio.sleep(delay)
+        try:
+            writer.write((json.dumps({"type": "identify", "shard_id": shard_id}) + "\n").encode())
+            await writer.drain()
+        except ConnectionError:
+            pass  # cluster arrêté entre-temps
+
+    def _expire(self):
+        now = time.time()
+        for instance_id in [i for i, s in self.clusters.items() if now - s["received_at"] > STALE_AFTER]:
+            del self.clusters[instance_id]
+            log.info("IPC : cluster %s retiré (muet depuis plus de %.0fs)", instance_id, STALE_AFTER)
+
+    async def _broadcast(self):
+        payload = (json.dumps({"clusters": list(self.clusters.values())}) + "\n").encode()
+        for writer in list(self._writers):
+            try:
+                writer.write(payload)
+                await writer.drain()
+            except ConnectionError:
+                self._writers.discard(writer)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📡 Client (côté bot)
+# ────────────────────────────────────────────────────────────────────────────────
+class ClusterClient:
+    """
+    Vue multi-clusters du bot (bot.cluster).
+    - local_stats() : stats de ce processus (à partir du dernier point de bot.metrics)
+    - clusters() : stats de tous les clusters vivants (ce processus toujours inclus)
+    - totals() : serveurs, membres, RAM additionnés ; latence moyenne et max
+    - identify(shard_id) : attend l’autorisation du hub avant un IDENTIFY (False si
+      l’IPC est indisponible : l’appelant garde alors l’attente par défaut)
+    Sans IPC_PORT (mode simple), seul le processus courant est rapporté.
+    """
+
+    def __init__(self, bot, instance_id: str, env: dict = None):
+        self.bot = bot
+        self.instance_id = instance_id
+        self.env = env or cluster_env()
+        self._remote = {}  # instance_id → stats reçues du hub
+        self._task = None
+        self._writer = None
+        self._connected = asyncio.Event()
+        self._identify_waiters = {}  # shard_id → Future (autorisation du hub)
+
+    @property
+    def enabled(self) -> bool:
+        return self.env["ipc_port"] is not None
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Cycle de vie
+    # ──────────────────────────────────────────────────────────────
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _run(self):
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_connection("127.0.0.1", self.env["ipc_port"])
+                self._connected.set()
+                publisher = asyncio.create_task(self._publish_loop())
+                try:
+                    while line := await reader.readline():
+                        data = json.loads(line)
+                        if data.get("type") == "identify":
+                            waiter = self._identify_waiters.pop(data.get("shard_id"), None)
+                            if waiter is not None and not waiter.done():
+                                waiter.set_result(True)
+                            continue
+                        self._remote = {c["instance_id"]: c for c in data.get("clusters", [])}
+                finally:
+                    publisher.cancel()
+                    self._disconnected()
+            except (OSError, json.JSONDecodeError) as e:
+                log.warning("IPC indisponible (%s), nouvelle tentative dans %.0fs", e, STATS_INTERVAL)
+            await asyncio.sleep(STATS_INTERVAL)
+
+    def _disconnected(self):
+        self._connected.clear()
+        self._writer = None
+        waiters, self._identify_waiters = self._identify_waiters, {}
+        for waiter in waiters.values():
+            if not waiter.done():
+                waiter.set_result(False)
+
+    async def identify(self, shard_id: int) -> bool:
+        """Attend que le hub autorise l’IDENTIFY de ce shard ; False si l’IPC est indisponible."""
+        if not self.enabled or self._task is None:
+            return False
+        try:
+            await asyncio.wait_for(self._connected.wait(), CONNECT_WAIT)
+        except asyncio.TimeoutError:
+            log.warning("IPC indisponible : IDENTIFY du shard %s non coordonné", shard_id)
+            return False
+        waiter = self._identify_waiters[shard_id] = asyncio.get_running_loop().create_future()
+        try:
+            self._writer.write((json.dumps({"type": "identify", "shard_id": shard_id}) + "\n").encode())
+            await self._writer.drain()
+        except (ConnectionError, AttributeError):
+            self._identify_waiters.pop(shard_id, None)
+            return False
+        return await waiter
+
+    async def _publish_loop(self):
+        while True:
+            self._writer.write((json.dumps(self.local_stats()) + "\n").encode())
+            await self._writer.drain()
+            await asyncio.sleep(STATS_INTERVAL)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Lecture
+    # ──────────────────────────────────────────────────────────────
+    def local_stats(self) -> dict:
+        latest = self.bot.metrics.latest()
+        shards = sorted(getattr(self.bot, "shards", None) or self.env["shard_ids"] or [0])
+        return {
+            "instance_id": self.instance_id,
+            "cluster_id": self.env["cluster_id"],
+            "shards": shards,
+            "guilds": latest["guilds"],
+            "members": latest["members"],
+            "latency_ms": latest["latency_ms"],
+            "rss_mb": latest["rss_mb"],
+            "sent_at": time.time(),
+        }
+
+    def clusters(self) -> list:
+        now = time.time()
+        alive = {
+            iid: stats for iid, stats in self._remote.items()
+            if now - stats.get("received_at", stats["sent_at"]) <= STALE_AFTER
+        }
+        alive[self.instance_id] = self.local_stats()  # toujours à jour pour soi-même
+        return sorted(alive.values(), key=lambda c: c["cluster_id"])
+
+    def totals(self) -> dict:
+        clusters = self.clusters()
+        latencies = [c["latency_ms"] for c in clusters]
+        return {
+            "clusters": len(clusters),
+            "expected": self.env["cluster_count"],
+            "guilds": sum(c["guilds"] for c in clusters),
+            "members": sum(c["members"] for c in clusters),
+            "rss_mb": sum(c["rss_mb"] for c in clusters),
+            "latency_ms": sum(latencies) / len(latencies),
+            "latency_max_ms": max(latencies),
+        }
@@ -0,0 +1,179 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 command_catalog.py — Catalogue précalculé des commandes du bot
+# Objectif : Regrouper/trier les commandes et pré-rendre les embeds d’aide et les
+#            exports (Markdown, JSON, CSV) une seule fois par version des extensions
+#            (bot.extensions_version)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import csv
+import io
+import json
+import math
+
+import discord
+
+from utils.response_cache import freeze_embed
+
+PER_PAGE = 8
+EXPORT_FORMATS = {"md": "Liste des Commandes.md", "json": "commandes.json", "csv": "commandes.csv"}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Catalogue
+# ────────────────────────────────────────────────────────────────────────────────
+class CommandCatalog:
+    """
+    Vue précalculée de bot.commands, reconstruite uniquement lorsque
+    bot.extensions_version change (chargement / déchargement / rechargement).
+    - categories : [(catégorie, nombre de commandes)] trié
+    - page_embed(prefix, catégorie, page) et detail_embed(prefix, nom ou alias) en cache,
+      figés avec leur forme sérialisée (cf. utils/response_cache.py)
+    - export(format) : liste complète des commandes (md, json, csv), en cache
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._version = None
+        self._built = False
+        self._by_category = {}  # catégorie → commandes visibles triées par nom
+        self._lookup = {}       # nom ou alias → commande
+        self._embeds = {}       # clé de rendu → discord.Embed
+        self._rows = []         # export : (catégorie, nom, description, alias), toutes commandes
+        self._exports = {}      # format → texte rendu
+        self.categories = []
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Construction
+    # ──────────────────────────────────────────────────────────────
+    def _ensure_fresh(self):
+        version = getattr(self.bot, "extensions_version", None)
+        if self._built and version == self._version:
+            return
+        by_category, lookup, rows = {}, {}, []
+        for cmd in self.bot.commands:
+            lookup[cmd.name] = cmd
+            for alias in cmd.aliases:
+                lookup[alias] = cmd
+            rows.append((getattr(cmd, "category", "Autre"), cmd.name, cmd.help or "Pas de description.", list(cmd.aliases)))
+            if cmd.hidden:
+                continue
+            by_category.setdefault(getattr(cmd, "category", "Autres"), []).append(cmd)
+
+        for cmds in by_category.values():
+            cmds.sort(key=lambda c: c.name)
+        self._by_category = by_category
+        self._lookup = lookup
+        self._embeds = {}
+        self._rows = sorted(rows, key=lambda r: (r[0].lower(), r[1].lower()))
+        self._exports = {}
+        self.categories = sorted((cat, len(cmds)) for cat, cmds in by_category.items())
+        self._version = version
+        self._built = True
+
+    @property
+    def version(self):
+        self._ensure_fresh()
+        return self._version
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Accès
+    # ──────────────────────────────────────────────────────────────
+    def get_categories(self) -> list:
+        self._ensure_fresh()
+        return self.categories
+
+    def total_pages(self, category: str) -> int:
+        self._ensure_fresh()
+        return max(1, math.ceil(len(self._by_category.get(category, [])) / PER_PAGE))
+
+    def get_command(self, name: str):
+        """Recherche d’une commande par nom ou alias (sous-commandes via bot.get_command)."""
+        self._ensure_fresh()
+        cmd = self._lookup.get(name)
+        if cmd is None and " " in name:
+            cmd = self.bot.get_command(name)
+        return cmd
+
+    def page_embed(self, prefix: str, category: str, page: int) -> discord.Embed:
+        self._ensure_fresh()
+        key = ("page", prefix, category, page)
+        embed = self._embeds.get(key)
+        if embed is None:
+            embed = self._embeds[key] = freeze_embed(self._render_page(prefix, category, page))
+        return embed
+
+    def detail_embed(self, prefix: str, name: str):
+        """Embed de détail d’une commande, ou None si la commande est inconnue."""
+        cmd = self.get_command(name)
+        if cmd is None:
+            return None
+        key = ("detail", prefix, cmd.qualified_name)
+        embed = self._embeds.get(key)
+        if embed is None:
+            embed = self._embeds[key] = freeze_embed(self._render_detail(prefix, cmd))
+        return embed
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Rendu
+    # ──────────────────────────────────────────────────────────────
+    def _render_page(self, prefix: str, category: str, page: int) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"📂 {category}",
+            description=f"Page {page + 1}/{self.total_pages(category)}",
+            color=discord.Color.blurple()
+        )
+        start = page * PER_PAGE
+        for cmd in self._by_category.get(category, [])[start:start + PER_PAGE]:
+            embed.add_field(
+                name=f"`{prefix}{cmd.name}`",
+                value=cmd.help or "Pas de description.",
+                inline=False
+            )
+        embed.set_footer(text=f"{prefix}help <commande> pour plus de détails")
+        return embed
+
+    def _render_detail(self, prefix: str, cmd) -> discord.Embed:
+        embed = discord.Embed(title=f"ℹ️ `{prefix}{cmd.name}`", color=discord.Color.green())
+        embed.add_field(name="📄 Description", value=cmd.help or "Aucune description.", inline=False)
+        if cmd.aliases:
+            embed.add_field(name="🔁 Alias", value=", ".join(f"`{a}`" for a in cmd.aliases), inline=False)
+        return embed
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Exports (commandslist, docs/Liste_des_commandes.md)
+    # ──────────────────────────────────────────────────────────────
+    def export(self, fmt: str = "md") -> str:
+        """Liste de toutes les commandes au format md, json ou csv (rendue une fois par version)."""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Format inconnu : {fmt} (attendu : {', '.join(EXPORT_FORMATS)})")
+        self._ensure_fresh()
+        text = self._exports.get(fmt)
+        if text is None:
+            text = self._exports[fmt] = getattr(self, f"_export_{fmt}")()
+        return text
+
+    def _export_md(self) -> str:
+        lines = ["Liste des Commandes", ""]
+        current = None
+        for category, name, description, _ in self._rows:
+            if category != current:
+                if current is not None:
+                    lines.append("")
+                lines.append(f"### 📂 {category}")
+                current = category
+            lines.append(f"- **{name} :** {description}")
+        lines.append("")
+        return "\n".join(lines) + "\n"
+
+    def _export_json(self) -> str:
+        data = [{"category": c, "name": n, "description": d, "aliases": a} for c, n, d, a in self._rows]
+        return json.dumps(data, ensure_ascii=False, indent=2) + "\n"
+
+    def _export_csv(self) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["category", "name", "description", "aliases"])
+        writer.writerows((c, n, d, " ".join(a)) for c, n, d, a in self._rows)
+        return buffer.getvalue()
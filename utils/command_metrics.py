@@ -0,0 +1,282 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 command_metrics.py — Instrumentation des commandes (préfixe et slash)
+# Objectif : Mesurer par commande l’attente avant exécution, le temps d’exécution,
+#            le temps passé dans les appels API et l’attente du rate limiter (comptée
+#            à part), avec histogrammes p50/p95/p99,
+#            compteurs d’erreurs et export au format texte Prometheus
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import bisect
+import logging
+import os
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+import discord
+from discord import app_commands
+
+from utils.structured_logging import log_context
+
+log = logging.getLogger(__name__)
+
+# Bornes (ms) des buckets : fixes pour un enregistrement en O(log n) sans allocation
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+# Temps cumulés de la commande en cours (alimentés par _discord_action) :
+# [appels Discord, attente du rate limiter avant ces appels]
+api_time: ContextVar = ContextVar("api_time", default=None)
+
+def track_api_time(elapsed: float):
+    """Ajoute elapsed (s) au temps API de la commande en cours, s’il y en a une."""
+    counter = api_time.get()
+    if counter is not None:
+        counter[0] += elapsed
+
+def track_ratelimit_wait(elapsed: float):
+    """Ajoute elapsed (s) à l’attente rate limiter de la commande en cours (hors temps API)."""
+    counter = api_time.get()
+    if counter is not None:
+        counter[1] += elapsed
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📊 Histogramme à buckets fixes
+# ────────────────────────────────────────────────────────────────────────────────
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)  # dernier bucket : +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value_ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, value_ms)] += 1
+        self.total += value_ms
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        """Estimation par interpolation linéaire dans le bucket concerné."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                low = BUCKETS_MS[i - 1] if i > 0 else 0
+                high = BUCKETS_MS[i] if i < len(BUCKETS_MS) else BUCKETS_MS[-1]
+                return low + (high - low) * (rank - seen) / n
+            seen += n
+        return float(BUCKETS_MS[-1])
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Registre des métriques
+# ────────────────────────────────────────────────────────────────────────────────
+class _CommandStats:
+    __slots__ = ("queue", "execution", "api", "ratelimit", "errors")
+
+    def __init__(self):
+        self.queue = Histogram()
+        self.execution = Histogram()
+        self.api = Histogram()
+        self.ratelimit = Histogram()
+        self.errors = 0
+
+class CommandMetrics:
+    """
+    Métriques par commande (bot.command_metrics).
+    - hooks préfixe : bot.before_invoke / bot.after_invoke
+    - hooks slash : InstrumentedTree.interaction_check / on_app_command_completion / on_error
+    - export : render_prometheus(), fichier METRICS_FILE et/ou endpoint local METRICS_PORT
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.commands = {}  # nom qualifié → _CommandStats
+        self._exporters = []
+        bot.before_invoke(self._before_prefix)
+        bot.after_invoke(self._after_prefix)
+        bot.add_listener(self.on_app_command_completion)
+
+    def _stats(self, name: str) -> _CommandStats:
+        stats = self.commands.get(name)
+        if stats is None:
+            stats = self.commands[name] = _CommandStats()
+        return stats
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Enregistrement
+    # ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def _start(created_at: datetime, name: str, guild_id) -> dict:
+        queue_ms = (datetime.now(timezone.utc) - created_at).total_seconds() * 1000
+        counter = [0.0, 0.0]
+        api_time.set(counter)
+        start = time.perf_counter()
+        log_context.set({"command": name, "guild": guild_id, "start": start})  # champs des logs émis pendant la commande
+        return {"start": start, "queue_ms": max(queue_ms, 0.0), "api": counter}
+
+    def _finish(self, name: str, state: dict):
+        stats = self._stats(name)
+        execution_ms = (time.perf_counter() - state["start"]) * 1000
+        stats.queue.observe(state["queue_ms"])
+        stats.execution.observe(execution_ms)
+        stats.api.observe(state["api"][0] * 1000)
+        stats.ratelimit.observe(state["api"][1] * 1000)
+        api_time.set(None)
+        # Journal d’accès (LOG_LEVELS=utils.command_metrics=DEBUG)
+        log.debug("Commande exécutée", extra={"command": name, "latency_ms": round(execution_ms, 2)})
+        log_context.set(None)
+
+    def record_error(self, name: str):
+        self._stats(name).errors += 1
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Hooks préfixe
+    # ──────────────────────────────────────────────────────────────
+    async def _before_prefix(self, ctx):
+        ctx.metrics_state = self._start(ctx.message.created_at, ctx.command.qualified_name, ctx.guild and ctx.guild.id)
+
+    async def _after_prefix(self, ctx):
+        state = getattr(ctx, "metrics_state", None)
+        if state is not None:
+            self._finish(ctx.command.qualified_name, state)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Hooks slash
+    # ──────────────────────────────────────────────────────────────
+    def start_interaction(self, interaction: discord.Interaction):
+        name = f"/{interaction.command.qualified_name}" if interaction.command else None
+        interaction.extras["metrics_state"] = self._start(interaction.created_at, name, interaction.guild_id)
+
+    def finish_interaction(self, interaction: discord.Interaction, command):
+        state = interaction.extras.pop("metrics_state", None)
+        if state is not None and command is not None:
+            self._finish(f"/{command.qualified_name}", state)
+
+    async def on_app_command_completion(self, interaction, command):
+        self.finish_interaction(interaction, command)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Lecture / export
+    # ──────────────────────────────────────────────────────────────
+    def summary(self) -> list:
+        """[(commande, appels, erreurs, p50, p95, p99 exécution, p95 attente, p95 API, p95 rate limit)] trié par p95."""
+        rows = []
+        for name, s in self.commands.items():
+            ex = s.execution
+            rows.append((name, ex.count, s.errors, ex.percentile(0.5), ex.percentile(0.95),
+                         ex.percentile(0.99), s.queue.percentile(0.95), s.api.percentile(0.95),
+                         s.ratelimit.percentile(0.95)))
+        return sorted(rows, key=lambda r: r[4], reverse=True)
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for metric, attr, doc in (
+            ("atem_command_queue_ms", "queue", "Délai entre la création du message/interaction et l’exécution"),
+            ("atem_command_execution_ms", "execution", "Durée d’exécution de la commande"),
+            ("atem_command_api_ms", "api", "Temps passé dans les appels API Discord (hors attente du rate limiter)"),
+            ("atem_command_ratelimit_ms", "ratelimit", "Attente du rate limiter avant les appels API Discord"),
+        ):
+            lines.append(f"# HELP {metric} {doc}")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, stats in self.commands.items():
+                hist = getattr(stats, attr)
+                cumulative = 0
+                for bound, n in zip(BUCKETS_MS + ("+Inf",), hist.counts):
+                    cumulative += n
+                    lines.append(f'{metric}_bucket{{command="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{command="{name}"}} {hist.total:.3f}')
+                lines.append(f'{metric}_count{{command="{name}"}} {hist.count}')
+
+        lines.append("# HELP atem_command_errors_total Erreurs par commande")
+        lines.append("# TYPE atem_command_errors_total counter")
+        for name, stats in self.commands.items():
+            lines.append(f'atem_command_errors_total{{command="{name}"}} {stats.errors}')
+        return "\n".join(lines) + "\n"
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Exporteurs (optionnels)
+    # ──────────────────────────────────────────────────────────────
+    async def start_exporters(self):
+        path = os.getenv("METRICS_FILE")
+        if path:
+            self._exporters.append(asyncio.create_task(self._write_file_loop(path)))
+        port = os.getenv("METRICS_PORT")
+        if port:
+            await self._start_http(int(port))
+
+    async def _write_file_loop(self, path: str, interval: float = 15.0):
+        while True:
+            await asyncio.sleep(interval)
+            text = self.render_prometheus()
+            tmp = f"{path}.tmp"
+            await asyncio.to_thread(self._write_atomic, tmp, path, text)
+
+    @staticmethod
+    def _write_atomic(tmp: str, path: str, text: str):
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    async def _start_http(self, port: int):
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(text=self.render_prometheus(), content_type="text/plain")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        self._exporters.append(runner)
+        log.info("📈 Métriques exposées sur http://127.0.0.1:%s/metrics", port)
+
+    async def stop_exporters(self):
+        for exporter in self._exporters:
+            if isinstance(exporter, asyncio.Task):
+                exporter.cancel()
+            else:
+                await exporter.cleanup()
+        self._exporters = []
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌳 Arbre de commandes slash instrumenté
+# ────────────────────────────────────────────────────────────────────────────────
+class InstrumentedTree(app_commands.CommandTree):
+    """
+    CommandTree qui démarre la mesure avant chaque commande slash et compte les erreurs.
+    Ignore aussi les interactions des serveurs détenus par une autre instance (bot.ownership).
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Plusieurs instances : l’interaction est ignorée si le serveur appartient à une autre
+        ownership = getattr(self.client, "ownership", None)
+        if ownership is not None and not ownership.owns(interaction.guild):
+            return False
+        # Autocomplétion : pas une exécution de commande, ni mesurée ni comptée
+        if interaction.type is discord.InteractionType.autocomplete:
+            return True
+        metrics = getattr(self.client, "command_metrics", None)
+        if metrics is not None:
+            metrics.start_interaction(interaction)
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        metrics = getattr(self.client, "command_metrics", None)
+        command = interaction.command
+        if metrics is not None and command is not None:
+            metrics.record_error(f"/{command.qualified_name}")
+            metrics.finish_interaction(interaction, command)
+        if isinstance(error, app_commands.CommandOnCooldown):
+            # Levée par les checks (utils/cooldowns.py) avant le callback : réponse ici
+            from utils.discord_utils import safe_respond  # import local : discord_utils importe ce module
+            retry = round(error.retry_after, 1)
+            await safe_respond(interaction, f"⏳ Cette commande est en cooldown. Réessaie dans `{retry}` secondes.", ephemeral=True)
+            return
+        await super().on_error(interaction, error)
@@ -0,0 +1,287 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 cooldowns.py — Cooldowns partagés entre commandes préfixe et slash
+# Objectif : Un seul décorateur cooldown() pour !commande et /commande (même compteur),
+#            fenêtres glissantes exactes, compteurs inactifs évincés (mémoire bornée)
+#            et, en option, un stockage partagé entre instances (SQLite ou Supabase)
+#            interrogé par lots : un aller-retour pour toutes les vérifications
+#            arrivées dans la même fenêtre de quelques millisecondes
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict, deque
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+TABLE = "cooldowns"  # key (text, PK), hits (jsonb / text : horodatages), expires_at (float8, epoch) — cf. cooldowns.sql
+
+def _slide(hits: list, rate: int, per: float, now: float):
+    """Fenêtre glissante : (attente restante ou 0, horodatages conservés après ce passage)."""
+    hits = [t for t in hits if t > now - per]
+    if len(hits) >= rate:
+        return hits[0] + per - now, hits
+    hits.append(now)
+    return 0.0, hits
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Stockage en mémoire (défaut)
+# ────────────────────────────────────────────────────────────────────────────────
+class MemoryCooldownBackend:
+    """
+    Compteurs locaux : au plus rate horodatages par clé. Les clés sont groupées par
+    durée de fenêtre et rangées par dernier passage : les clés inactives (fenêtre
+    écoulée) sont toujours en tête et évincées à coût proportionnel aux évictions,
+    avec une taille maximale en dernier recours.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._buckets = {}  # per → OrderedDict(clé → deque d’horodatages)
+        self._size = 0
+        self.metrics = {"allowed": 0, "limited": 0, "evicted": 0}
+
+    def __len__(self):
+        return self._size
+
+    def _evict(self, now: float):
+        for per, keys in self._buckets.items():
+            while keys:
+                key, hits = next(iter(keys.items()))
+                if hits and hits[-1] + per > now and self._size <= self.maxsize:
+                    break
+                del keys[key]
+                self._size -= 1
+                self.metrics["evicted"] += 1
+
+    def peek(self, key: str, rate: int, per: float, now: float) -> float:
+        """Attente restante si la clé est déjà bloquée, sans compter de passage."""
+        hits = self._buckets.get(per, {}).get(key)
+        if hits is None:
+            return 0.0
+        while hits and hits[0] <= now - per:
+            hits.popleft()
+        return hits[0] + per - now if len(hits) >= rate else 0.0
+
+    def record(self, key: str, rate: int, per: float, now: float):
+        keys = self._buckets.setdefault(per, OrderedDict())
+        hits = keys.get(key)
+        if hits is None:
+            hits = keys[key] = deque(maxlen=rate)
+            self._size += 1
+        hits.append(now)
+        keys.move_to_end(key)
+
+    async def hit(self, key: str, rate: int, per: float) -> float:
+        now = time.time()
+        self._evict(now)
+        retry = self.peek(key, rate, per, now)
+        if retry > 0:
+            self.metrics["limited"] += 1
+            return retry
+        self.record(key, rate, per, now)
+        self.metrics["allowed"] += 1
+        return 0.0
+
+    async def stop(self):
+        pass
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗄️ Stockages partagés (même protocole : hit_many, close)
+# ────────────────────────────────────────────────────────────────────────────────
+class SQLiteCooldownStore:
+    """Compteurs dans un fichier SQLite partagé (plusieurs processus sur une machine)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._next_purge = 0.0
+
+    def _hit_many(self, hits: list, now: float) -> list:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} (key TEXT PRIMARY KEY, hits TEXT NOT NULL, expires_at REAL NOT NULL)")
+        conn = self._conn
+        keys = list({key for key, _, _ in hits})
+        conn.execute("BEGIN IMMEDIATE")  # lecture + écriture atomiques vis-à-vis des autres instances
+        try:
+            marks = ",".join("?" * len(keys))
+            state = {k: json.loads(h) for k, h in conn.execute(f"SELECT key, hits FROM {TABLE} WHERE key IN ({marks})", keys)}
+            results, expires = [], {}
+            for key, rate, per in hits:
+                retry, state[key] = _slide(state.get(key, []), rate, per, now)
+                expires[key] = state[key][-1] + per if state[key] else now
+                results.append(retry)
+            conn.executemany(f"INSERT OR REPLACE INTO {TABLE} VALUES (?, ?, ?)",
+                             [(k, json.dumps(state[k]), expires[k]) for k in keys])
+            if now >= self._next_purge:
+                conn.execute(f"DELETE FROM {TABLE} WHERE expires_at < ?", (now,))
+                self._next_purge = now + 60
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return results
+
+    async def hit_many(self, hits: list, now: float) -> list:
+        async with self._lock:
+            return await asyncio.to_thread(self._hit_many, hits, now)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+class SupabaseCooldownStore:
+    """
+    Compteurs dans Supabase : un appel RPC (cooldown_hits) par lot. La table et la
+    fonction sont dans utils/cooldowns.sql, à exécuter une fois dans Supabase ; sans
+    elles chaque lot échoue et SharedCooldownBackend laisse passer les commandes.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def hit_many(self, hits: list, now: float) -> list:
+        payload = [{"key": key, "rate": rate, "per": per} for key, rate, per in hits]
+        return await self.db.run(
+            lambda: self.db.client.rpc("cooldown_hits", {"p_hits": payload, "p_now": now}).execute().data,
+            retries=0,
+        )
+
+    def close(self):
+        pass
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🌐 Cooldowns partagés entre instances
+# ────────────────────────────────────────────────────────────────────────────────
+class SharedCooldownBackend:
+    """
+    Vérifications regroupées par fenêtre de flush_window s vers le stockage partagé.
+    Un miroir local refuse sans aller-retour ce qui est déjà bloqué ici (si c’est
+    bloqué localement, ça l’est aussi globalement). Si le stockage est injoignable,
+    les commandes passent (un cooldown ne doit pas rendre le bot muet).
+    """
+
+    def __init__(self, store, flush_window: float = 0.005):
+        self.store = store
+        self.flush_window = flush_window
+        self.local = MemoryCooldownBackend()
+        self._pending = []  # (clé, rate, per, future)
+        self._flush_task = None
+        self.metrics = {"allowed": 0, "limited": 0, "local_limited": 0, "round_trips": 0, "errors": 0}
+
+    async def hit(self, key: str, rate: int, per: float) -> float:
+        now = time.time()
+        self.local._evict(now)
+        retry = self.local.peek(key, rate, per, now)
+        if retry > 0:
+            self.metrics["local_limited"] += 1
+            return retry
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((key, rate, per, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+        retry = await future
+        if retry > 0:
+            self.metrics["limited"] += 1
+        else:
+            self.metrics["allowed"] += 1
+            self.local.record(key, rate, per, now)
+        return retry
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_window)
+        self._flush_task = None
+        pending, self._pending = self._pending, []
+        self.metrics["round_trips"] += 1
+        try:
+            results = await self.store.hit_many([(k, r, p) for k, r, p, _ in pending], time.time())
+        except Exception as e:
+            self.metrics["errors"] += 1
+            log.warning("Stockage partagé injoignable, commandes autorisées : %s", e)
+            results = [0.0] * len(pending)
+        for (_, _, _, future), retry in zip(pending, results):
+            if not future.done():
+                future.set_result(float(retry or 0.0))
+
+    async def stop(self):
+        self.store.close()
+
+def backend_from_env(db=None):
+    """COOLDOWN_BACKEND=memory (défaut) | sqlite | supabase ; COOLDOWN_SQLITE : chemin du fichier."""
+    mode = os.getenv("COOLDOWN_BACKEND", "memory").lower()
+    if mode == "supabase" and db is not None and db.enabled:
+        return SharedCooldownBackend(SupabaseCooldownStore(db))
+    if mode == "sqlite":
+        return SharedCooldownBackend(SQLiteCooldownStore(os.getenv("COOLDOWN_SQLITE", "cooldowns.sqlite3")))
+    return MemoryCooldownBackend()
+
+_fallback = MemoryCooldownBackend()  # hors de AtemBot (bot sans attribut cooldowns)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🎚️ Décorateur commun préfixe / slash
+# ────────────────────────────────────────────────────────────────────────────────
+# bucket → (identifiant depuis un Context, identifiant depuis une Interaction)
+BUCKETS = {
+    "user": (lambda ctx: ctx.author.id, lambda i: i.user.id),
+    "guild": (lambda ctx: (ctx.guild or ctx.author).id, lambda i: i.guild_id or i.user.id),
+    "channel": (lambda ctx: ctx.channel.id, lambda i: i.channel_id),
+    "member": (lambda ctx: f"{ctx.guild.id if ctx.guild else 0}.{ctx.author.id}",
+               lambda i: f"{i.guild_id or 0}.{i.user.id}"),
+    "global": (lambda ctx: 0, lambda i: 0),
+}
+_BUCKET_TYPES = {
+    "user": commands.BucketType.user, "guild": commands.BucketType.guild, "channel": commands.BucketType.channel,
+    "member": commands.BucketType.member, "global": commands.BucketType.default,
+}
+
+def cooldown(rate: int, per: float, bucket: str = "user"):
+    """
+    Cooldown de rate utilisations par per secondes et par bucket (user, guild, channel,
+    member, global), à poser sur la commande préfixe ET la commande slash : les deux
+    partagent le même compteur (clé = nom de la commande). Lève l’exception
+    CommandOnCooldown habituelle de chaque framework.
+    """
+    from_ctx, from_interaction = BUCKETS[bucket]
+
+    async def remaining(client, name: str, bucket_id) -> float:
+        backend = getattr(client, "cooldowns", None)
+        if backend is None:  # pas de « or » : un backend vide vaut False (__len__)
+            backend = _fallback
+        return await backend.hit(f"{name}:{bucket}:{bucket_id}", rate, per)
+
+    async def prefix_check(ctx: commands.Context) -> bool:
+        retry = await remaining(ctx.bot, ctx.command.qualified_name, from_ctx(ctx))
+        if retry > 0:
+            raise commands.CommandOnCooldown(commands.Cooldown(rate, per), retry, _BUCKET_TYPES[bucket])
+        return True
+
+    async def slash_check(interaction: discord.Interaction) -> bool:
+        retry = await remaining(interaction.client, interaction.command.qualified_name, from_interaction(interaction))
+        if retry > 0:
+            raise app_commands.CommandOnCooldown(app_commands.Cooldown(rate, per), retry)
+        return True
+
+    def decorator(func):
+        if isinstance(func, commands.Command):
+            return commands.check(prefix_check)(func)
+        if isinstance(func, app_commands.Command):
+            return app_commands.check(slash_check)(func)
+        # Fonction brute (décorateur sous @command) : chaque framework ne lit que son propre check
+        commands.check(prefix_check)(func)
+        return app_commands.check(slash_check)(func)
+    return decorator
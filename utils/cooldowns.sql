@@ -0,0 +1,67 @@
+-- ────────────────────────────────────────────────────────────────────────────────
+-- 📌 cooldowns.sql — Stockage Supabase des cooldowns partagés (COOLDOWN_BACKEND=supabase)
+-- Objectif : Table et fonction RPC cooldown_hits appelées par SupabaseCooldownStore
+--            (utils/cooldowns.py) ; même fenêtre glissante que _slide() et que le
+--            stockage SQLite
+-- Installation : à exécuter une fois dans l’éditeur SQL de Supabase (idempotent)
+-- ────────────────────────────────────────────────────────────────────────────────
+
+create table if not exists cooldowns (
+    key text primary key,                  -- "commande:bucket:identifiant"
+    hits jsonb not null default '[]',      -- horodatages (epoch, s) encore dans la fenêtre
+    expires_at float8 not null             -- dernier passage + per : ligne inutile ensuite
+);
+
+create index if not exists cooldowns_expires_at on cooldowns (expires_at);
+
+-- p_hits : [{"key": text, "rate": int, "per": float8}, …] ; renvoie, dans le même ordre,
+-- l’attente restante (0 si le passage est accepté et compté)
+create or replace function cooldown_hits(p_hits jsonb, p_now float8)
+returns float8[]
+language plpgsql
+as $$
+declare
+    item jsonb;
+    v_key text;
+    v_rate int;
+    v_per float8;
+    v_hits float8[];
+    v_retry float8;
+    results float8[] := '{}';
+begin
+    for item in select value from jsonb_array_elements(p_hits) loop
+        v_key := item->>'key';
+        v_rate := (item->>'rate')::int;
+        v_per := (item->>'per')::float8;
+
+        -- Ligne créée si besoin puis verrouillée : lecture + écriture atomiques entre instances
+        insert into cooldowns (key, hits, expires_at) values (v_key, '[]', p_now)
+        on conflict (key) do nothing;
+        perform 1 from cooldowns where key = v_key for update;
+
+        select coalesce(array_agg(h.t order by h.t), '{}')
+          into v_hits
+          from cooldowns c,
+               lateral (select value::float8 as t from jsonb_array_elements_text(c.hits)) h
+         where c.key = v_key and h.t > p_now - v_per;
+
+        if coalesce(array_length(v_hits, 1), 0) >= v_rate then
+            v_retry := v_hits[1] + v_per - p_now;
+        else
+            v_retry := 0;
+            v_hits := v_hits || p_now;
+        end if;
+
+        update cooldowns
+           set hits = to_jsonb(v_hits),
+               expires_at = v_hits[array_length(v_hits, 1)] + v_per
+         where key = v_key;
+        results := results || v_retry;
+    end loop;
+
+    -- Purge des lignes expirées, sans attendre celles verrouillées par une autre instance
+    delete from cooldowns
+     where key in (select key from cooldowns where expires_at < p_now limit 1000 for update skip locked);
+    return results;
+end;
+$$;
@@ -0,0 +1,269 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 data_store.py — Fichiers JSON partagés par les commandes (data/*.json)
+# Objectif : Charger chaque fichier une seule fois et ne le relire que si sa date de
+#            modification puis son contenu (empreinte) ont changé ; vues en lecture
+#            seule avec index précalculés (clé → sous-clés pour les menus)
+# Gros fichiers : mode paresseux (mmap + index des clés sur disque) — seules les
+#                 valeurs demandées sont décodées
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+
+log = logging.getLogger(__name__)
+
+DATA_DIR = "data"
+LAZY_THRESHOLD = int(float(os.getenv("DATA_LAZY_MB", "32")) * 1024 * 1024)
+INDEX_SUFFIX = ".index.json"
+INDEX_DIR = os.getenv("DATA_INDEX_DIR", os.path.join(".cache", "data_index"))  # hors de data/ (cf. .gitignore)
+
+def _freeze(value):
+    """Copie en lecture seule : dict → MappingProxyType, list → tuple."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _index_path(path: str) -> str:
+    """Fichier d’index d’un gros fichier : nom lisible + empreinte du chemin (pas de collision)."""
+    tag = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(INDEX_DIR, f"{os.path.basename(path)}.{tag}{INDEX_SUFFIX}")
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📖 Vues en lecture seule
+# ────────────────────────────────────────────────────────────────────────────────
+class DataView(Mapping):
+    """
+    Fichier chargé entièrement, figé (objet JSON à la racine ; sinon voir .root).
+    - sub_keys(clé) : sous-clés d’une entrée (index construit une fois par version)
+    - index(nom, builder) : index quelconque mémorisé, builder(vue) appelé une fois
+    """
+
+    def __init__(self, data, digest: str):
+        self.root = _freeze(data)
+        self.digest = digest
+        self._indexes = {}
+
+    def __getitem__(self, key):
+        return self.root[key]
+
+    def __iter__(self):
+        return iter(self.root)
+
+    def __len__(self):
+        return len(self.root)
+
+    def index(self, name: str, builder):
+        if name not in self._indexes:
+            self._indexes[name] = builder(self)
+        return self._indexes[name]
+
+    def sub_keys(self, key) -> tuple:
+        subs = self.index("sub_keys", lambda view: {
+            k: tuple(v) for k, v in view.items() if isinstance(v, Mapping)
+        })
+        return subs.get(key, ())
+
+class LazyDataView(Mapping):
+    """
+    Gros fichier (objet JSON à la racine) : le fichier est projeté en mémoire (mmap)
+    et seules les valeurs lues sont décodées (cache LRU). L’index des clés (positions
+    et sous-clés) est enregistré dans INDEX_DIR et réutilisé tant que l’empreinte ne
+    change pas : pas de décodage complet au démarrage. Le mmap et le fichier sont
+    libérés quand plus personne ne tient la vue (GC), ou par close().
+    """
+
+    def __init__(self, path: str, digest: str, entries: dict, cache_size: int = 256):
+        self.digest = digest
+        self._entries = entries  # clé → [début, fin, sous-clés ou None] (octets)
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        # Une vue remplacée reste lisible par ceux qui la tiennent encore (lecture à cheval
+        # sur un await) : libération seulement quand la dernière référence disparaît
+        self._release = weakref.finalize(self, _release_map, self._map, self._file)
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._indexes = {}
+
+    def __getitem__(self, key):
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        start, end, _ = self._entries[key]
+        value = self._cache[key] = _freeze(json.loads(self._map[start:end]))
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def index(self, name: str, builder):
+        if name not in self._indexes:
+            self._indexes[name] = builder(self)
+        return self._indexes[name]
+
+    def sub_keys(self, key) -> tuple:
+        entry = self._entries.get(key)
+        return tuple(entry[2]) if entry and entry[2] is not None else ()
+
+    def close(self):
+        self._release()
+
+def _release_map(map_: mmap.mmap, file):
+    map_.close()
+    file.close()
+
+def _build_entries(path: str) -> dict:
+    """Positions (en octets) de chaque valeur de l’objet racine, avec ses sous-clés."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    text = raw.decode("utf-8")
+    decoder = json.JSONDecoder()
+    ws = " \t\r\n"
+
+    pos = len(text) - len(text.lstrip(ws))
+    if text[pos:pos + 1] != "{":
+        raise ValueError("le mode paresseux attend un objet JSON à la racine")
+    pos += 1
+    entries, byte_pos, char_pos = {}, 0, 0
+
+    def to_bytes(index: int) -> int:
+        nonlocal byte_pos, char_pos  # avance incrémentale : O(taille du fichier) au total
+        byte_pos += len(text[char_pos:index].encode("utf-8"))
+        char_pos = index
+        return byte_pos
+
+    while True:
+        while text[pos] in ws or text[pos] == ",":
+            pos += 1
+        if text[pos] == "}":
+            return entries
+        key, pos = decoder.raw_decode(text, pos)
+        while text[pos] in ws or text[pos] == ":":
+            pos += 1
+        start = pos
+        value, pos = decoder.raw_decode(text, pos)
+        subs = list(value) if isinstance(value, dict) else None
+        entries[key] = [to_bytes(start), to_bytes(pos), subs]
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Service partagé
+# ────────────────────────────────────────────────────────────────────────────────
+class DataStore:
+    """
+    Fichiers de données partagés (bot.data_store).
+    - await get("fichier.json") : vue à jour ou None si absent / invalide ; un simple
+      stat quand rien n’a bougé, relecture (dans un thread) seulement si la date de
+      modification ET l’empreinte ont changé ; chargements simultanés regroupés
+    - au-delà de DATA_LAZY_MB (32 par défaut) ou avec lazy=True : LazyDataView ; une
+      version remplacée (ou invalidée) est seulement relâchée, et son mmap libéré une
+      fois le dernier lecteur terminé
+    """
+
+    def __init__(self, base_dir: str = DATA_DIR, lazy_threshold: int = LAZY_THRESHOLD):
+        self.base_dir = base_dir
+        self.lazy_threshold = lazy_threshold
+        self._views = {}  # nom → (mtime_ns, taille, vue)
+        self._locks = {}
+        self.metrics = {"hits": 0, "reloads": 0, "unchanged": 0}
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.base_dir, name)
+
+    async def get(self, name: str, *, lazy: bool = None):
+        path = self.path(name)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            log.error("Impossible de charger %s : %s", path, e)
+            return None
+        cached = self._views.get(name)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            self.metrics["hits"] += 1
+            return cached[2]
+
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            cached = self._views.get(name)
+            if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return cached[2]
+            if lazy is None:
+                lazy = stat.st_size >= self.lazy_threshold
+            try:
+                view = await asyncio.to_thread(self._load, path, cached[2] if cached else None, lazy)
+            except (OSError, ValueError, IndexError) as e:
+                log.error("Impossible de charger %s : %s", path, e)
+                return cached[2] if cached else None
+            self._views[name] = (stat.st_mtime_ns, stat.st_size, view)
+            return view
+
+    def invalidate(self, name: str = None):
+        if name is None:
+            self._views.clear()
+        else:
+            self._views.pop(name, None)
+
+    def close(self):
+        """Relâche toutes les vues (arrêt du bot) ; les mmap suivent leur dernier lecteur."""
+        self.invalidate()
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Chargement (thread)
+    # ──────────────────────────────────────────────────────────────
+    def _load(self, path: str, previous, lazy: bool):
+        digest = _file_digest(path)
+        if previous is not None and previous.digest == digest and isinstance(previous, LazyDataView) == lazy:
+            self.metrics["unchanged"] += 1  # fichier touché mais contenu identique
+            return previous
+        self.metrics["reloads"] += 1
+        if lazy:
+            return LazyDataView(path, digest, self._lazy_entries(path, digest))
+        with open(path, "r", encoding="utf-8") as f:
+            return DataView(json.load(f), digest)
+
+    @staticmethod
+    def _lazy_entries(path: str, digest: str) -> dict:
+        index_path = _index_path(path)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("digest") == digest:
+                return saved["entries"]
+        except (OSError, ValueError):
+            pass
+        entries = _build_entries(path)
+        try:
+            os.makedirs(INDEX_DIR, exist_ok=True)
+            tmp = f"{index_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"digest": digest, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp, index_path)
+        except OSError as e:
+            log.warning("Index non enregistré pour %s : %s", path, e)
+        return entries
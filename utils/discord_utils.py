@@ -1,74 +1,329 @@
 # ────────────────────────────────────────────────────────────────────────────────
 # 📌 discord_utils.py — Fonctions utilitaires sécurisées pour Discord
 # Objectif : Fournir des fonctions send/edit/respond optimisées avec gestion du rate-limit
-# Version : ✅ Optimisée et robuste, backoff exponentiel, logs clairs
+# Version : ✅ Optimisée et robuste, rythme piloté par les en-têtes X-RateLimit-*, logs clairs
 # ────────────────────────────────────────────────────────────────────────────────
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📦 Imports nécessaires
 # ────────────────────────────────────────────────────────────────────────────────
 import asyncio
+import logging
+import time
 import discord
 from discord.errors import HTTPException
 
+from utils.rate_limiter import RateLimiter, route_key
+from utils.command_metrics import track_api_time, track_ratelimit_wait
+
+log = logging.getLogger(__name__)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⏱️ Ordonnanceur partagé (alimenté par les en-têtes de réponse, cf. bot.py http_trace)
+# ────────────────────────────────────────────────────────────────────────────────
+rate_limiter = RateLimiter()
+
+def _channel_id(target):
+    """Renvoie l’ID du salon ciblé (Context, Message, salon) ou None si inconnu (DM non ouvert)."""
+    channel = getattr(target, "channel", target)
+    return getattr(channel, "id", None) if not isinstance(channel, (discord.User, discord.Member)) else None
+
+def _route(method: str, path: str):
+    return route_key(method, path) if path else None
+
 # ────────────────────────────────────────────────────────────────────────────────
 # 🛡️ Gestion centralisée des appels Discord avec backoff 429
 # ────────────────────────────────────────────────────────────────────────────────
-async def _discord_action(action_func, *args, retry=3, delay=0.3, **kwargs):
+async def _discord_action(action_func, *args, retry=3, delay=0, route=None, **kwargs):
     """
     Exécute une action Discord sécurisée avec gestion du rate-limit et des exceptions.
     - action_func : fonction Discord à appeler (send, edit, reply, etc.)
     - retry : nombre de tentatives en cas de 429
-    - delay : délai entre chaque tentative (anti-429)
+    - delay : pause optionnelle après l’appel (le rythme est normalement géré par rate_limiter)
+    - route : clé de route Discord ("POST /channels/123/messages") pour le bucket à réserver
     """
+    return await _discord_attempts(action_func, args, kwargs, retry, delay, route)
+
+async def _discord_attempts(action_func, args, kwargs, retry, delay, route):
+    """Boucle de tentatives de _discord_action (réservation du bucket puis appel)."""
     for attempt in range(1, retry + 2):
+        # Attente du rate limiter et temps de l’appel comptés à part (cf. command_metrics)
+        start = time.perf_counter()
+        await rate_limiter.acquire(route)
+        called = time.perf_counter()
+        track_ratelimit_wait(called - start)
         try:
-            result = await action_func(*args, **kwargs)
+            try:
+                result = await action_func(*args, **kwargs)
+            finally:
+                track_api_time(time.perf_counter() - called)
             if delay > 0:
                 await asyncio.sleep(delay)
             return result
         except HTTPException as e:
             if e.status == 429:
-                wait_time = 10 * attempt  # backoff exponentiel
-                print(f"[RateLimit] {action_func.__name__} → 429 Too Many Requests. Pause {wait_time}s...")
-                await asyncio.sleep(wait_time)
+                headers = getattr(e.response, "headers", None) or {}
+                wait_time = float(headers.get("Retry-After", 2 ** attempt))
+                if not rate_limiter.tracing:  # sinon déjà enregistré par le TraceConfig
+                    rate_limiter.throttled(route, wait_time, headers.get("X-RateLimit-Global") == "true")
+                log.warning("%s → 429 Too Many Requests. Pause %ss", action_func.__name__, wait_time)
+                if route is None:
+                    await asyncio.sleep(wait_time)
+                    track_ratelimit_wait(wait_time)
             else:
                 raise e
         except Exception as e:
-            print(f"[Erreur] {action_func.__name__} → {e}")
+            log.error("%s → %s", action_func.__name__, e)
             return None
-    print(f"[Erreur] {action_func.__name__} → Échec après {retry+1} tentatives")
+    log.error("%s → Échec après %d tentatives", action_func.__name__, retry + 1)
     return None
 
 # ────────────────────────────────────────────────────────────────────────────────
 # 📩 Fonctions publiques sécurisées
 # ────────────────────────────────────────────────────────────────────────────────
 async def safe_send(channel: discord.abc.Messageable, content=None, **kwargs):
-    return await _discord_action(channel.send, content=content, **kwargs)
+    cid = _channel_id(channel)
+    route = _route("POST", cid and f"/channels/{cid}/messages")
+    return await _discord_action(channel.send, content=content, route=route, **kwargs)
 
 async def safe_edit(message: discord.Message, content=None, **kwargs):
-    return await _discord_action(message.edit, content=content, **kwargs)
+    cid = _channel_id(message)
+    route = _route("PATCH", cid and f"/channels/{cid}/messages/{message.id}")
+    return await _discord_action(message.edit, content=content, route=route, **kwargs)
 
 async def safe_respond(interaction: discord.Interaction, content=None, **kwargs):
     return await _discord_action(interaction.response.send_message, content=content, **kwargs)
 
+async def safe_update(interaction: discord.Interaction, **kwargs):
+    """Modifie le message du composant cliqué en guise de réponse (un seul appel)."""
+    return await _discord_action(interaction.response.edit_message, **kwargs)
+
 async def safe_followup(interaction: discord.Interaction, content=None, **kwargs):
     return await _discord_action(interaction.followup.send, content=content, **kwargs)
 
 async def safe_reply(ctx_or_message, content=None, **kwargs):
-    return await _discord_action(ctx_or_message.reply, content=content, **kwargs)
+    cid = _channel_id(ctx_or_message)
+    route = _route("POST", cid and f"/channels/{cid}/messages")
+    return await _discord_action(ctx_or_message.reply, content=content, route=route, **kwargs)
 
-async def safe_add_reaction(message: discord.Message, emoji: str, delay: float = 0.3):
-    return await _discord_action(message.add_reaction, emoji, delay=delay)
+async def safe_add_reaction(message: discord.Message, emoji: str, delay: float = 0):
+    cid = _channel_id(message)
+    route = _route("PUT", cid and f"/channels/{cid}/messages/{message.id}/reactions/emoji/@me")
+    return await _discord_action(message.add_reaction, emoji, delay=delay, route=route)
 
 async def safe_delete(message: discord.Message, delay: float = 0):
-    result = await _discord_action(message.delete)
+    cid = _channel_id(message)
+    route = _route("DELETE", cid and f"/channels/{cid}/messages/{message.id}")
+    result = await _discord_action(message.delete, route=route)
     if delay > 0:
         await asyncio.sleep(delay)
     return result
 
-async def safe_clear_reactions(message: discord.Message, delay: float = 0.3):
-    result = await _discord_action(message.clear_reactions)
+async def safe_clear_reactions(message: discord.Message, delay: float = 0):
+    cid = _channel_id(message)
+    route = _route("DELETE", cid and f"/channels/{cid}/messages/{message.id}/reactions")
+    result = await _discord_action(message.clear_reactions, route=route)
     if delay > 0:
         await asyncio.sleep(delay)
     return result
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Opérations groupées (concurrence bornée, un résultat par élément)
+# ────────────────────────────────────────────────────────────────────────────────
+BULK_CONCURRENCY = 4
+BULK_DELETE_LIMIT = 100                                  # messages max par appel bulk-delete
+BULK_DELETE_MAX_AGE = 14 * 24 * 3600 - 60                # Discord refuse au-delà de 14 jours (marge 1 min)
+
+async def _bounded(items, worker, concurrency: int) -> list:
+    """Applique worker à chaque élément, au plus concurrency à la fois ; résultats dans l’ordre."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item):
+        async with semaphore:
+            return await worker(item)
+    return await asyncio.gather(*(run(item) for item in items))
+
+async def _succeeded(action_func, *args, route=None, **kwargs) -> bool:
+    """True si l’appel a abouti (les safe_* renvoient None aussi bien en cas de succès que d’échec)."""
+    async def action():
+        await action_func(*args, **kwargs)
+        return True
+    action.__name__ = getattr(action_func, "__name__", "action")
+    try:
+        return await _discord_action(action, route=route) is True
+    except HTTPException as e:
+        log.error("%s → %s", action.__name__, e)
+        return False
+
+async def safe_add_reactions(message: discord.Message, emojis: list, *, ordered: bool = True,
+                             concurrency: int = BULK_CONCURRENCY) -> list:
+    """
+    Ajoute plusieurs réactions ; [True/False] par emoji. Le rythme suit le bucket de la
+    route (en-têtes X-RateLimit-*) au lieu d’un délai fixe. ordered=True (défaut) garde
+    l’ordre d’affichage ; sinon jusqu’à concurrency appels en parallèle.
+    """
+    cid = _channel_id(message)
+    route = _route("PUT", cid and f"/channels/{cid}/messages/{message.id}/reactions/emoji/@me")
+    return await _bounded(emojis, lambda emoji: _succeeded(message.add_reaction, emoji, route=route),
+                          1 if ordered else concurrency)
+
+async def safe_delete_messages(messages: list, *, concurrency: int = BULK_CONCURRENCY) -> list:
+    """
+    Supprime des messages ; [True/False] par message. Par salon, ceux de moins de 14 jours
+    partent par paquets de 100 (channel.delete_messages, un seul appel) ; les plus
+    anciens, les salons sans suppression groupée et les paquets refusés sont supprimés
+    un par un, au plus concurrency à la fois.
+    """
+    results = {}
+    singles = []
+    now = time.time()
+    by_channel = {}
+    for message in messages:
+        by_channel.setdefault(_channel_id(message) or id(message.channel), []).append(message)
+
+    for cid, channel_messages in by_channel.items():
+        channel = channel_messages[0].channel
+        recent = [m for m in channel_messages if now - m.created_at.timestamp() < BULK_DELETE_MAX_AGE]
+        if len(recent) < 2 or not hasattr(channel, "delete_messages"):
+            singles.extend(channel_messages)
+            continue
+        recent_ids = {m.id for m in recent}
+        singles.extend(m for m in channel_messages if m.id not in recent_ids)
+        route = _route("POST", f"/channels/{cid}/messages/bulk-delete")
+        for start in range(0, len(recent), BULK_DELETE_LIMIT):
+            chunk = recent[start:start + BULK_DELETE_LIMIT]
+            if await _succeeded(channel.delete_messages, chunk, route=route):
+                results.update((m.id, True) for m in chunk)
+            else:
+                singles.extend(chunk)  # ex : message déjà supprimé dans le paquet
+
+    async def delete_one(message):
+        cid = _channel_id(message)
+        route = _route("DELETE", cid and f"/channels/{cid}/messages/{message.id}")
+        results[message.id] = await _succeeded(message.delete, route=route)
+    await _bounded(singles, delete_one, concurrency)
+    return [results.get(m.id, False) for m in messages]
+
+async def safe_edit_many(edits: list, *, concurrency: int = BULK_CONCURRENCY) -> list:
+    """
+    Modifie plusieurs messages : edits = [(message, {kwargs de edit})] ; [message modifié
+    ou None] par élément. Seuls les champs fournis changent (pas de content=None implicite).
+    """
+    async def edit_one(edit):
+        message, kwargs = edit
+        cid = _channel_id(message)
+        route = _route("PATCH", cid and f"/channels/{cid}/messages/{message.id}")
+        try:
+            return await _discord_action(message.edit, route=route, **kwargs)
+        except HTTPException as e:
+            log.error("edit → %s", e)
+            return None
+    return await _bounded(edits, edit_one, concurrency)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📬 File d’envoi par salon (optionnelle) avec regroupement des messages
+# ────────────────────────────────────────────────────────────────────────────────
+MAX_MESSAGE_LENGTH = 2000
+MAX_EMBEDS_PER_MESSAGE = 10
+
+class _ChannelQueue:
+    """Accumule les envois d’un salon pendant flush_window puis les regroupe en un minimum de messages."""
+
+    def __init__(self, key, channel: discord.abc.Messageable, flush_window: float):
+        self.key = key
+        self.channel = channel
+        self.flush_window = flush_window
+        self.pending = []  # (content, embeds, kwargs, future)
+        self.flush_task = None
+        self.lock = asyncio.Lock()  # conserve l’ordre si un flush démarre pendant le précédent
+
+    def push(self, content, embeds, kwargs) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((content, embeds, kwargs, future))
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self._flush_later())
+        return future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_window)
+        self.flush_task = None
+        pending, self.pending = self.pending, []
+        async with self.lock:
+            for content, embeds, kwargs, futures in self._batches(pending):
+                try:
+                    message = await safe_send(self.channel, content, embeds=embeds or discord.utils.MISSING, **kwargs)
+                except Exception as e:
+                    message = None
+                    log.error("queued_send → %s", e)
+                for future in futures:
+                    if not future.done():
+                        future.set_result(message)
+        if not self.pending and self.flush_task is None:
+            _channel_queues.pop(self.key, None)
+
+    @staticmethod
+    def _batches(pending):
+        """
+        Regroupe les textes consécutifs (≤ 2000 caractères) et les embeds consécutifs (≤ 10)
+        envoyés avec les mêmes options (allowed_mentions…).
+        """
+        batch_text, batch_embeds, batch_futures = [], [], []
+        batch_kwargs, size = {}, 0
+
+        for content, embeds, kwargs, future in pending:
+            is_text = content is not None
+            fits = kwargs == batch_kwargs and (
+                (is_text and not batch_embeds and size + len(content) + (1 if batch_text else 0) <= MAX_MESSAGE_LENGTH)
+                or (not is_text and not batch_text and len(batch_embeds) + len(embeds) <= MAX_EMBEDS_PER_MESSAGE)
+            )
+            if batch_futures and not fits:
+                yield ("\n".join(batch_text) if batch_text else None), batch_embeds, batch_kwargs, batch_futures
+                batch_text, batch_embeds, batch_futures, size = [], [], [], 0
+
+            batch_kwargs = kwargs
+            if is_text:
+                size += len(content) + (1 if batch_text else 0)
+                batch_text.append(content)
+            else:
+                batch_embeds.extend(embeds)
+            batch_futures.append(future)
+
+        if batch_futures:
+            yield ("\n".join(batch_text) if batch_text else None), batch_embeds, batch_kwargs, batch_futures
+
+_channel_queues = {}
+
+def _split_text(text: str, limit: int = MAX_MESSAGE_LENGTH) -> list:
+    """Découpe un texte en morceaux ≤ limit, sur un retour à la ligne si possible."""
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit + 1)
+        if cut <= 0:
+            cut = limit
+        chunks.append(text[:cut])
+        text = text[cut + 1:] if text[cut] == "\n" else text[cut:]
+    if text:
+        chunks.append(text)
+    return chunks
+
+def queued_send(channel: discord.abc.Messageable, content: str = None, *, embed: discord.Embed = None,
+                embeds: list = None, flush_window: float = 0.25, **kwargs) -> asyncio.Future:
+    """
+    Variante opt-in de safe_send : met l’envoi en file pour le salon et renvoie un Future
+    résolu avec le message qui contient ce contenu (ou None en cas d’échec).
+    Les envois texte seuls ou embeds seuls reçus dans la même fenêtre sont fusionnés,
+    seulement entre appels aux kwargs égaux (transmis à safe_send : allowed_mentions…).
+    Un texte de plus de 2000 caractères est découpé ; le Future est celui du premier morceau.
+    """
+    embeds = list(embeds or []) + ([embed] if embed else [])
+    if (content is None) == (not embeds):
+        raise ValueError("queued_send attend soit un texte, soit un ou plusieurs embeds")
+
+    key = _channel_id(channel) or id(channel)
+    queue = _channel_queues.get(key)
+    if queue is None:
+        queue = _channel_queues[key] = _ChannelQueue(key, channel, flush_window)
+    if content is None:
+        return queue.push(None, embeds, kwargs)
+    futures = [queue.push(chunk, [], kwargs) for chunk in _split_text(content) or [content]]
+    return futures[0]
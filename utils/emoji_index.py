@@ -0,0 +1,94 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 emoji_index.py — Index partagé des emojis custom par serveur
+# Objectif : Construire une seule fois la table nom → emoji de chaque serveur,
+#            la tenir à jour via les événements et servir substitution / autocomplete
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import bisect
+import re
+
+import discord
+
+# Motif précompilé pour les :nom: (la casse est gérée par l’index, pas par le regex)
+EMOJI_PATTERN = re.compile(r":([a-zA-Z0-9_]+):")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📇 Index d’un serveur
+# ────────────────────────────────────────────────────────────────────────────────
+class _GuildEmojis:
+    __slots__ = ("by_name", "names")
+
+    def __init__(self, emojis):
+        self.by_name = {e.name.lower(): str(e) for e in emojis}
+        self.names = sorted(self.by_name)  # trié pour les recherches par préfixe
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Service partagé
+# ────────────────────────────────────────────────────────────────────────────────
+class EmojiIndex:
+    """
+    Index nom → emoji par serveur, disponible pour tous les cogs via bot.emoji_index.
+    Mis à jour par on_guild_emojis_update, on_guild_join et on_guild_remove.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._guilds = {}  # guild_id → _GuildEmojis
+        bot.add_listener(self.on_guild_emojis_update)
+        bot.add_listener(self.on_guild_join)
+        bot.add_listener(self.on_guild_remove)
+
+    def _index(self, guild: discord.Guild) -> _GuildEmojis:
+        index = self._guilds.get(guild.id)
+        if index is None:
+            # Construction paresseuse (serveur vu avant l’enregistrement des événements)
+            index = self._guilds[guild.id] = _GuildEmojis(guild.emojis)
+        return index
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Recherches
+    # ──────────────────────────────────────────────────────────────
+    def get(self, guild: discord.Guild, name: str):
+        """Renvoie l’emoji (sous forme de texte) correspondant à name, ou None."""
+        return self._index(guild).by_name.get(name.lower())
+
+    def get_many(self, guild: discord.Guild, names) -> dict:
+        """Recherche groupée : {nom: emoji ou None}."""
+        by_name = self._index(guild).by_name
+        return {name: by_name.get(name.lower()) for name in names}
+
+    def autocomplete(self, guild: discord.Guild, prefix: str, limit: int = 25) -> list:
+        """Noms d’emojis commençant par prefix (insensible à la casse), triés."""
+        names = self._index(guild).names
+        prefix = prefix.lower()
+        start = bisect.bisect_left(names, prefix)
+        results = []
+        for name in names[start:start + limit]:
+            if not name.startswith(prefix):
+                break
+            results.append(name)
+        return results
+
+    def substitute(self, guild: discord.Guild, text: str) -> str:
+        """Remplace chaque :nom: connu du serveur par l’emoji correspondant."""
+        if ":" not in text:
+            return text
+        by_name = self._index(guild).by_name
+        if not by_name:
+            return text
+        return EMOJI_PATTERN.sub(lambda m: by_name.get(m.group(1).lower(), m.group(0)), text)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Événements
+    # ──────────────────────────────────────────────────────────────
+    async def on_guild_emojis_update(self, guild: discord.Guild, before, after):
+        self._guilds[guild.id] = _GuildEmojis(after)
+
+    async def on_guild_join(self, guild: discord.Guild):
+        self._guilds[guild.id] = _GuildEmojis(guild.emojis)
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._guilds.pop(guild.id, None)
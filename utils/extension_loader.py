@@ -0,0 +1,245 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 extension_loader.py — Chargement des extensions (commands/*/ et tasks/)
+# Objectif : Charger les extensions en parallèle, différer les cogs lourds jusqu’à
+#            leur première utilisation et mesurer le temps de chaque chargement
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import ast
+import asyncio
+import importlib
+import logging
+import os
+import re
+import time
+
+from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+# Modules du bot : jamais préchargés dans un thread (effets de bord à l’import)
+_INTERNAL_ROOTS = {"bot", "commands", "tasks", "utils"}
+_CATEGORY_HEADER = re.compile(r"^#\s*Catégorie\s*:\s*(.+)$", re.MULTILINE)
+_IGNORED_TASKS = {"keep_alive.py"}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔍 Analyse statique d’un module d’extension
+# ────────────────────────────────────────────────────────────────────────────────
+def _external_imports(tree: ast.Module) -> list:
+    """Modules tiers importés au niveau du module (préchargeables dans un thread)."""
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return [m for m in modules if m.split(".")[0] not in _INTERNAL_ROOTS]
+
+def _literal(node, default=None):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return default
+
+def _prefix_commands(tree: ast.Module) -> list:
+    """Commandes préfixe déclarées via @commands.command(...) : [(nom, alias, aide)]."""
+    found = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.AsyncFunctionDef):
+            continue
+        for deco in node.decorator_list:
+            if not (isinstance(deco, ast.Call) and isinstance(deco.func, ast.Attribute)):
+                continue
+            if deco.func.attr not in ("command", "hybrid_command") or getattr(deco.func.value, "id", None) != "commands":
+                continue
+            kwargs = {kw.arg: kw.value for kw in deco.keywords}
+            name = _literal(kwargs["name"]) if "name" in kwargs else node.name
+            aliases = _literal(kwargs["aliases"], []) if "aliases" in kwargs else []
+            help_text = _literal(kwargs["help"]) if "help" in kwargs else ast.get_docstring(node)
+            found.append((name, list(aliases), help_text))
+    return found
+
+def _default_category(tree: ast.Module, source: str) -> str:
+    """Catégorie affectée dans setup() (command.category = "..."), sinon celle de l’en-tête."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant):
+            if any(isinstance(t, ast.Attribute) and t.attr == "category" for t in node.targets):
+                return node.value.value
+    match = _CATEGORY_HEADER.search(source)
+    return match.group(1).strip() if match else "Autre"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Chargeur
+# ────────────────────────────────────────────────────────────────────────────────
+class ExtensionLoader:
+    """
+    Charge les extensions du bot (bot.extension_loader).
+    - load_all() : précharge en parallèle (threads) les dépendances tierces de chaque
+      extension, puis exécute les setup() en parallèle
+    - lazy : extensions remplacées par des commandes préfixe « stub » qui chargent
+      le vrai cog à la première invocation puis rejouent le message
+      (les commandes slash d’un cog différé n’existent qu’après son chargement)
+    - timings : temps d’import (dépendances) et de setup par extension
+    """
+
+    def __init__(self, bot, lazy=None):
+        self.bot = bot
+        if lazy is None:
+            lazy = [name.strip() for name in os.getenv("LAZY_EXTENSIONS", "").split(",") if name.strip()]
+        self.lazy = set(lazy)
+        # prefetch_ms : analyse du source + import des dépendances externes (thread) ;
+        # setup_ms : load_extension (exécution du module du cog et setup())
+        self.timings = {}   # extension → {"prefetch_ms", "setup_ms", "status"}
+        self._deferred = {}  # extension → [noms des commandes stub]
+        self._locks = {}
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Découverte
+    # ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def discover() -> list:
+        """Liste les extensions : commands/<catégorie>/*.py puis tasks/*.py."""
+        extensions = []
+        for category in sorted(os.listdir("commands")):
+            cat_path = os.path.join("commands", category)
+            if os.path.isdir(cat_path):
+                for filename in sorted(os.listdir(cat_path)):
+                    if filename.endswith(".py") and not filename.startswith("_"):
+                        extensions.append(f"commands.{category}.{filename[:-3]}")
+        if os.path.isdir("tasks"):
+            for filename in sorted(os.listdir("tasks")):
+                if filename.endswith(".py") and not filename.startswith("_") and filename not in _IGNORED_TASKS:
+                    extensions.append(f"tasks.{filename[:-3]}")
+        return extensions
+
+    @staticmethod
+    def source_path(extension: str) -> str:
+        return os.path.join(*extension.split(".")) + ".py"
+
+    def _parse(self, extension: str):
+        with open(self.source_path(extension), "r", encoding="utf-8") as f:
+            source = f.read()
+        return source, ast.parse(source)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Préchargement des dépendances (thread)
+    # ──────────────────────────────────────────────────────────────
+    def _prefetch(self, extension: str) -> float:
+        start = time.perf_counter()
+        try:
+            _, tree = self._parse(extension)
+            for module in _external_imports(tree):
+                try:
+                    importlib.import_module(module)
+                except Exception:
+                    pass  # l’erreur réelle remontera au load_extension
+        except (OSError, SyntaxError):
+            pass
+        return (time.perf_counter() - start) * 1000
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Chargement
+    # ──────────────────────────────────────────────────────────────
+    async def _load(self, extension: str, prefetch_ms: float = 0.0):
+        start = time.perf_counter()
+        try:
+            await self.bot.load_extension(extension)
+            status = "loaded"
+        except Exception as e:
+            status = "failed"
+            log.exception("❌ Failed to load %s: %s", extension, e)
+        self.timings[extension] = {
+            "prefetch_ms": prefetch_ms,
+            "setup_ms": (time.perf_counter() - start) * 1000,
+            "status": status,
+        }
+
+    async def load_all(self):
+        """Charge toutes les extensions découvertes (les différées reçoivent des stubs)."""
+        extensions = self.discover()
+        eager = [ext for ext in extensions if ext not in self.lazy]
+
+        prefetch_times = await asyncio.gather(*(asyncio.to_thread(self._prefetch, ext) for ext in eager))
+        await asyncio.gather(*(self._load(ext, ms) for ext, ms in zip(eager, prefetch_times)))
+
+        for ext in extensions:
+            if ext in self.lazy:
+                self._register_stubs(ext)
+        log.info("%s", self.report())
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Extensions différées
+    # ──────────────────────────────────────────────────────────────
+    def _register_stubs(self, extension: str):
+        try:
+            source, tree = self._parse(extension)
+        except (OSError, SyntaxError) as e:
+            log.error("❌ Failed to defer %s: %s", extension, e)
+            return
+        category = _default_category(tree, source)
+
+        names = []
+        for name, aliases, help_text in _prefix_commands(tree):
+            stub = commands.Command(self._stub_callback(extension), name=name, aliases=aliases, help=help_text)
+            stub.category = category
+            try:
+                self.bot.add_command(stub)
+            except commands.CommandRegistrationError as e:
+                log.error("❌ Stub %s (%s) : %s", name, extension, e)
+                continue
+            names.append(name)
+        self._deferred[extension] = names
+        self.timings[extension] = {"prefetch_ms": 0.0, "setup_ms": 0.0, "status": "deferred"}
+        self.bot.extensions_changed(extension)
+
+    def _stub_callback(self, extension: str):
+        async def stub(ctx: commands.Context, *, args: str = ""):
+            await self.ensure_loaded(extension)
+            # On rejoue le message : il tombe cette fois sur la vraie commande
+            new_ctx = await self.bot.get_context(ctx.message)
+            if new_ctx.command is not None and new_ctx.command.callback is not stub:
+                await self.bot.invoke(new_ctx)
+        return stub
+
+    async def ensure_loaded(self, extension: str):
+        """Charge une extension différée (une seule fois, même en cas d’appels simultanés)."""
+        if extension not in self._deferred:
+            return
+        lock = self._locks.setdefault(extension, asyncio.Lock())
+        async with lock:
+            names = self._deferred.pop(extension, None)
+            if names is None:
+                return
+            for name in names:
+                self.bot.remove_command(name)
+            prefetch_ms = await asyncio.to_thread(self._prefetch, extension)
+            await self._load(extension, prefetch_ms)
+            log.info("✅ Loaded deferred %s (%.0f ms)", extension, self.timings[extension]["setup_ms"])
+
+    def is_deferred(self, extension: str) -> bool:
+        return extension in self._deferred
+
+    async def load_deferred(self):
+        """Charge toutes les extensions encore différées (ex : avant une synchro slash)."""
+        for extension in list(self._deferred):
+            await self.ensure_loaded(extension)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Rapport de démarrage
+    # ──────────────────────────────────────────────────────────────
+    def slowest(self, count: int = 3) -> list:
+        ranked = sorted(self.timings.items(), key=lambda kv: kv[1]["prefetch_ms"] + kv[1]["setup_ms"], reverse=True)
+        return ranked[:count]
+
+    def total_ms(self) -> float:
+        return sum(t["prefetch_ms"] + t["setup_ms"] for t in self.timings.values())
+
+    def report(self) -> str:
+        lines = ["⏱️ Chargement des extensions :"]
+        icons = {"loaded": "✅", "failed": "❌", "deferred": "💤"}
+        for ext, t in sorted(self.timings.items()):
+            lines.append(f"  {icons[t['status']]} {ext:<40} préchargement {t['prefetch_ms']:7.1f} ms | chargement {t['setup_ms']:7.1f} ms")
+        lines.append(f"  Total : {self.total_ms():.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,199 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 hot_reload.py — Rechargement à chaud des extensions modifiées
+# Objectif : Recharger uniquement les cogs dont le source a changé (empreinte du
+#            fichier), sans redémarrer le processus ni couper la session gateway ;
+#            en cas d’échec, discord.py restaure l’ancien module (rollback)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import deque
+
+from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Rechargeur
+# ────────────────────────────────────────────────────────────────────────────────
+class HotReloader:
+    """
+    Rechargement à chaud (bot.hot_reload).
+    - snapshot() : empreintes de référence (après le chargement initial)
+    - changed() : extensions dont le fichier a changé, apparu ou disparu (stat d’abord,
+      hachage seulement si la date de modification a bougé)
+    - reload_changed() : reload / load / unload de ces seules extensions ; une extension
+      en échec garde l’ancien module et n’est retentée qu’après une nouvelle modification ;
+      la date de modification n’est mémorisée qu’une fois l’extension traitée (un
+      rechargement ciblé laisse les autres modifications en attente)
+    - start() : surveillance des fichiers toutes les interval s (HOT_RELOAD=1)
+    Les caches dépendants suivent : l’aide via bot.extensions_version, et l’empreinte
+    de l’arbre slash est recalculée (synchro automatique si AUTO_SYNC=1).
+    """
+
+    def __init__(self, bot, interval: float = 2.0):
+        self.bot = bot
+        self.interval = interval
+        self._hashes = {}  # extension → empreinte du source chargé
+        self._mtimes = {}  # extension → date de modification du source traité
+        self._pending = {}  # extension → date de modification d’un changement pas encore appliqué
+        self._failed = {}  # extension → empreinte en échec (pas de nouvelle tentative)
+        self._lock = asyncio.Lock()
+        self._task = None
+        self.history = deque(maxlen=20)  # (horodatage, extension, statut, détail)
+
+    @property
+    def loader(self):
+        return self.bot.extension_loader
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Empreintes
+    # ──────────────────────────────────────────────────────────────
+    def snapshot(self):
+        self._hashes.clear()
+        self._mtimes.clear()
+        self._pending.clear()
+        for ext in self.loader.discover():
+            path = self.loader.source_path(ext)
+            self._mtimes[ext] = os.path.getmtime(path)
+            self._hashes[ext] = _file_hash(path)
+
+    def _current_hash(self, ext: str):
+        path = self.loader.source_path(ext)
+        return _file_hash(path) if os.path.exists(path) else None
+
+    def changed(self) -> dict:
+        """{extension: nouvelle empreinte (None si le fichier a disparu)}."""
+        if not self._hashes:
+            self.snapshot()
+            return {}
+        found = {}
+        current = self.loader.discover()
+        for ext in current:
+            path = self.loader.source_path(ext)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if self._mtimes.get(ext) == mtime:
+                continue
+            digest = _file_hash(path)
+            if digest != self._hashes.get(ext) and digest != self._failed.get(ext):
+                found[ext] = digest
+                self._pending[ext] = mtime  # mémorisée par _apply, une fois rechargée
+            else:
+                self._mtimes[ext] = mtime  # simple « touch » ou échec déjà signalé
+        for ext in set(self._hashes) - set(current):
+            found[ext] = None
+        return found
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Rechargement
+    # ──────────────────────────────────────────────────────────────
+    async def reload_changed(self, only: list = None) -> list:
+        """
+        Recharge les extensions modifiées, ou exactement celles de only (même inchangées).
+        Renvoie [(extension, statut, détail)] ; statut : reloaded, loaded, unloaded,
+        deferred, rollback (ancienne version conservée) ou unknown (extension inconnue).
+        """
+        async with self._lock:
+            changes = self.changed()
+            results = []
+            if only is not None:
+                known = set(self.loader.discover()) | set(self._hashes) | set(self.bot.extensions)
+                results = [(ext, "unknown", "extension introuvable") for ext in only if ext not in known]
+                changes = {ext: changes[ext] if ext in changes else self._current_hash(ext)
+                           for ext in only if ext in known}
+            results += [await self._apply(ext, digest) for ext, digest in sorted(changes.items())]
+            if any(status in ("reloaded", "loaded", "unloaded") for _, status, _ in results):
+                await self._refresh_tree()
+            for ext, status, detail in results:
+                self.history.append((time.time(), ext, status, detail))
+                log.info("♻️ %s : %s%s", ext, status, f" ({detail})" if detail else "")
+            return results
+
+    async def _apply(self, ext: str, digest: str):
+        start = time.perf_counter()
+        try:
+            if digest is None:
+                if ext in self.bot.extensions:
+                    await self.bot.unload_extension(ext)
+                self._hashes.pop(ext, None)
+                self._mtimes.pop(ext, None)
+                self._pending.pop(ext, None)
+                return ext, "unloaded", ""
+            if self.loader.is_deferred(ext):
+                # Pas encore chargée : la version à jour sera importée au premier usage
+                self._hashes[ext] = digest
+                self._mark_seen(ext)
+                return ext, "deferred", ""
+            if ext in self.bot.extensions:
+                await self.bot.reload_extension(ext)  # rollback automatique si setup() échoue
+                status = "reloaded"
+            else:
+                await self.bot.load_extension(ext)
+                status = "loaded"
+        except (commands.ExtensionError, SyntaxError) as e:
+            self._failed[ext] = digest
+            self._mark_seen(ext)
+            cause = e.__cause__ or e
+            return ext, "rollback", f"{type(cause).__name__}: {cause}"
+
+        self._hashes[ext] = digest
+        self._failed.pop(ext, None)
+        self._mark_seen(ext)
+        self.loader.timings[ext] = {"prefetch_ms": 0.0, "setup_ms": (time.perf_counter() - start) * 1000, "status": "loaded"}
+        return ext, status, f"{(time.perf_counter() - start) * 1000:.0f} ms"
+
+    def _mark_seen(self, ext: str):
+        mtime = self._pending.pop(ext, None)
+        if mtime is None:
+            try:
+                mtime = os.path.getmtime(self.loader.source_path(ext))
+            except OSError:
+                return
+        self._mtimes[ext] = mtime
+
+    async def _refresh_tree(self):
+        syncer = getattr(self.bot, "slash_sync", None)
+        if syncer is None or self.bot.application_id is None:
+            return
+        if os.getenv("AUTO_SYNC", "").lower() in ("1", "true", "yes"):
+            result = await syncer.sync()
+            log.info("🔄 Synchro slash après rechargement : %s", syncer.describe(result))
+            return
+        previous = syncer.state.get(syncer.scope_key(None), {})
+        if previous.get("hash") != syncer.snapshot()["hash"]:
+            log.warning("⚠️ Les commandes slash ont changé : lance /sync pour les publier.")
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Surveillance des fichiers
+    # ──────────────────────────────────────────────────────────────
+    def start(self):
+        if self._task is None and os.getenv("HOT_RELOAD", "").lower() in ("1", "true", "yes"):
+            if not self._hashes:
+                self.snapshot()
+            self._task = asyncio.create_task(self._watch())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reload_changed()
+            except Exception as e:
+                log.exception("Rechargement impossible : %s", e)
@@ -0,0 +1,183 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 memory_profile.py — Profil mémoire du bot (caches discord.py)
+# Objectif : Borner la mémoire quand le nombre de serveurs et de membres grandit :
+#            cache des membres, chunking à la demande, cache de messages borné et
+#            récupération des membres absents via un petit LRU
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+
+import discord
+
+log = logging.getLogger(__name__)
+
+# full : comportement par défaut de discord.py ; balanced : serveurs chargés à leur
+# première commande ; lean : aucun membre gardé hors LRU (grands nombres de membres)
+PROFILES = {
+    "full": {"member_cache": "all", "chunking": "startup", "max_messages": 1000},
+    "balanced": {"member_cache": "joined", "chunking": "lazy", "max_messages": 300},
+    "lean": {"member_cache": "none", "chunking": "never", "max_messages": 100},
+}
+_MISSING = object()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Configuration
+# ────────────────────────────────────────────────────────────────────────────────
+def load_profile() -> dict:
+    """
+    Profil choisi par MEMORY_PROFILE (full par défaut), chaque réglage pouvant être
+    surchargé : MEMBER_CACHE (all | joined | none), CHUNK_GUILDS (startup | lazy |
+    never), MESSAGE_CACHE (nombre de messages, 0 = désactivé).
+    """
+    name = os.getenv("MEMORY_PROFILE", "full").lower()
+    profile = dict(PROFILES.get(name, PROFILES["full"]), name=name if name in PROFILES else "full")
+    profile["member_cache"] = os.getenv("MEMBER_CACHE", profile["member_cache"]).lower()
+    profile["chunking"] = os.getenv("CHUNK_GUILDS", profile["chunking"]).lower()
+    if os.getenv("MESSAGE_CACHE"):
+        profile["max_messages"] = int(os.getenv("MESSAGE_CACHE"))
+    return profile
+
+def bot_options(profile: dict, intents: discord.Intents) -> dict:
+    """Arguments à passer à commands.Bot(...) pour appliquer le profil."""
+    mode = profile["member_cache"]
+    if mode == "all":
+        flags = discord.MemberCacheFlags.from_intents(intents)
+    else:
+        flags = discord.MemberCacheFlags.none()
+        flags.joined = mode == "joined"  # seulement les membres arrivés pendant que le bot tourne
+    return {
+        "member_cache_flags": flags,
+        "chunk_guilds_at_startup": profile["chunking"] == "startup" and intents.members,
+        "max_messages": profile["max_messages"] or None,
+    }
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Gestionnaire mémoire
+# ────────────────────────────────────────────────────────────────────────────────
+class MemoryProfile:
+    """
+    État mémoire du bot (bot.memory).
+    - get_member(guild, user_id) : cache discord.py, sinon LRU, sinon fetch_member (REST)
+    - ensure_chunked(guild) : charge les membres d’un serveur une seule fois, à la demande
+      (mode lazy : automatiquement à la première commande utilisée dans le serveur)
+    - rss_per_10k(rss_mb, membres) : RAM rapportée à 10 000 membres (affichée dans botinfo)
+    """
+
+    def __init__(self, bot, profile: dict, lru_size: int = 1024, lru_ttl: float = 300.0):
+        self.bot = bot
+        self.profile = profile
+        self.lru_size = lru_size
+        self.lru_ttl = lru_ttl
+        self._members = OrderedDict()  # (guild_id, user_id) → (expire_at, Member ou None)
+        self._fetching = {}            # (guild_id, user_id) → Future partagé
+        self._chunking = {}            # guild_id → Task
+        self.metrics = {"hits": 0, "misses": 0, "fetches": 0, "chunked": 0}
+
+        for listener in (self.on_member_update, self.on_member_remove, self.on_guild_remove):
+            bot.add_listener(listener)
+        if profile["chunking"] == "lazy":
+            bot.add_listener(self.on_command)
+            bot.add_listener(self.on_interaction)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Membres à la demande
+    # ──────────────────────────────────────────────────────────────
+    async def get_member(self, guild: discord.Guild, user_id: int):
+        """Membre du serveur (ou None s’il n’en fait pas partie)."""
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+
+        key = (guild.id, user_id)
+        entry = self._members.get(key, _MISSING)
+        if entry is not _MISSING and entry[0] > time.monotonic():
+            self._members.move_to_end(key)
+            self.metrics["hits"] += 1
+            return entry[1]
+        self.metrics["misses"] += 1
+
+        future = self._fetching.get(key)
+        if future is None:
+            future = self._fetching[key] = asyncio.ensure_future(self._fetch(guild, user_id))
+            future.add_done_callback(lambda _: self._fetching.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _fetch(self, guild: discord.Guild, user_id: int):
+        self.metrics["fetches"] += 1
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            member = None  # mémorisé aussi : évite de redemander un absent
+        self._remember(guild.id, user_id, member)
+        return member
+
+    def _remember(self, guild_id: int, user_id: int, member):
+        key = (guild_id, user_id)
+        self._members[key] = (time.monotonic() + self.lru_ttl, member)
+        self._members.move_to_end(key)
+        while len(self._members) > self.lru_size:
+            self._members.popitem(last=False)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Chunking à la demande
+    # ──────────────────────────────────────────────────────────────
+    async def ensure_chunked(self, guild: discord.Guild):
+        """Charge tous les membres du serveur (une seule requête gateway, partagée)."""
+        if guild.chunked or not self.bot.intents.members:
+            return
+        task = self._chunking.get(guild.id)
+        if task is None:
+            task = self._chunking[guild.id] = asyncio.create_task(self._chunk(guild))
+        await asyncio.shield(task)
+
+    async def _chunk(self, guild: discord.Guild):
+        try:
+            await guild.chunk(cache=True)
+            self.metrics["chunked"] += 1
+        except Exception as e:
+            log.warning("Chunk impossible : %s", e, extra={"guild": guild.id})
+        finally:
+            self._chunking.pop(guild.id, None)
+
+    def _schedule_chunk(self, guild):
+        if guild is not None and not guild.chunked and guild.id not in self._chunking:
+            self._chunking[guild.id] = asyncio.create_task(self._chunk(guild))
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Mesures
+    # ──────────────────────────────────────────────────────────────
+    def cached_members(self) -> int:
+        """Membres réellement gardés en mémoire (cache discord.py + LRU)."""
+        return sum(len(g._members) for g in self.bot.guilds) + len(self._members)
+
+    @staticmethod
+    def rss_per_10k(rss_mb: float, members: int) -> float:
+        return rss_mb * 10_000 / members if members else 0.0
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Événements
+    # ──────────────────────────────────────────────────────────────
+    async def on_member_update(self, before, after):
+        key = (after.guild.id, after.id)
+        if key in self._members:
+            self._remember(after.guild.id, after.id, after)
+
+    async def on_member_remove(self, member):
+        self._members.pop((member.guild.id, member.id), None)
+
+    async def on_guild_remove(self, guild):
+        for key in [k for k in self._members if k[0] == guild.id]:
+            del self._members[key]
+
+    async def on_command(self, ctx):
+        self._schedule_chunk(ctx.guild)
+
+    async def on_interaction(self, interaction):
+        self._schedule_chunk(interaction.guild)
@@ -0,0 +1,123 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 metrics_sampler.py — Échantillonnage des métriques du bot en arrière-plan
+# Objectif : Mesurer CPU, mémoire, latence, serveurs, membres et événements sans
+#            jamais bloquer la boucle (botinfo lit simplement les derniers points)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import time
+from collections import deque
+
+import psutil
+
+WINDOWS = {"1m": 60, "5m": 300, "15m": 900}
+FIELDS = ("cpu", "rss_mb", "latency_ms", "events_per_s")
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Échantillonneur
+# ────────────────────────────────────────────────────────────────────────────────
+class MetricsSampler:
+    """
+    Tâche de fond (bot.metrics) qui enregistre toutes les interval secondes un point
+    dans un buffer circulaire couvrant 15 minutes.
+    Le nombre de membres est tenu à jour par les événements join/leave (pas de somme
+    sur tous les serveurs à chaque /botinfo).
+    """
+
+    def __init__(self, bot, interval: float = 5.0):
+        self.bot = bot
+        self.interval = interval
+        self.samples = deque(maxlen=int(max(WINDOWS.values()) / interval) + 1)
+        self.member_count = 0
+        self._events = 0
+        self._last_tick = time.monotonic()
+        self._process = psutil.Process()
+        self._task = None
+
+        for listener in (self.on_ready, self.on_member_join, self.on_member_remove,
+                         self.on_guild_join, self.on_guild_remove, self.on_socket_event_type):
+            bot.add_listener(listener)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Boucle d’échantillonnage
+    # ──────────────────────────────────────────────────────────────
+    def start(self):
+        if self._task is None:
+            self._process.cpu_percent(None)  # amorce : la première mesure vaut toujours 0
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.sample()
+
+    def sample(self) -> dict:
+        now = time.monotonic()
+        elapsed = max(now - self._last_tick, 1e-6)
+        latency = self.bot.latency
+        memory = getattr(self.bot, "memory", None)
+        point = {
+            "ts": now,
+            "cpu": self._process.cpu_percent(None),  # non bloquant : depuis le dernier appel
+            "rss_mb": self._process.memory_info().rss / 1024 / 1024,
+            "latency_ms": latency * 1000 if latency == latency and latency != float("inf") else 0.0,
+            "guilds": len(self.bot.guilds),
+            "members": self.member_count,
+            "cached_members": memory.cached_members() if memory else self.member_count,
+            "events_per_s": self._events / elapsed,
+        }
+        self._events = 0
+        self._last_tick = now
+        self.samples.append(point)
+        return point
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Lecture
+    # ──────────────────────────────────────────────────────────────
+    def latest(self) -> dict:
+        """Dernier point (ou une mesure immédiate non bloquante si aucun n’existe encore)."""
+        return self.samples[-1] if self.samples else self.sample()
+
+    def window(self, seconds: float) -> dict:
+        """{champ: (min, moy, max)} sur les seconds dernières secondes."""
+        if not self.samples:
+            return {}
+        since = self.samples[-1]["ts"] - seconds
+        points = [p for p in reversed(self.samples) if p["ts"] >= since]
+        stats = {}
+        for field in FIELDS:
+            values = [p[field] for p in points]
+            stats[field] = (min(values), sum(values) / len(values), max(values))
+        return stats
+
+    def summary(self) -> dict:
+        return {label: self.window(seconds) for label, seconds in WINDOWS.items()}
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Événements
+    # ──────────────────────────────────────────────────────────────
+    async def on_ready(self):
+        self.member_count = sum(g.member_count or 0 for g in self.bot.guilds)
+
+    async def on_member_join(self, member):
+        self.member_count += 1
+
+    async def on_member_remove(self, member):
+        self.member_count -= 1
+
+    async def on_guild_join(self, guild):
+        self.member_count += guild.member_count or 0
+
+    async def on_guild_remove(self, guild):
+        self.member_count -= guild.member_count or 0
+
+    async def on_socket_event_type(self, event_type):
+        self._events += 1
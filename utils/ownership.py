@@ -0,0 +1,264 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 ownership.py — Répartition des serveurs entre plusieurs instances du bot
+# Objectif : Quand plusieurs instances tournent (capacité ou secours), chacune ne
+#            traite que les serveurs des partitions dont elle détient le bail ;
+#            les baux expirent sans heartbeat et sont redistribués automatiquement
+# Stockage : Supabase (production) ou SQLite local (tests, une seule machine)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+
+log = logging.getLogger(__name__)
+
+INSTANCES_TABLE = "bot_instances"  # instance_id (text, PK), expires_at (float8, epoch)
+LEASES_TABLE = "bot_leases"        # partition (int, PK), owner (text), expires_at (float8, epoch)
+
+def partition_of(guild_id: int, partitions: int) -> int:
+    """Partition d’un serveur : même formule que le sharding Discord (MP → partition 0)."""
+    return (guild_id >> 22) % partitions if guild_id else 0
+
+def _score(instance_id: str, partition: int) -> bytes:
+    return hashlib.blake2b(f"{instance_id}:{partition}".encode(), digest_size=8).digest()
+
+def assign(partition: int, instances: list) -> str:
+    """Hachage de rendez-vous : propriétaire stable, peu de mouvements quand une instance arrive ou part."""
+    return max(instances, key=lambda iid: _score(iid, partition))
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗄️ Stockage Supabase (production)
+# ────────────────────────────────────────────────────────────────────────────────
+class SupabaseLeaseStore:
+    """Baux dans Supabase ; chaque opération groupée = un seul aller-retour via bot.db."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def setup(self, partitions: int):
+        rows = [{"partition": p, "owner": None, "expires_at": 0} for p in range(partitions)]
+        await self.db.run(lambda: self.db.client.table(LEASES_TABLE)
+                          .upsert(rows, on_conflict="partition", ignore_duplicates=True).execute())
+
+    async def heartbeat(self, instance_id: str, ttl: float):
+        await self.db.upsert(INSTANCES_TABLE, {"instance_id": instance_id, "expires_at": time.time() + ttl},
+                             on_conflict="instance_id")
+
+    async def live_instances(self) -> list:
+        now = time.time()
+        rows = await self.db.run(lambda: self.db.client.table(INSTANCES_TABLE)
+                                 .select("instance_id").gt("expires_at", now).execute().data)
+        return [r["instance_id"] for r in rows]
+
+    async def acquire(self, partitions: list, instance_id: str, ttl: float) -> set:
+        """Prend ou renouvelle les baux libres, expirés ou déjà à nous ; renvoie ceux obtenus."""
+        now = time.time()
+
+        def query():
+            return (self.db.client.table(LEASES_TABLE)
+                    .update({"owner": instance_id, "expires_at": now + ttl})
+                    .in_("partition", partitions)
+                    .or_(f"owner.eq.{instance_id},owner.is.null,expires_at.lt.{now}")
+                    .execute().data)
+        return {r["partition"] for r in await self.db.run(query, retries=0)}
+
+    async def release(self, partitions: list, instance_id: str):
+        await self.db.run(lambda: self.db.client.table(LEASES_TABLE)
+                          .update({"owner": None, "expires_at": 0})
+                          .in_("partition", partitions).eq("owner", instance_id).execute())
+
+    async def leave(self, instance_id: str):
+        await self.db.delete(INSTANCES_TABLE, {"instance_id": instance_id})
+
+    def close(self):
+        pass
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗄️ Stockage SQLite (tests / plusieurs processus sur une machine)
+# ────────────────────────────────────────────────────────────────────────────────
+class SQLiteLeaseStore:
+    """Même protocole que SupabaseLeaseStore, dans un fichier SQLite partagé."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._lock = asyncio.Lock()
+
+    def _execute(self, sql: str, params=()) -> list:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn.execute(sql, params).fetchall()
+
+    async def _run(self, sql: str, params=()) -> list:
+        async with self._lock:  # une seule connexion, utilisée par un thread à la fois
+            return await asyncio.to_thread(self._execute, sql, params)
+
+    async def setup(self, partitions: int):
+        await self._run(f"CREATE TABLE IF NOT EXISTS {INSTANCES_TABLE} (instance_id TEXT PRIMARY KEY, expires_at REAL)")
+        await self._run(f"CREATE TABLE IF NOT EXISTS {LEASES_TABLE} (partition INTEGER PRIMARY KEY, owner TEXT, expires_at REAL)")
+        values = ",".join(f"({p}, NULL, 0)" for p in range(partitions))
+        await self._run(f"INSERT OR IGNORE INTO {LEASES_TABLE} VALUES {values}")
+
+    async def heartbeat(self, instance_id: str, ttl: float):
+        await self._run(f"INSERT OR REPLACE INTO {INSTANCES_TABLE} VALUES (?, ?)", (instance_id, time.time() + ttl))
+
+    async def live_instances(self) -> list:
+        rows = await self._run(f"SELECT instance_id FROM {INSTANCES_TABLE} WHERE expires_at > ?", (time.time(),))
+        return [r[0] for r in rows]
+
+    async def acquire(self, partitions: list, instance_id: str, ttl: float) -> set:
+        now = time.time()
+        marks = ",".join("?" * len(partitions))
+        rows = await self._run(
+            f"UPDATE {LEASES_TABLE} SET owner = ?, expires_at = ? "
+            f"WHERE partition IN ({marks}) AND (owner = ? OR owner IS NULL OR expires_at < ?) RETURNING partition",
+            (instance_id, now + ttl, *partitions, instance_id, now),
+        )
+        return {r[0] for r in rows}
+
+    async def release(self, partitions: list, instance_id: str):
+        marks = ",".join("?" * len(partitions))
+        await self._run(f"UPDATE {LEASES_TABLE} SET owner = NULL, expires_at = 0 "
+                        f"WHERE partition IN ({marks}) AND owner = ?", (*partitions, instance_id))
+
+    async def leave(self, instance_id: str):
+        await self._run(f"DELETE FROM {INSTANCES_TABLE} WHERE instance_id = ?", (instance_id,))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Coordinateur
+# ────────────────────────────────────────────────────────────────────────────────
+class Ownership:
+    """
+    Propriété des serveurs par partition (bot.ownership).
+    - toutes les interval s : heartbeat, liste des instances vivantes, rendez-vous
+      pour savoir quelles partitions nous reviennent, libération de celles qui ne
+      nous reviennent plus, prise / renouvellement des autres (une requête groupée)
+    - owns(guild) : test en mémoire (ensemble + date d’expiration locale), appelé avant
+      tout traitement d’un message ou d’une interaction
+    - is_leader : détenteur de la partition 0 (tâches globales à n’exécuter qu’une fois)
+    Sans stockage (OWNERSHIP=off, défaut), l’instance possède tout.
+    Si le stockage devient injoignable, les baux ne sont plus honorés localement après
+    leur expiration : mieux vaut ne plus répondre que répondre en double.
+    """
+
+    def __init__(self, instance_id: str, store=None, partitions: int = 16,
+                 ttl: float = 30.0, interval: float = 10.0):
+        self.instance_id = instance_id
+        self.store = store
+        self.partitions = partitions
+        self.ttl = ttl
+        self.interval = interval
+        self._owned = {}  # partition → échéance locale (monotonic)
+        self._task = None
+        self.instances = [instance_id]
+        self.metrics = {"skipped": 0, "acquired": 0, "released": 0, "errors": 0}
+
+    @classmethod
+    def from_env(cls, instance_id: str, db) -> "Ownership":
+        """OWNERSHIP=off|sqlite|supabase, OWNERSHIP_PARTITIONS, OWNERSHIP_SQLITE (chemin du fichier)."""
+        mode = os.getenv("OWNERSHIP", "off").lower()
+        if mode == "supabase" and db.enabled:
+            store = SupabaseLeaseStore(db)
+        elif mode == "sqlite":
+            store = SQLiteLeaseStore(os.getenv("OWNERSHIP_SQLITE", "ownership.sqlite3"))
+        else:
+            store = None
+        return cls(instance_id, store, partitions=int(os.getenv("OWNERSHIP_PARTITIONS", "16")))
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Test de propriété (chemin chaud)
+    # ──────────────────────────────────────────────────────────────
+    def owns(self, guild) -> bool:
+        if self.store is None:
+            return True
+        partition = partition_of(guild.id if guild else 0, self.partitions)
+        deadline = self._owned.get(partition)
+        if deadline is not None and deadline > time.monotonic():
+            return True
+        self.metrics["skipped"] += 1
+        return False
+
+    @property
+    def is_leader(self) -> bool:
+        if self.store is None:
+            return True
+        return self._owned.get(0, 0.0) > time.monotonic()
+
+    def owned_partitions(self) -> list:
+        now = time.monotonic()
+        return sorted(p for p, deadline in self._owned.items() if deadline > now)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Boucle de bail
+    # ──────────────────────────────────────────────────────────────
+    async def start(self):
+        if self.store is None or self._task is not None:
+            return
+        await self.store.setup(self.partitions)
+        await self.tick()  # partitions prises avant le premier événement
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.store is not None:
+            try:
+                # Départ propre : les autres instances reprennent sans attendre l’expiration
+                await self.store.release(list(self._owned), self.instance_id)
+                await self.store.leave(self.instance_id)
+            except Exception as e:
+                log.warning("Libération des partitions impossible : %s", e)
+            self._owned.clear()
+            self.store.close()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except Exception as e:
+                self.metrics["errors"] += 1
+                log.warning("Heartbeat impossible : %s", e)
+
+    async def tick(self):
+        started = time.monotonic()
+        await self.store.heartbeat(self.instance_id, self.ttl)
+        live = await self.store.live_instances()
+        if self.instance_id not in live:
+            live.append(self.instance_id)
+        self.instances = sorted(live)
+
+        wanted = [p for p in range(self.partitions) if assign(p, self.instances) == self.instance_id]
+        surplus = [p for p in self._owned if p not in wanted]
+        if surplus:
+            await self.store.release(surplus, self.instance_id)
+            for p in surplus:
+                del self._owned[p]
+            self.metrics["released"] += len(surplus)
+
+        acquired = await self.store.acquire(wanted, self.instance_id, self.ttl) if wanted else set()
+        deadline = started + self.ttl  # compté depuis avant l’appel : jamais plus long que le bail réel
+        newly = acquired - set(self._owned)
+        self.metrics["acquired"] += len(newly)
+        for p in list(self._owned):
+            if p not in acquired:
+                del self._owned[p]  # pris par une autre instance entre-temps
+        for p in acquired:
+            self._owned[p] = deadline
@@ -0,0 +1,103 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 persistent_views.py — Composants persistants sans état en mémoire
+# Objectif : Encoder l’état d’un bouton / menu (page, catégorie, propriétaire…) dans
+#            son custom_id : un seul gestionnaire enregistré (discord.ui.DynamicItem)
+#            traite tous les messages, sans objet View par message ni minuteur, et
+#            les composants restent utilisables après un redémarrage
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import hashlib
+import math
+from urllib.parse import quote, unquote
+
+import discord
+from discord.ui import View
+
+from utils.discord_utils import safe_respond
+
+CUSTOM_ID_MAX = 100  # limite Discord
+PAGE_SIZE = 23       # 25 options max, moins « page précédente » et « page suivante »
+PAGE_VALUE = "__page:"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔑 Encodage de l’état
+# ────────────────────────────────────────────────────────────────────────────────
+def state_id(namespace: str, *fields) -> str:
+    """
+    custom_id "namespace:champ1:champ2…" ; chaque champ est encodé (quote) pour que
+    « : » n’y apparaisse jamais. Le template du DynamicItem découpe ensuite sur « : ».
+    """
+    custom_id = ":".join([namespace, *(quote(str(f), safe="") for f in fields)])
+    if len(custom_id) > CUSTOM_ID_MAX:
+        raise ValueError(f"custom_id trop long ({len(custom_id)} > {CUSTOM_ID_MAX}) : {custom_id[:40]}…")
+    return custom_id
+
+def key_id(key) -> str:
+    """
+    Identifiant court et stable (12 caractères) d’une clé de données, à placer dans un
+    custom_id ou une valeur d’option (100 caractères max) à la place de la clé elle-même.
+    """
+    return hashlib.blake2b(str(key).encode("utf-8"), digest_size=6).hexdigest()
+
+def state_fields(match) -> dict:
+    """Champs nommés du template, décodés."""
+    return {name: unquote(value) for name, value in match.groupdict().items() if value is not None}
+
+def persistent_view(*items) -> View:
+    """View sans timeout, à n’utiliser qu’avec des DynamicItem : rien n’est conservé après l’envoi."""
+    view = View(timeout=None)
+    for item in items:
+        view.add_item(item)
+    return view
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📑 Menus paginés (au-delà de 25 options)
+# ────────────────────────────────────────────────────────────────────────────────
+def paged_options(keys, page: int = 0, per_page: int = PAGE_SIZE, value=None):
+    """
+    Options d’une page d’un menu : seule la tranche affichée est construite, plus deux
+    options de navigation (valeur PAGE_VALUE + n° de page). keys : séquence indexable
+    (tuple précalculé par DataView.index, par exemple). value : clé → valeur de l’option
+    (key_id si les clés peuvent dépasser 100 caractères ; défaut : la clé elle-même).
+    Renvoie (options, page, total).
+    """
+    total = max(1, math.ceil(len(keys) / per_page))
+    page = max(0, min(page, total - 1))
+    options = []
+    if page > 0:
+        options.append(discord.SelectOption(label=f"⬅️ Page précédente ({page}/{total})", value=f"{PAGE_VALUE}{page - 1}"))
+    for key in keys[page * per_page:(page + 1) * per_page]:
+        options.append(discord.SelectOption(label=str(key)[:100], value=value(key) if value else str(key)[:100]))
+    if page < total - 1:
+        options.append(discord.SelectOption(label=f"➡️ Page suivante ({page + 2}/{total})", value=f"{PAGE_VALUE}{page + 1}"))
+    return options, page, total
+
+def page_target(value: str):
+    """N° de page si l’option choisie est une option de navigation, sinon None."""
+    return int(value[len(PAGE_VALUE):]) if value.startswith(PAGE_VALUE) else None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🛡️ Vérifications communes
+# ────────────────────────────────────────────────────────────────────────────────
+class StatefulItem:
+    """
+    Mixin pour les DynamicItem de ce module (à placer avant DynamicItem[...]).
+    - owner_id : seul utilisateur autorisé (None = tout le monde)
+    - les clics d’un serveur appartenant à une autre instance sont ignorés en silence
+      (cf. utils/ownership.py) : chaque instance enregistre le même gestionnaire
+    """
+
+    owner_id = None
+    denied_message = "❌ Tu n'es pas autorisé à utiliser ces boutons."
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        ownership = getattr(interaction.client, "ownership", None)
+        if ownership is not None and not ownership.owns(interaction.guild):
+            return False
+        if self.owner_id is not None and interaction.user.id != self.owner_id:
+            await safe_respond(interaction, self.denied_message, ephemeral=True)
+            return False
+        return True
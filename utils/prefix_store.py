@@ -0,0 +1,179 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 prefix_store.py — Préfixes de commande par serveur
+# Objectif : Plusieurs préfixes par serveur stockés dans Supabase (via bot.cache), servis
+#            depuis un cache mémoire invalidé à chaque modification, et filtre rapide des
+#            messages qui ne peuvent pas être des commandes (avant tout parsing)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+TABLE = "guild_prefixes"  # colonnes : guild_id (bigint, PK), prefixes (text[], ordre d’affichage)
+MAX_PREFIXES = 5
+MAX_PREFIX_LENGTH = 10
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🗂️ Entrée de cache d’un serveur
+# ────────────────────────────────────────────────────────────────────────────────
+class _GuildPrefixes:
+    __slots__ = ("prefixes", "match", "starters", "expire_at")
+
+    def __init__(self, prefixes: tuple, mentions: tuple, expire_at: float):
+        self.prefixes = prefixes  # ordre choisi par les admins (affichage)
+        # Plus long d’abord : « !! » doit être essayé avant « ! »
+        self.match = tuple(sorted(prefixes, key=len, reverse=True))
+        self.starters = self.match + mentions  # pour str.startswith(tuple) en un appel
+        self.expire_at = expire_at
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Stockage des préfixes
+# ────────────────────────────────────────────────────────────────────────────────
+class PrefixStore:
+    """
+    Préfixes par serveur (bot.prefixes).
+    - get(guild_id) : préfixes du serveur (cache, sinon bot.cache / Supabase, sinon défaut)
+    - could_be_command(message) : False si le message ne commence par aucun préfixe
+      ni mention du bot (le message est alors ignoré sans parsing)
+    - set / add / remove / reset : une seule écriture immédiate via bot.cache (une ligne
+      par serveur : upsert, ou delete pour reset) ; les caches ne sont mis à jour qu’après
+      son succès, puis l’événement « prefix_update » (guild_id, préfixes) est émis
+    Le TTL ne sert qu’à rattraper les changements faits par une autre instance.
+    """
+
+    def __init__(self, bot, default: tuple, ttl: float = 600.0):
+        self.bot = bot
+        self.default = tuple(default)
+        self.ttl = ttl
+        self._guilds = {}  # guild_id → _GuildPrefixes
+        self._loading = {}  # guild_id → Future (un seul aller-retour par serveur)
+        self._mentions = ()
+        self.metrics = {"hits": 0, "misses": 0, "rejected": 0}
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Cache
+    # ──────────────────────────────────────────────────────────────
+    def _mention_strings(self) -> tuple:
+        if not self._mentions and self.bot.user is not None:
+            self._mentions = (f"<@{self.bot.user.id}>", f"<@!{self.bot.user.id}>")
+        return self._mentions
+
+    def _store(self, guild_id: int, prefixes: tuple, ttl: float = None) -> _GuildPrefixes:
+        ttl = self.ttl if ttl is None else ttl
+        entry = _GuildPrefixes(prefixes or self.default, self._mention_strings(), time.monotonic() + ttl)
+        self._guilds[guild_id] = entry
+        return entry
+
+    def invalidate(self, guild_id: int = None):
+        """Oublie les préfixes d’un serveur (ou de tous), bot.cache compris : prochaine lecture dans Supabase."""
+        if guild_id is None:
+            self._guilds.clear()
+            self.bot.cache.invalidate(TABLE)
+        else:
+            self._guilds.pop(guild_id, None)
+            self.bot.cache.invalidate(TABLE, guild_id)
+
+    async def _entry(self, guild_id: int) -> _GuildPrefixes:
+        entry = self._guilds.get(guild_id)
+        if entry is not None and entry.expire_at > time.monotonic():
+            self.metrics["hits"] += 1
+            return entry
+        self.metrics["misses"] += 1
+
+        future = self._loading.get(guild_id)
+        if future is None:
+            future = self._loading[guild_id] = asyncio.ensure_future(self._load(guild_id))
+            future.add_done_callback(lambda _: self._loading.pop(guild_id, None))
+        return await asyncio.shield(future)
+
+    async def _load(self, guild_id: int) -> _GuildPrefixes:
+        try:
+            row = await self.bot.cache.get(TABLE, guild_id, key_column="guild_id")
+        except Exception as e:
+            log.warning("Lecture des préfixes impossible : %s", e, extra={"guild": guild_id})
+            return self._store(guild_id, (), ttl=30.0)  # on réessaiera bientôt
+        return self._store(guild_id, tuple(row["prefixes"] or ()) if row else ())
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Lecture
+    # ──────────────────────────────────────────────────────────────
+    async def get(self, guild_id: int = None) -> tuple:
+        """Préfixes du serveur dans l’ordre choisi (défaut en MP)."""
+        if guild_id is None:
+            return self.default
+        return (await self._entry(guild_id)).prefixes
+
+    async def primary(self, guild) -> str:
+        """Premier préfixe du serveur, pour l’affichage dans l’aide."""
+        return (await self.get(guild.id if guild else None))[0]
+
+    async def for_message(self, message) -> tuple:
+        """Préfixes à essayer sur ce message (plus longs d’abord) : utilisé par get_prefix."""
+        if message.guild is None:
+            return self.default
+        return (await self._entry(message.guild.id)).match
+
+    async def could_be_command(self, message) -> bool:
+        """Filtre rapide : le message commence-t-il par un préfixe ou une mention du bot ?"""
+        if message.guild is None:
+            starters = self.default + self._mention_strings()
+        else:
+            starters = (await self._entry(message.guild.id)).starters
+        # lstrip : la réponse à une simple mention tolère les espaces en tête (comparaison sur strip())
+        if message.content.lstrip().startswith(starters):
+            return True
+        self.metrics["rejected"] += 1
+        return False
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Modification
+    # ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def validate(prefixes) -> tuple:
+        """Nettoie la liste (doublons, espaces) et lève ValueError si elle est invalide."""
+        cleaned = tuple(dict.fromkeys(p.strip() for p in prefixes if p and p.strip()))
+        if not cleaned:
+            raise ValueError("Il faut au moins un préfixe.")
+        if len(cleaned) > MAX_PREFIXES:
+            raise ValueError(f"{MAX_PREFIXES} préfixes maximum par serveur.")
+        too_long = [p for p in cleaned if len(p) > MAX_PREFIX_LENGTH]
+        if too_long:
+            raise ValueError(f"Préfixe trop long (max {MAX_PREFIX_LENGTH} caractères) : `{too_long[0]}`")
+        return cleaned
+
+    async def _write(self, guild_id: int, prefixes: tuple) -> tuple:
+        """Écriture atomique (une requête) ; en cas d’échec l’exception remonte et le cache reste intact."""
+        if prefixes:
+            await self.bot.cache.write(TABLE, {"guild_id": guild_id, "prefixes": list(prefixes)}, key_column="guild_id")
+        else:
+            await self.bot.cache.delete(TABLE, guild_id, key_column="guild_id")
+        entry = self._store(guild_id, prefixes)
+        self.bot.dispatch("prefix_update", guild_id, entry.prefixes)
+        return entry.prefixes
+
+    async def set(self, guild_id: int, prefixes) -> tuple:
+        """Remplace les préfixes du serveur (au moins un ; les préfixes par défaut = reset)."""
+        prefixes = self.validate(prefixes)
+        return await self._write(guild_id, () if prefixes == self.default else prefixes)
+
+    async def add(self, guild_id: int, prefix: str) -> tuple:
+        current = await self.get(guild_id)
+        return await self.set(guild_id, current + (prefix,))
+
+    async def remove(self, guild_id: int, prefix: str) -> tuple:
+        current = await self.get(guild_id)
+        if prefix not in current:
+            raise ValueError(f"`{prefix}` n’est pas un préfixe de ce serveur.")
+        remaining = tuple(p for p in current if p != prefix)
+        if not remaining:
+            raise ValueError("Impossible de retirer le dernier préfixe : utilise `reset` pour revenir au préfixe par défaut.")
+        return await self.set(guild_id, remaining)
+
+    async def reset(self, guild_id: int) -> tuple:
+        """Retour explicite aux préfixes par défaut."""
+        return await self._write(guild_id, ())
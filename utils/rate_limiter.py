@@ -0,0 +1,193 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 rate_limiter.py — Ordonnanceur des appels sortants vers l’API Discord
+# Objectif : Suivre l’état des buckets (par route) à partir des en-têtes X-RateLimit-*
+#            et n’attendre que lorsqu’un bucket est réellement vide
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import re
+import time
+
+import aiohttp
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔧 Normalisation des routes
+# ────────────────────────────────────────────────────────────────────────────────
+# Les paramètres « majeurs » (channel, guild, webhook) font partie de la clé du bucket,
+# les autres identifiants sont remplacés par {id} et les jetons d’interaction / de
+# webhook par {token} (un jeton par interaction : sinon une clé de plus à chaque fois).
+_MAJOR_PARAMS = ("channels", "guilds", "webhooks")
+_TOKEN_PARENTS = ("interactions", "webhooks")  # /<parent>/<id>/<jeton>/…
+_API_PREFIX = re.compile(r"^/api/v\d+")
+_SNOWFLAKE = re.compile(r"^\d{15,21}$")
+
+def normalize_path(path: str) -> str:
+    """Transforme un chemin d’API en clé de route stable (ex: /channels/123/messages/{id})."""
+    parts = _API_PREFIX.sub("", path).strip("/").split("/")
+    normalized = []
+    for i, part in enumerate(parts):
+        previous = parts[i - 1] if i > 0 else ""
+        if previous == "reactions":
+            normalized.append("{emoji}")
+        elif i > 1 and parts[i - 2] in _TOKEN_PARENTS and _SNOWFLAKE.match(previous):
+            normalized.append("{token}")
+        elif previous in _MAJOR_PARAMS:
+            normalized.append(part)
+        elif _SNOWFLAKE.match(part):
+            normalized.append("{id}")
+        else:
+            normalized.append(part)
+    return "/" + "/".join(normalized)
+
+def route_key(method: str, path: str) -> str:
+    return f"{method.upper()} {normalize_path(path)}"
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🪣 État d’un bucket
+# ────────────────────────────────────────────────────────────────────────────────
+class _Bucket:
+    __slots__ = ("limit", "remaining", "reset_at")
+
+    def __init__(self):
+        self.limit = None      # inconnu tant qu’aucun en-tête n’a été lu
+        self.remaining = None
+        self.reset_at = 0.0
+
+    def wait_time(self, now: float) -> float:
+        if self.remaining is None:
+            return 0.0
+        if now >= self.reset_at:
+            # Fenêtre écoulée : le bucket est plein à nouveau
+            self.remaining = self.limit
+            return 0.0
+        if self.remaining > 0:
+            return 0.0
+        return self.reset_at - now
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Ordonnanceur principal
+# ────────────────────────────────────────────────────────────────────────────────
+class RateLimiter:
+    """
+    Suit les buckets Discord par route et la limite globale.
+    - acquire(route) : attend uniquement si le bucket de la route est vide
+    - update(route, headers) : met à jour l’état depuis les en-têtes de réponse
+    - throttled(route, retry_after, is_global) : enregistre une réponse 429
+    Les buckets dont la fenêtre est écoulée (pleins à nouveau, donc équivalents à un
+    bucket neuf) sont purgés toutes les PRUNE_INTERVAL s, avec les routes qui y menaient.
+    """
+
+    PRUNE_INTERVAL = 60.0
+
+    def __init__(self):
+        self._route_to_bucket = {}   # route → hash du bucket (X-RateLimit-Bucket)
+        self._buckets = {}           # (hash ou route, paramètre majeur) → _Bucket
+        self._global_reset_at = 0.0
+        self._next_prune = 0.0
+        self.counters = {"queued": 0, "waited": 0, "throttled": 0}
+        self.tracing = False         # True dès que trace_config() alimente l’état
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Résolution des buckets
+    # ──────────────────────────────────────────────────────────────
+    def _prune(self, now: float):
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self.PRUNE_INTERVAL
+        for key in [k for k, b in self._buckets.items() if b.reset_at <= now]:
+            del self._buckets[key]
+        for route in [r for r, k in self._route_to_bucket.items() if k not in self._buckets]:
+            del self._route_to_bucket[route]
+
+    def _bucket(self, route: str) -> _Bucket:
+        key = self._route_to_bucket.get(route, route)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Réservation avant un appel
+    # ──────────────────────────────────────────────────────────────
+    async def acquire(self, route: str = None):
+        """Réserve un jeton sur la route ; n’attend que si le bucket (ou le global) est vide."""
+        self.counters["queued"] += 1
+        waited = False
+        self._prune(time.monotonic())
+        while True:
+            now = time.monotonic()
+            delay = max(0.0, self._global_reset_at - now)
+            bucket = self._bucket(route) if route else None
+            if bucket is not None:
+                delay = max(delay, bucket.wait_time(now))
+            if delay <= 0:
+                break
+            waited = True
+            await asyncio.sleep(delay)
+
+        if waited:
+            self.counters["waited"] += 1
+        if bucket is not None and bucket.remaining is not None:
+            bucket.remaining -= 1
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Mise à jour depuis les en-têtes de réponse
+    # ──────────────────────────────────────────────────────────────
+    def update(self, route: str, headers):
+        """Met à jour le bucket de la route à partir des en-têtes X-RateLimit-*."""
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        if bucket_hash is None:
+            return
+        major = route.split(" ", 1)[1].split("/")[2] if route.count("/") >= 2 else ""
+        key = (bucket_hash, major)
+        self._prune(time.monotonic())
+        self._route_to_bucket[route] = key
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        try:
+            bucket.limit = int(headers.get("X-RateLimit-Limit", 1))
+            bucket.remaining = int(headers.get("X-RateLimit-Remaining", 0))
+            bucket.reset_at = time.monotonic() + float(headers.get("X-RateLimit-Reset-After", 0))
+        except (TypeError, ValueError):
+            pass
+
+    def throttled(self, route: str = None, retry_after: float = 1.0, is_global: bool = False):
+        """Enregistre un 429 : vide le bucket concerné (ou bloque le global) pendant retry_after."""
+        self.counters["throttled"] += 1
+        reset_at = time.monotonic() + retry_after
+        if is_global:
+            self._global_reset_at = max(self._global_reset_at, reset_at)
+            return
+        if route is None:
+            return
+        bucket = self._bucket(route)
+        bucket.remaining = 0
+        bucket.limit = bucket.limit or 1
+        bucket.reset_at = reset_at  # Retry-After fait foi, même si l’ancienne fenêtre était plus longue
+
+    def stats(self) -> dict:
+        return dict(self.counters, buckets=len(self._buckets))
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Intégration aiohttp (toutes les réponses HTTP de discord.py)
+    # ──────────────────────────────────────────────────────────────
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """TraceConfig à passer à commands.Bot(http_trace=...) pour lire chaque réponse."""
+        trace = aiohttp.TraceConfig()
+        self.tracing = True
+
+        async def on_request_end(session, ctx, params):
+            route = route_key(params.method, params.url.path)
+            headers = params.response.headers
+            if params.response.status == 429:
+                retry_after = float(headers.get("Retry-After", 1))
+                self.throttled(route, retry_after, headers.get("X-RateLimit-Global") == "true")
+            else:
+                self.update(route, headers)
+
+        trace.on_request_end.append(on_request_end)
+        return trace
@@ -0,0 +1,87 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 response_cache.py — Réponses pré-rendues (embeds / vues quasi statiques)
+# Objectif : Construire une seule fois les réponses qui ne dépendent que de quelques
+#            entrées (préfixe, avatar du bot…) et les réutiliser telles quelles ;
+#            les embeds sont figés avec leur forme sérialisée (aucun to_dict par envoi)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+from collections import OrderedDict
+
+import discord
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧊 Embeds figés
+# ────────────────────────────────────────────────────────────────────────────────
+class FrozenEmbed(discord.Embed):
+    """Embed dont la forme JSON est calculée une fois ; à ne plus modifier après freeze_embed()."""
+
+    _payload = None
+
+    def to_dict(self):
+        if self._payload is None:
+            self._payload = super().to_dict()
+        return self._payload
+
+def freeze_embed(embed: discord.Embed) -> FrozenEmbed:
+    frozen = FrozenEmbed.from_dict(embed.to_dict())
+    frozen.to_dict()
+    return frozen
+
+def static_view(*items) -> discord.ui.View:
+    """Vue réutilisable entre envois : uniquement des boutons lien (rien à écouter)."""
+    view = discord.ui.View(timeout=None)
+    for item in items:
+        view.add_item(item)
+    return view
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cache
+# ────────────────────────────────────────────────────────────────────────────────
+class ResponseCache:
+    """
+    Réponses pré-rendues (bot.responses).
+    - get(clé, builder) : kwargs d’envoi ({"embed": …, "view": …}) construits une fois ;
+      la clé contient les entrées du rendu (nom, préfixe, clé d’avatar…) : un nouveau
+      préfixe ou un nouvel avatar donne une nouvelle clé, l’ancienne sort du LRU
+    - vidé à chaque (dé)chargement d’extension (bot.extensions_version), car les
+      builders vivent dans les cogs
+    """
+
+    def __init__(self, bot, maxsize: int = 512):
+        self.bot = bot
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.metrics = {"hits": 0, "builds": 0}
+        self._version = None
+
+    def get(self, key: tuple, builder) -> dict:
+        version = getattr(self.bot, "extensions_version", None)
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+        payload = self._entries.get(key)
+        if payload is not None:
+            self._entries.move_to_end(key)
+            self.metrics["hits"] += 1
+            return payload
+
+        payload = builder()
+        if isinstance(payload.get("embed"), discord.Embed):
+            payload["embed"] = freeze_embed(payload["embed"])
+        self._entries[key] = payload
+        self.metrics["builds"] += 1
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return payload
+
+    def invalidate(self, name: str = None):
+        """Oublie les réponses « name » (premier élément de la clé), ou toutes."""
+        if name is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == name]:
+            del self._entries[key]
@@ -0,0 +1,85 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 search_index.py — Index de recherche pour l’autocomplétion et les menus
+# Objectif : Construire une fois par jeu de données (cf. DataView.index) un index
+#            préfixe + début de mot + trigrammes, pour répondre à un autocomplete
+#            en bien moins d’une milliseconde, même avec des milliers d’entrées
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import heapq
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from discord import app_commands
+
+MAX_CHOICES = 25  # limite Discord (autocomplete et menus)
+FUZZY_GRAMS = 6   # trigrammes (les plus rares) utilisés pour la recherche approchée
+
+def normalize(text: str) -> str:
+    """Minuscules sans accents : « Élément » et « element » se retrouvent."""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold().strip()
+
+def _trigrams(text: str) -> set:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Index
+# ────────────────────────────────────────────────────────────────────────────────
+class SearchIndex:
+    """
+    Recherche sur une liste de clés (ordre d’origine conservé pour une requête vide).
+    Résultats par priorité : préfixe de la clé, préfixe d’un mot, puis approximatif
+    (trigrammes communs, tolère fautes de frappe et inversions).
+    """
+
+    def __init__(self, keys):
+        self.keys = list(dict.fromkeys(keys))
+        normalized = [normalize(k) for k in self.keys]
+
+        self._names = sorted((n, i) for i, n in enumerate(normalized))
+        self._words = sorted((w, i) for i, n in enumerate(normalized) for w in n.split()[1:])
+        self._trigrams = defaultdict(list)  # trigramme → indices des clés
+        for i, n in enumerate(normalized):
+            for gram in _trigrams(n):
+                self._trigrams[gram].append(i)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def _prefixed(entries: list, query: str, found: dict, limit: int):
+        pos = bisect_left(entries, (query, -1))
+        while pos < len(entries) and len(found) < limit and entries[pos][0].startswith(query):
+            found.setdefault(entries[pos][1], None)
+            pos += 1
+
+    def search(self, query: str, limit: int = MAX_CHOICES) -> list:
+        query = normalize(query)
+        if not query:
+            return self.keys[:limit]
+        found = {}  # dict ordonné : indices sans doublon
+        self._prefixed(self._names, query, found, limit)
+        if len(found) < limit:
+            self._prefixed(self._words, query, found, limit)
+        if len(found) < limit and len(query) >= 3:
+            # Seuls les trigrammes les plus rares comptent : peu de candidats à scorer
+            postings = [self._trigrams[g] for g in _trigrams(query) if g in self._trigrams]
+            postings = sorted(postings, key=len)[:FUZZY_GRAMS]
+            scores = Counter()
+            for ids in postings:
+                scores.update(ids)
+            threshold = max(2, len(postings) // 2)
+            for i, score in heapq.nlargest(limit * 2, scores.items(), key=lambda kv: kv[1]):
+                if score < threshold or len(found) >= limit:
+                    break
+                found.setdefault(i, None)
+        return [self.keys[i] for i in found]
+
+    def choices(self, query: str, limit: int = MAX_CHOICES) -> list:
+        """Réponse directe pour un callback autocomplete (noms et valeurs ≤ 100 caractères)."""
+        return [app_commands.Choice(name=k[:100], value=k[:100]) for k in self.search(query, limit)]
@@ -0,0 +1,142 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 slash_sync.py — Synchronisation incrémentale des commandes slash
+# Objectif : Ne rappeler l’endpoint de synchro (très limité par Discord) que si
+#            l’arbre de commandes a réellement changé : empreinte stable de l’arbre
+#            sérialisé (global et par serveur), conservée dans un fichier local
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import hashlib
+import json
+import logging
+import os
+
+import discord
+
+log = logging.getLogger(__name__)
+
+STATE_FILE = "slash_sync.json"
+
+def _digest(data) -> str:
+    # Sérialisation canonique : même arbre → même empreinte, quel que soit l’ordre d’ajout
+    blob = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Synchroniseur
+# ────────────────────────────────────────────────────────────────────────────────
+class SlashSync:
+    """
+    Synchro des commandes slash (bot.slash_sync).
+    - snapshot(guild) : empreinte de l’arbre + empreinte de chaque commande
+    - sync(guild, force) : synchronise seulement si l’empreinte a changé depuis la
+      dernière synchro réussie ; renvoie les commandes ajoutées / retirées / modifiées
+    - auto_sync() : AUTO_SYNC=1 au démarrage (global, plus SYNC_GUILDS=id,id…)
+    État enregistré dans slash_sync.json : {"<app>/global" | "<app>/guild:<id>": {hash, commands}}.
+    """
+
+    def __init__(self, bot, path: str = STATE_FILE):
+        self.bot = bot
+        self.path = path
+        self._state = None
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 État local
+    # ──────────────────────────────────────────────────────────────
+    @property
+    def state(self) -> dict:
+        if self._state is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._state = {}
+        return self._state
+
+    def _save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def scope_key(self, guild) -> str:
+        # Préfixé par l’application : un bot de test et le bot de prod ne partagent rien
+        scope = f"guild:{guild.id}" if guild is not None else "global"
+        return f"{self.bot.application_id}/{scope}"
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Empreintes
+    # ──────────────────────────────────────────────────────────────
+    def snapshot(self, guild=None) -> dict:
+        """{"hash": empreinte de l’arbre, "commands": {"type:nom": empreinte}} pour ce scope."""
+        tree = self.bot.tree
+        commands = {}
+        for command in tree.get_commands(guild=guild):
+            data = command.to_dict(tree)
+            commands[f"{data.get('type', 1)}:{data['name']}"] = _digest(data)
+        return {"hash": _digest(commands), "commands": commands}
+
+    @staticmethod
+    def diff(old: dict, new: dict) -> dict:
+        before, after = old.get("commands", {}), new["commands"]
+        name = lambda key: key.split(":", 1)[1]
+        return {
+            "added": sorted(name(k) for k in after.keys() - before.keys()),
+            "removed": sorted(name(k) for k in before.keys() - after.keys()),
+            "changed": sorted(name(k) for k in after.keys() & before.keys() if after[k] != before[k]),
+        }
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Synchronisation
+    # ──────────────────────────────────────────────────────────────
+    async def sync(self, guild=None, *, force: bool = False) -> dict:
+        """
+        Synchronise le scope (global si guild est None, sinon copie du global sur le
+        serveur comme avant). Résultat : {synced, count, added, removed, changed}.
+        """
+        loader = getattr(self.bot, "extension_loader", None)
+        if loader is not None:
+            await loader.load_deferred()  # les cogs différés déclarent aussi des commandes slash
+        if guild is not None:
+            self.bot.tree.copy_global_to(guild=guild)
+
+        key = self.scope_key(guild)
+        previous = self.state.get(key, {})
+        current = self.snapshot(guild)
+        result = dict(self.diff(previous, current), count=len(current["commands"]), synced=False)
+        if not force and previous.get("hash") == current["hash"]:
+            return result
+
+        await self.bot.tree.sync(guild=guild)
+        self.state[key] = current
+        self._save()
+        result["synced"] = True
+        return result
+
+    async def auto_sync(self):
+        """Synchro au démarrage si AUTO_SYNC=1 (seulement les scopes modifiés)."""
+        if os.getenv("AUTO_SYNC", "").lower() not in ("1", "true", "yes"):
+            return
+        scopes = [None] + [discord.Object(id=int(g)) for g in os.getenv("SYNC_GUILDS", "").split(",") if g.strip()]
+        for guild in scopes:
+            try:
+                result = await self.sync(guild)
+            except discord.HTTPException as e:
+                log.error("❌ Synchro slash %s impossible : %s", self.scope_key(guild), e)
+                continue
+            log.info("🔄 Synchro slash %s : %s", self.scope_key(guild), self.describe(result))
+
+    @staticmethod
+    def describe(result: dict) -> str:
+        """Résumé lisible d’un résultat de sync()."""
+        if not result["synced"]:
+            return f"aucun changement ({result['count']} commandes), rien envoyé à Discord"
+        parts = [f"{result['count']} commandes envoyées"]
+        for label, key in (("➕ ajoutées", "added"), ("➖ retirées", "removed"), ("✏️ modifiées", "changed")):
+            if result[key]:
+                parts.append(f"{label} : {', '.join(result[key])}")
+        if len(parts) == 1:
+            parts.append("synchro forcée, aucune différence locale")
+        return " · ".join(parts)
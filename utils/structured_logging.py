@@ -0,0 +1,179 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 structured_logging.py — Journalisation structurée non bloquante
+# Objectif : Remplacer print : un appel de log ne fait qu’empiler l’enregistrement
+#            (QueueHandler), un thread (QueueListener) le formate en JSON et l’écrit ;
+#            champs command / guild / latency_ms / instance_id, messages répétitifs
+#            limités (tempête de 429…) et niveaux par module
+# Variables : LOG_LEVEL (INFO), LOG_LEVELS (ex. "discord=WARNING,utils.discord_utils=ERROR"),
+#             LOG_FORMAT (json | text), LOG_BURST / LOG_PERIOD (5 messages identiques / 10 s)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from dotenv import load_dotenv
+
+# Commande en cours (posée par utils/command_metrics.py) : {"command", "guild", "start"}
+log_context: ContextVar = ContextVar("log_context", default=None)
+
+DEFAULT_LEVELS = "aiohttp.access=WARNING"  # une ligne par requête HTTP servie (METRICS_PORT…)
+FIELDS = ("command", "guild", "user", "latency_ms", "suppressed")  # champs structurés (extra=…)
+_state = {"instance_id": os.getenv("INSTANCE_ID"), "listener": None}
+
+def set_instance_id(instance_id: str):
+    _state["instance_id"] = instance_id
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧹 Filtres (exécutés dans le thread appelant, avant la mise en file)
+# ────────────────────────────────────────────────────────────────────────────────
+class RateLimitFilter(logging.Filter):
+    """
+    Au plus burst messages identiques (même logger, niveau et gabarit — d’où les
+    arguments %s plutôt que des f-strings) par fenêtre de period secondes. Le premier
+    message de la fenêtre suivante porte le nombre de messages supprimés (suppressed).
+    CRITICAL n’est jamais limité.
+    """
+
+    def __init__(self, burst: int = 5, period: float = 10.0, maxkeys: int = 1024):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self.maxkeys = maxkeys
+        self._windows = OrderedDict()  # clé → [début de fenêtre, émis, supprimés]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.CRITICAL:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.period:
+            if window is not None and window[2]:
+                record.suppressed = window[2]
+            window = self._windows[key] = [now, 0, 0]
+            self._windows.move_to_end(key)
+            if len(self._windows) > self.maxkeys:
+                self._windows.popitem(last=False)
+        if window[1] >= self.burst:
+            window[2] += 1
+            return False
+        window[1] += 1
+        return True
+
+class ContextFilter(logging.Filter):
+    """Complète l’enregistrement avec la commande en cours (sans écraser un extra explicite)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        ctx = log_context.get()
+        if ctx is not None:
+            if getattr(record, "command", None) is None:
+                record.command = ctx["command"]
+            if getattr(record, "guild", None) is None:
+                record.guild = ctx["guild"]
+            if getattr(record, "latency_ms", None) is None:
+                record.latency_ms = round((time.perf_counter() - ctx["start"]) * 1000, 2)
+        return True
+
+class _QueueHandler(QueueHandler):
+    """Ne fige que le message et la trace ; la mise en forme finale se fait dans le thread d’écriture."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🖨️ Formats (thread d’écriture)
+# ────────────────────────────────────────────────────────────────────────────────
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if _state["instance_id"]:
+            entry["instance_id"] = _state["instance_id"]
+        for field in FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """Lecture humaine (développement) : mêmes champs en fin de ligne."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        stamp = datetime.fromtimestamp(record.created).strftime("%H:%M:%S")
+        fields = " ".join(f"{f}={getattr(record, f)}" for f in FIELDS if getattr(record, f, None) is not None)
+        line = f"{stamp} {record.levelname:<7} {record.name} — {record.getMessage()}" + (f"  [{fields}]" if fields else "")
+        return f"{line}\n{record.exc_text}" if record.exc_text else line
+
+# ────────────────────────────────────────────────────────────────────────────────
+# ⚙️ Installation
+# ────────────────────────────────────────────────────────────────────────────────
+def parse_levels(spec: str) -> dict:
+    """« discord=WARNING,utils.cluster=DEBUG » → {"discord": "WARNING", "utils.cluster": "DEBUG"}."""
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+def setup_logging(instance_id: str = None):
+    """
+    Installe la file sur le logger racine (une seule fois ; un nouvel appel ne fait que
+    mettre à jour instance_id). À appeler avant les autres imports internes pour que
+    leurs messages de chargement passent déjà par la file.
+    """
+    if instance_id:
+        set_instance_id(instance_id)
+    if _state["listener"] is not None:
+        return
+    load_dotenv()
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(TextFormatter() if os.getenv("LOG_FORMAT", "json").lower() == "text" else JsonFormatter())
+    records = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(RateLimitFilter(int(os.getenv("LOG_BURST", "5")), float(os.getenv("LOG_PERIOD", "10"))))
+    handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    levels = {**parse_levels(DEFAULT_LEVELS), **parse_levels(os.getenv("LOG_LEVELS", ""))}
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = _state["listener"] = QueueListener(records, output)
+    listener.start()
+    atexit.register(stop_logging)
+
+def stop_logging():
+    """Vide la file puis arrête le thread d’écriture."""
+    listener, _state["listener"] = _state["listener"], None
+    if listener is not None:
+        listener.stop()
@@ -0,0 +1,171 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 supabase_async.py — Couche d’accès asynchrone au client Supabase
+# Objectif : Ne jamais bloquer la boucle d’événements du gateway pendant un appel HTTP
+#            (pool de threads borné, timeouts, retries, regroupement des lectures)
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+DEFAULT_WORKERS = int(os.getenv("SUPABASE_WORKERS", "4"))
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🔧 Classification des erreurs
+# ────────────────────────────────────────────────────────────────────────────────
+def _is_transient(error: BaseException) -> bool:
+    """Erreurs réseau / timeouts (à réessayer) vs erreurs PostgREST 4xx (définitives)."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    return type(error).__module__.split(".")[0] in ("httpx", "httpcore")
+
+def _apply_filters(query, filters: dict):
+    for column, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            query = query.in_(column, list(value))
+        else:
+            query = query.eq(column, value)
+    return query
+
+def _freeze(filters: dict):
+    return tuple(sorted(
+        (k, tuple(sorted(v)) if isinstance(v, (list, tuple, set, frozenset)) else v)
+        for k, v in (filters or {}).items()
+    ))
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Client asynchrone
+# ────────────────────────────────────────────────────────────────────────────────
+class AsyncSupabase:
+    """
+    Enveloppe asynchrone du client supabase-py synchrone (bot.db).
+    - chaque requête s’exécute dans un pool de threads borné ; le client (et donc son
+      pool de connexions HTTP keep-alive) est partagé par tous les threads
+    - timeout par appel, retries avec backoff sur les erreurs réseau uniquement
+    - le timeout de run() rend la main à l’appelant sans arrêter le thread : seul le
+      timeout HTTP du client (supabase_client.py) le libère ; après un timeout, pas de
+      nouvelle tentative si tous les threads sont encore pris
+    - les lectures identiques simultanées partagent un seul aller-retour
+    Le client peut pointer vers un serveur HTTP local (SUPABASE_URL) pour les tests.
+    """
+
+    def __init__(self, client, max_workers: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT, retries: int = 2):
+        self.client = client
+        self.timeout = timeout
+        self.retries = retries
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="supabase")
+        self._busy = 0  # threads occupés, appels abandonnés compris
+        self._busy_lock = threading.Lock()
+        self._inflight = {}  # clé de lecture → Future partagé
+        self.stats = {"calls": 0, "coalesced": 0, "retries": 0, "timeouts": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    @property
+    def busy(self) -> int:
+        """Threads occupés, appels abandonnés par un timeout compris."""
+        return self._busy
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Exécution générique
+    # ──────────────────────────────────────────────────────────────
+    def _submit(self, func):
+        with self._busy_lock:
+            self._busy += 1
+        future = self._executor.submit(func)
+        future.add_done_callback(self._release)  # à la vraie fin du thread, pas à l’abandon
+        return asyncio.wrap_future(future)
+
+    def _release(self, _future):
+        with self._busy_lock:
+            self._busy -= 1
+
+    async def run(self, func, *, timeout: float = None, retries: int = None):
+        """Exécute func() (appel bloquant) dans le pool avec timeout et retries."""
+        if not self.enabled:
+            raise RuntimeError("Supabase désactivé")
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+
+        for attempt in range(retries + 1):
+            self.stats["calls"] += 1
+            try:
+                return await asyncio.wait_for(self._submit(func), timeout)
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.stats["timeouts"] += 1
+                    if self._busy >= self.max_workers:
+                        raise  # threads tous pris par des appels abandonnés : ne pas en ajouter
+                if attempt >= retries or not _is_transient(e):
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(0.25 * 2 ** attempt)
+
+    async def _coalesced(self, key, func, **kwargs):
+        """Partage un même aller-retour entre les appels simultanés ayant la même clé."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(self.run(func, **kwargs))
+        self._inflight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Lectures
+    # ──────────────────────────────────────────────────────────────
+    async def select(self, table: str, columns: str = "*", filters: dict = None, limit: int = None) -> list:
+        """SELECT columns FROM table WHERE filters (égalité, ou IN pour les listes).
+        Le résultat peut être partagé entre appels simultanés : ne pas le modifier."""
+        def query():
+            q = _apply_filters(self.client.table(table).select(columns), filters)
+            if limit is not None:
+                q = q.limit(limit)
+            return q.execute().data
+
+        key = ("select", table, columns, _freeze(filters), limit)
+        return await self._coalesced(key, query)
+
+    async def select_one(self, table: str, columns: str = "*", filters: dict = None):
+        rows = await self.select(table, columns, filters, limit=1)
+        return rows[0] if rows else None
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Écritures
+    # ──────────────────────────────────────────────────────────────
+    async def upsert(self, table: str, rows, on_conflict: str = None) -> list:
+        if not rows:
+            return []
+        def query():
+            kwargs = {"on_conflict": on_conflict} if on_conflict else {}
+            return self.client.table(table).upsert(rows, **kwargs).execute().data
+        return await self.run(query)
+
+    async def insert(self, table: str, rows) -> list:
+        # Non idempotent : pas de retry automatique
+        return await self.run(lambda: self.client.table(table).insert(rows).execute().data, retries=0)
+
+    async def update(self, table: str, values: dict, filters: dict) -> list:
+        return await self.run(lambda: _apply_filters(self.client.table(table).update(values), filters).execute().data)
+
+    async def delete(self, table: str, filters: dict) -> list:
+        return await self.run(lambda: _apply_filters(self.client.table(table).delete(), filters).execute().data)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Arrêt
+    # ──────────────────────────────────────────────────────────────
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,210 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 supabase_cache.py — Cache lecture/écriture devant Supabase
+# Objectif : Éviter un aller-retour réseau par commande pour les lignes souvent lues
+#            (utilisateurs, serveurs…) : TTL par table, LRU borné, écritures groupées
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Cache principal
+# ────────────────────────────────────────────────────────────────────────────────
+class SupabaseCache:
+    """
+    Cache read-through / write-behind au-dessus de bot.db (AsyncSupabase).
+    - get / get_many : lecture depuis le cache, sinon depuis Supabase (TTL par table)
+    - set : met à jour le cache immédiatement et planifie un upsert groupé ; la ligne
+      reste en cache (ni expiration ni éviction) tant qu’elle n’est pas écrite
+    - write / delete : écriture immédiate (write-through), pour les données dont
+      l’appelant doit connaître l’échec ; le cache n’est modifié qu’après le succès
+    - flush : envoie les upserts en attente (toutes les flush_interval s et à l’arrêt)
+    Sans Supabase (supabase = None), le cache reste local et les écritures sont ignorées.
+    """
+
+    def __init__(self, db, ttls: dict = None, default_ttl: float = 60.0,
+                 max_entries: int = 10_000, flush_interval: float = 5.0):
+        self.db = db
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        self._entries = OrderedDict()  # (table, clé) → (expire_at, ligne ou None)
+        self._pending = {}             # (table, colonne clé) → {clé: ligne}
+        self._dirty = set()            # (table, clé) pas encore écrites : jamais expirées ni évincées
+        self._write_lock = asyncio.Lock()  # un flush et une écriture immédiate ne se croisent pas
+        self._flush_task = None
+        self.metrics = {"hits": 0, "misses": 0, "evictions": 0, "flushed_rows": 0, "flush_errors": 0}
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Entrées du cache
+    # ──────────────────────────────────────────────────────────────
+    def _lookup(self, table: str, key):
+        entry = self._entries.get((table, key))
+        if entry is None:
+            return _MISSING
+        expire_at, row = entry
+        if expire_at < time.monotonic() and (table, key) not in self._dirty:
+            del self._entries[(table, key)]
+            return _MISSING
+        self._entries.move_to_end((table, key))
+        return row
+
+    def _store(self, table: str, key, row):
+        ttl = self.ttls.get(table, self.default_ttl)
+        self._entries[(table, key)] = (time.monotonic() + ttl, row)
+        self._entries.move_to_end((table, key))
+        if len(self._entries) > self.max_entries:
+            self._evict(len(self._entries) - self.max_entries)
+
+    def _evict(self, count: int):
+        # Plus anciennes d’abord, en sautant les lignes pas encore écrites (Supabase
+        # renverrait l’ancienne version) : la taille peut dépasser max_entries jusqu’au flush
+        victims = []
+        for entry_key in self._entries:
+            if entry_key not in self._dirty:
+                victims.append(entry_key)
+                if len(victims) == count:
+                    break
+        for entry_key in victims:
+            del self._entries[entry_key]
+        self.metrics["evictions"] += len(victims)
+
+    def invalidate(self, table: str, key=_MISSING):
+        """Oublie une ligne (ou toute la table si key est omise), sauf celles pas encore écrites."""
+        if key is not _MISSING:
+            if (table, key) not in self._dirty:
+                self._entries.pop((table, key), None)
+            return
+        for entry_key in [k for k in self._entries if k[0] == table and k not in self._dirty]:
+            del self._entries[entry_key]
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Lectures (read-through)
+    # ──────────────────────────────────────────────────────────────
+    async def get(self, table: str, key, key_column: str = "id"):
+        """Renvoie la ligne dont key_column == key (ou None), depuis le cache si possible."""
+        row = self._lookup(table, key)
+        if row is not _MISSING:
+            self.metrics["hits"] += 1
+            return row
+        self.metrics["misses"] += 1
+        if not self.db.enabled:
+            return None
+        row = await self.db.select_one(table, filters={key_column: key})
+        self._store(table, key, row)
+        return row
+
+    async def get_many(self, table: str, keys, key_column: str = "id") -> dict:
+        """Lecture groupée : {clé: ligne ou None}, une seule requête IN pour les absents."""
+        result, missing = {}, []
+        for key in keys:
+            row = self._lookup(table, key)
+            if row is _MISSING:
+                missing.append(key)
+            else:
+                result[key] = row
+        self.metrics["hits"] += len(result)
+        self.metrics["misses"] += len(missing)
+
+        if missing and self.db.enabled:
+            rows = await self.db.select(table, filters={key_column: missing})
+            found = {row[key_column]: row for row in rows}
+            for key in missing:
+                result[key] = found.get(key)
+                self._store(table, key, result[key])
+        else:
+            result.update((key, None) for key in missing)
+        return result
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Écritures (write-behind ou immédiates)
+    # ──────────────────────────────────────────────────────────────
+    def set(self, table: str, row: dict, key_column: str = "id"):
+        """Met la ligne en cache et la planifie pour le prochain upsert groupé."""
+        key = row[key_column]
+        if self.db.enabled:
+            self._pending.setdefault((table, key_column), {})[key] = row
+            self._dirty.add((table, key))
+        self._store(table, key, row)
+
+    async def write(self, table: str, row: dict, key_column: str = "id"):
+        """Upsert immédiat puis mise en cache ; en cas d’échec l’exception remonte."""
+        key = row[key_column]
+        async with self._write_lock:
+            if self.db.enabled:
+                await self.db.upsert(table, row, on_conflict=key_column)
+            self._written(table, key_column, key)
+            self._store(table, key, row)
+
+    async def delete(self, table: str, key, key_column: str = "id"):
+        """Suppression immédiate ; l’absence est mise en cache (pas de relecture)."""
+        async with self._write_lock:
+            if self.db.enabled:
+                await self.db.delete(table, {key_column: key})
+            self._written(table, key_column, key)
+            self._store(table, key, None)
+
+    def _written(self, table: str, key_column: str, key):
+        """La ligne en base est à jour : l’upsert groupé éventuel est abandonné."""
+        self._pending.get((table, key_column), {}).pop(key, None)
+        self._dirty.discard((table, key))
+
+    async def flush(self):
+        """Envoie tous les upserts en attente (un appel par table)."""
+        async with self._write_lock:
+            pending, self._pending = self._pending, {}
+            for (table, key_column), rows in pending.items():
+                await self._flush_rows(table, key_column, rows)
+
+    async def _flush_rows(self, table: str, key_column: str, rows: dict):
+        if not rows:
+            return
+        try:
+            await self.db.upsert(table, list(rows.values()), on_conflict=key_column)
+            self.metrics["flushed_rows"] += len(rows)
+        except Exception as e:
+            self.metrics["flush_errors"] += 1
+            log.error("Upsert %s (%d lignes) impossible : %s", table, len(rows), e)
+            # On remet en file, sans écraser une version plus récente (les lignes restent dirty)
+            requeue = self._pending.setdefault((table, key_column), {})
+            for key, row in rows.items():
+                requeue.setdefault(key, row)
+            return
+        newer = self._pending.get((table, key_column), {})
+        self._dirty.difference_update((table, key) for key in rows if key not in newer)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Cycle de vie
+    # ──────────────────────────────────────────────────────────────
+    def start(self):
+        if self._flush_task is None and self.db.enabled:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._pending:
+                await self.flush()
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._pending:
+            await self.flush()
+
+    def stats(self) -> dict:
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        hit_rate = self.metrics["hits"] / lookups if lookups else 0.0
+        pending = sum(len(rows) for rows in self._pending.values())
+        return dict(self.metrics, entries=len(self._entries), pending=pending, hit_rate=round(hit_rate, 3))
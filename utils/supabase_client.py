@@ -6,9 +6,12 @@
 # ──────────────────────────────────────────────────────────────
 # 📦 IMPORTS
 # ──────────────────────────────────────────────────────────────
+import logging
 import os
 from dotenv import load_dotenv
 
+log = logging.getLogger(__name__)
+
 # ──────────────────────────────────────────────────────────────
 # 🔑 Chargement des variables d’environnement
 # ──────────────────────────────────────────────────────────────
@@ -17,6 +20,7 @@ load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))  # s, par requête HTTP
 
 # ──────────────────────────────────────────────────────────────
 # 🔌 Initialisation du client
@@ -27,9 +31,12 @@ try:
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise ValueError("SUPABASE_URL ou SUPABASE_KEY manquant")
 
-    from supabase import create_client, Client
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-    print("✅ Client Supabase initialisé avec succès.")
+    from supabase import create_client, Client, ClientOptions
+    # Timeout HTTP sur le client lui-même : une requête bloquée libère son thread
+    # (utils/supabase_async.py) au lieu de l’occuper jusqu’au défaut de 120 s
+    options = ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT)
+    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
+    log.info("✅ Client Supabase initialisé avec succès.")
 
 except Exception as e:
-    print(f"⚠️ Supabase désactivé : {e}")
+    log.warning("⚠️ Supabase désactivé : %s", e)
@@ -0,0 +1,98 @@
+# ────────────────────────────────────────────────────────────────────────────────
+# 📌 webhook_pool.py — Cache des webhooks du bot par salon
+# Objectif : Réutiliser un seul webhook appartenant au bot par salon (au lieu de
+#            create_webhook + delete à chaque message) avec éviction LRU
+# ────────────────────────────────────────────────────────────────────────────────
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 📦 Imports nécessaires
+# ────────────────────────────────────────────────────────────────────────────────
+import asyncio
+from collections import OrderedDict
+
+import discord
+
+from utils.discord_utils import _discord_action
+
+WEBHOOK_NAME = "Atem"
+UNKNOWN_WEBHOOK = 10015  # Code d’erreur Discord « Unknown Webhook »
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 🧠 Pool de webhooks
+# ────────────────────────────────────────────────────────────────────────────────
+class WebhookPool:
+    """
+    Un webhook par salon, créé ou retrouvé une seule fois puis réutilisé.
+    - LRU borné à max_size salons (l’éviction ne supprime pas le webhook côté Discord)
+    - invalidé sur on_webhooks_update et sur erreur « Unknown Webhook »
+    """
+
+    def __init__(self, bot, max_size: int = 256):
+        self.bot = bot
+        self.max_size = max_size
+        self._webhooks = OrderedDict()  # channel_id → discord.Webhook
+        self._locks = {}                # channel_id → asyncio.Lock (création en cours)
+        bot.add_listener(self.on_webhooks_update)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Récupération / création
+    # ──────────────────────────────────────────────────────────────
+    async def get(self, channel: discord.abc.GuildChannel) -> discord.Webhook:
+        """Renvoie le webhook du bot pour ce salon (création au premier appel uniquement)."""
+        webhook = self._webhooks.get(channel.id)
+        if webhook is not None:
+            self._webhooks.move_to_end(channel.id)
+            return webhook
+
+        lock = self._locks.setdefault(channel.id, asyncio.Lock())
+        try:
+            async with lock:
+                webhook = self._webhooks.get(channel.id)
+                if webhook is None:
+                    webhook = await self._find_or_create(channel)
+                    self._store(channel.id, webhook)
+        finally:
+            # ✅ Verrou retiré même si la création échoue (Forbidden, HTTPException…)
+            if self._locks.get(channel.id) is lock:
+                del self._locks[channel.id]
+        return webhook
+
+    async def _find_or_create(self, channel) -> discord.Webhook:
+        for webhook in await channel.webhooks():
+            if webhook.user and webhook.user.id == self.bot.user.id and webhook.name == WEBHOOK_NAME and webhook.token:
+                return webhook
+        return await channel.create_webhook(name=WEBHOOK_NAME)
+
+    def _store(self, channel_id: int, webhook: discord.Webhook):
+        self._webhooks[channel_id] = webhook
+        self._webhooks.move_to_end(channel_id)
+        while len(self._webhooks) > self.max_size:
+            self._webhooks.popitem(last=False)
+
+    def invalidate(self, channel_id: int):
+        self._webhooks.pop(channel_id, None)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Envoi (un seul appel API quand le webhook est en cache)
+    # ──────────────────────────────────────────────────────────────
+    async def send(self, channel: discord.abc.Messageable, **kwargs):
+        """Envoie via le webhook du salon ; les fils utilisent le webhook du salon parent."""
+        target = channel.parent if isinstance(channel, discord.Thread) else channel
+        if isinstance(channel, discord.Thread):
+            kwargs["thread"] = channel
+
+        for attempt in range(2):
+            webhook = await self.get(target)
+            try:
+                return await _discord_action(webhook.send, **kwargs)
+            except discord.NotFound as e:
+                if e.code != UNKNOWN_WEBHOOK or attempt:
+                    raise
+                # Webhook supprimé côté Discord : on le reconstruit une fois
+                self.invalidate(target.id)
+
+    # ──────────────────────────────────────────────────────────────
+    # 🔹 Événements
+    # ──────────────────────────────────────────────────────────────
+    async def on_webhooks_update(self, channel: discord.abc.GuildChannel):
+        self.invalidate(channel.id)